@@ -0,0 +1,123 @@
+"""
+Shared helpers for the benchmark scripts: path and Django setup, environment
+capture, and comparing two JSON reports.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+SAMPLE_RESUME = os.path.join(BASE_DIR, "data", "Resume.pdf")
+
+REPORT_VERSION = 1
+
+
+def setup_paths():
+    """Make the project and src importable, as manage.py and the app do"""
+    for path in (BASE_DIR, SRC_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def setup_django(db_path: str):
+    """Configure Django against a scratch SQLite database and create the tables"""
+    setup_paths()
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "career_mentor_web.settings")
+
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = db_path
+    settings.DATABASES["default"].setdefault("OPTIONS", {})["timeout"] = 30
+    settings.ALLOWED_HOSTS = list(settings.ALLOWED_HOSTS) + ["testserver", "127.0.0.1", "localhost"]
+    settings.PROFILING_ENABLED = False
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command("migrate", verbosity=0)
+
+
+def environment_info() -> Dict:
+    """Enough about the machine and stack to tell whether two runs are comparable"""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info["git_commit"] = None
+    return info
+
+
+def write_report(report: Dict, output: Optional[str]):
+    """Write the report as JSON to a file, or to stdout when no path is given"""
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def load_report(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _lookup(report: Dict, path: str):
+    value = report
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_reports(current: Dict, baseline: Dict, metrics: List[Tuple[str, str]]) -> Dict:
+    """Percent change for each (dotted path, 'lower' or 'higher' is better) metric.
+
+    A positive "regression_pct" means the current run is worse than the baseline.
+    """
+    comparison = {}
+    for path, better in metrics:
+        new, old = _lookup(current, path), _lookup(baseline, path)
+        if not isinstance(new, (int, float)) or not isinstance(old, (int, float)):
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        comparison[path] = {
+            "baseline": old,
+            "current": new,
+            "change_pct": round(change, 2),
+            "regression_pct": round(change if better == "lower" else -change, 2),
+        }
+    return comparison
+
+
+def print_comparison(comparison: Dict, stream=sys.stderr):
+    """Human-readable table of compare_reports output"""
+    if not comparison:
+        print("No comparable metrics in baseline", file=stream)
+        return
+    width = max(len(path) for path in comparison)
+    print(f"{'metric':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}", file=stream)
+    for path, row in comparison.items():
+        flag = "  worse" if row["regression_pct"] > 0 else ""
+        print(f"{path:<{width}}  {row['baseline']:>12.4g}  {row['current']:>12.4g}  "
+              f"{row['change_pct']:>+7.1f}%{flag}", file=stream)
+
+
+def worst_regression(comparison: Dict) -> float:
+    return max((row["regression_pct"] for row in comparison.values()), default=0.0)
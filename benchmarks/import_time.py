@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Startup import-time benchmark.
+
+Runs a fresh interpreter with `python -X importtime` that sets up Django and
+loads the URLconf (and so career_advisor.views and rag_service), which is what
+every manage.py command and worker boot does. Reports wall time, the slowest
+imports and the time per top-level package, and flags any heavy ML package
+(torch, transformers, langchain, ...) that got imported at startup.
+
+Examples:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 5 --top 30 --output imports.json
+    python benchmarks/import_time.py --baseline imports.json --fail-on-heavy
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+try:
+    from .common import (BASE_DIR, REPORT_VERSION, compare_reports, environment_info, load_report,
+                         print_comparison, worst_regression, write_report)
+except ImportError:
+    # Fallback for when running directly
+    from common import (BASE_DIR, REPORT_VERSION, compare_reports, environment_info, load_report,
+                        print_comparison, worst_regression, write_report)
+
+# Packages that should only be imported on first RAG use
+HEAVY_PACKAGES = ("torch", "transformers", "langchain", "langchain_community", "langchain_core",
+                  "sentence_transformers", "faiss", "onnxruntime", "optimum")
+
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print("WALL", time.perf_counter() - start)
+"""
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+COMPARED_METRICS = [("wall_ms.median", "lower"), ("imports_ms", "lower")]
+
+
+def run_once() -> Dict:
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE="career_mentor_web.settings")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", STARTUP_SNIPPET],
+                          cwd=BASE_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"startup failed:\n{proc.stderr[-2000:]}")
+
+    wall = next(float(line.split()[1]) for line in proc.stdout.splitlines() if line.startswith("WALL "))
+    imports = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            # -X importtime indents nested imports by two spaces per level
+            imports.append({"module": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                            "depth": (len(indent) - 1) // 2})
+    return {"wall": wall, "imports": imports}
+
+
+def summarise(runs: List[Dict], top: int) -> Dict:
+    walls = [run["wall"] * 1000 for run in runs]
+    # Module breakdown from the median run, so the numbers add up to one real startup
+    median_run = sorted(runs, key=lambda run: run["wall"])[len(runs) // 2]
+    imports = median_run["imports"]
+
+    by_package: Dict[str, int] = {}
+    for entry in imports:
+        package = entry["module"].split(".")[0]
+        by_package[package] = by_package.get(package, 0) + entry["self_us"]
+
+    heavy = sorted({entry["module"].split(".")[0] for entry in imports} & set(HEAVY_PACKAGES))
+    slowest = sorted(imports, key=lambda entry: entry["cumulative_us"], reverse=True)[:top]
+    return {
+        "wall_ms": {
+            "runs": [round(wall, 2) for wall in walls],
+            "median": round(statistics.median(walls), 2),
+            "min": round(min(walls), 2),
+        },
+        "imports_ms": round(sum(entry["cumulative_us"] for entry in imports if entry["depth"] == 0) / 1000, 2),
+        "modules_imported": len(imports),
+        "heavy_packages_imported": heavy,
+        "slowest_imports": [{"module": entry["module"], "cumulative_ms": round(entry["cumulative_us"] / 1000, 2)}
+                            for entry in slowest],
+        "packages_ms": {package: round(us / 1000, 2) for package, us in
+                        sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]},
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to start (default: 3)")
+    parser.add_argument("--top", type=int, default=20, help="slowest imports and packages to list")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--max-regression", type=float,
+                        help="exit with status 1 if startup is this many percent slower than the baseline")
+    parser.add_argument("--fail-on-heavy", action="store_true",
+                        help="exit with status 1 if a heavy ML package is imported at startup")
+    args = parser.parse_args(argv)
+
+    report = summarise([run_once() for _ in range(args.runs)], args.top)
+    report.update({"version": REPORT_VERSION, "benchmark": "import_time", "environment": environment_info()})
+
+    status = 0
+    if args.baseline:
+        comparison = compare_reports(report, load_report(args.baseline), COMPARED_METRICS)
+        report["comparison"] = comparison
+        print_comparison(comparison)
+        if args.max_regression is not None and worst_regression(comparison) > args.max_regression:
+            status = 1
+    if report["heavy_packages_imported"]:
+        print(f"Heavy packages imported at startup: {', '.join(report['heavy_packages_imported'])}",
+              file=sys.stderr)
+        if args.fail_on_heavy:
+            status = 1
+
+    write_report(report, args.output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for the Django app.
+
+Drives a weighted mix of resume uploads and chat turns from N concurrent
+workers against an in-process app (Django test client, or a local threaded
+HTTP server with --http), with tiny stub models in place of the real ones.
+Writes a JSON report with latency percentiles, throughput and memory growth.
+
+Examples:
+    python benchmarks/load_test.py --workers 8 --requests 400 --output run.json
+    python benchmarks/load_test.py --mix upload=1,synthetic=2,chat=10 --http
+    python benchmarks/load_test.py --baseline run.json --max-regression 20
+"""
+
+import argparse
+import contextlib
+import itertools
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from typing import Dict, List, Tuple
+
+try:
+    from .common import (REPORT_VERSION, SAMPLE_RESUME, compare_reports, environment_info,
+                         load_report, print_comparison, setup_django, worst_regression, write_report)
+    from .stubs import install_stub_models, synthetic_resume_pdf
+except ImportError:
+    # Fallback for when running directly
+    from common import (REPORT_VERSION, SAMPLE_RESUME, compare_reports, environment_info,
+                        load_report, print_comparison, setup_django, worst_regression, write_report)
+    from stubs import install_stub_models, synthetic_resume_pdf
+
+OPERATIONS = ("upload", "synthetic", "chat")
+DEFAULT_MIX = "upload=1,synthetic=1,chat=8"
+
+CHAT_QUESTIONS = [
+    "What skills am I missing for a data scientist role?",
+    "Which career paths fit my background?",
+    "Can you summarize my resume?",
+    "How should I prepare for a backend developer interview?",
+    "Should I learn Kubernetes or focus on machine learning?",
+    "What projects would make my resume stronger?",
+    "How do I move from an internship to a full-time role?",
+]
+
+# Metrics compared against --baseline; the second item says which direction is better
+COMPARED_METRICS = [("throughput_rps", "higher"), ("latency_ms.p50_ms", "lower"),
+                    ("latency_ms.p95_ms", "lower"), ("latency_ms.p99_ms", "lower"),
+                    ("memory.growth_bytes", "lower")]
+for _op in OPERATIONS:
+    COMPARED_METRICS += [(f"operations.{_op}.latency_ms.p50_ms", "lower"),
+                         (f"operations.{_op}.latency_ms.p95_ms", "lower")]
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse "upload=1,chat=8" into operation weights"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class ClientTransport:
+    """One Django test client per worker, so each worker has its own session"""
+
+    def __init__(self):
+        from django.test import Client
+        self.client = Client()
+
+    def get(self, path: str) -> int:
+        return self.client.get(path).status_code
+
+    def post(self, path: str, data: Dict, files: Dict[str, Tuple[str, bytes]] = None) -> int:
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        data = dict(data)
+        for field, (filename, content) in (files or {}).items():
+            data[field] = SimpleUploadedFile(filename, content, content_type="application/pdf")
+        return self.client.post(path, data).status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpTransport:
+    """Real HTTP requests with a per-worker cookie jar and CSRF token"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.cookies = CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect())
+
+    def _open(self, request) -> int:
+        try:
+            with self.opener.open(request, timeout=300) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def _csrf_token(self) -> str:
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        self.get("/upload/")
+        return next((cookie.value for cookie in self.cookies if cookie.name == "csrftoken"), "")
+
+    def get(self, path: str) -> int:
+        return self._open(urllib.request.Request(self.base_url + path))
+
+    def post(self, path: str, data: Dict, files: Dict[str, Tuple[str, bytes]] = None) -> int:
+        boundary = uuid.uuid4().hex
+        body = []
+        for name, value in data.items():
+            body += [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode(),
+                     str(value).encode(), b"\r\n"]
+        for name, (filename, content) in (files or {}).items():
+            body += [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/pdf\r\n\r\n'.encode(), content, b"\r\n"]
+        body.append(f"--{boundary}--\r\n".encode())
+        request = urllib.request.Request(self.base_url + path, data=b"".join(body), method="POST", headers={
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "X-CSRFToken": self._csrf_token(),
+        })
+        return self._open(request)
+
+
+def start_local_server() -> Tuple[str, object]:
+    """Serve the app from a threaded WSGI server on a free local port"""
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return "http://127.0.0.1:%d" % server.server_address[1], server
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.mix = args.mix
+        self.rng = random.Random(args.seed)
+        self.sample_resume = open(SAMPLE_RESUME, "rb").read()
+        self._synthetic_seeds = itertools.count(args.seed * 100000)
+        self._seed_lock = threading.Lock()
+        self.results: List[Tuple[str, float, int]] = []
+        self.base_url = None
+
+    def make_transport(self):
+        if self.base_url:
+            return HttpTransport(self.base_url)
+        return ClientTransport()
+
+    def build_request(self, op: str, rng: random.Random) -> Tuple[str, Dict, Dict]:
+        """(path, form data, files) for one operation, built outside the timed section"""
+        if op == "chat":
+            return "/chat/", {"question": rng.choice(CHAT_QUESTIONS)}, {}
+        if op == "synthetic":
+            with self._seed_lock:
+                seed = next(self._synthetic_seeds)
+            return "/upload/", {}, {"resume": (f"synthetic_{seed}.pdf", synthetic_resume_pdf(seed))}
+        return "/upload/", {}, {"resume": ("Resume.pdf", self.sample_resume)}
+
+    def worker(self, index: int, transport, ops: "queue.Queue[str]"):
+        rng = random.Random(self.args.seed + index)
+        while True:
+            try:
+                op = ops.get_nowait()
+            except queue.Empty:
+                return
+            path, data, files = self.build_request(op, rng)
+            start = time.perf_counter()
+            try:
+                status = transport.post(path, data, files)
+            except Exception:
+                status = 0
+            self.results.append((op, time.perf_counter() - start, status))
+
+    def run(self) -> Dict:
+        from utils.metrics import LatencyHistogram, latency_snapshot, process_memory
+        from career_advisor.rag_service import RAG_AVAILABLE, rag_service
+
+        stubbed = False
+        if not self.args.real_models:
+            stubbed = install_stub_models(rag_service, seconds_per_token=self.args.token_delay_ms / 1000)
+
+        server = None
+        if self.args.http:
+            self.base_url, server = start_local_server()
+
+        memory_start = process_memory()["rss_bytes"]
+
+        # Every worker uploads the sample resume first so chat turns have a session to work with
+        transports = [self.make_transport() for _ in range(self.args.workers)]
+        with ThreadPoolExecutor(self.args.workers) as pool:
+            warmup = list(pool.map(lambda t: t.post(*self.build_request("upload", self.rng)), transports))
+        memory_warm = process_memory()["rss_bytes"]
+
+        names = list(self.mix)
+        ops = queue.Queue()
+        for op in self.rng.choices(names, weights=[self.mix[n] for n in names], k=self.args.requests):
+            ops.put(op)
+
+        peak = [memory_warm]
+        done = threading.Event()
+
+        def sample_memory():
+            while not done.wait(0.2):
+                peak[0] = max(peak[0], process_memory()["rss_bytes"])
+
+        sampler = threading.Thread(target=sample_memory, daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.args.workers) as pool:
+            for index, transport in enumerate(transports):
+                pool.submit(self.worker, index, transport, ops)
+        duration = time.perf_counter() - start
+        done.set()
+        sampler.join()
+        memory_end = process_memory()["rss_bytes"]
+        peak[0] = max(peak[0], memory_end)
+
+        if server is not None:
+            server.shutdown()
+
+        overall = LatencyHistogram(window=max(1, len(self.results)))
+        per_op = {}
+        for op, seconds, status in self.results:
+            overall.observe(seconds)
+            entry = per_op.setdefault(op, {"histogram": LatencyHistogram(window=len(self.results)),
+                                           "errors": 0, "status_codes": {}})
+            entry["histogram"].observe(seconds)
+            entry["status_codes"][str(status)] = entry["status_codes"].get(str(status), 0) + 1
+            if status == 0 or status >= 400:
+                entry["errors"] += 1
+
+        operations = {}
+        for op, entry in sorted(per_op.items()):
+            summary = entry["histogram"].summary()
+            operations[op] = {
+                "requests": summary.pop("count"),
+                "errors": entry["errors"],
+                "status_codes": entry["status_codes"],
+                "throughput_rps": round(entry["histogram"].count / duration, 3) if duration else 0.0,
+                "latency_ms": summary,
+            }
+
+        latency = overall.summary()
+        return {
+            "version": REPORT_VERSION,
+            "benchmark": "load_test",
+            "environment": dict(environment_info(), rag_available=RAG_AVAILABLE, stub_models=stubbed),
+            "config": {
+                "workers": self.args.workers,
+                "requests": self.args.requests,
+                "mix": self.mix,
+                "transport": "http" if self.args.http else "test_client",
+                "seed": self.args.seed,
+                "token_delay_ms": self.args.token_delay_ms,
+            },
+            "warmup_status_codes": warmup,
+            "duration_s": round(duration, 3),
+            "requests": latency.pop("count"),
+            "errors": sum(entry["errors"] for entry in per_op.values()),
+            "throughput_rps": round(len(self.results) / duration, 3) if duration else 0.0,
+            "latency_ms": latency,
+            "operations": operations,
+            "memory": {
+                "rss_start_bytes": memory_start,
+                "rss_after_warmup_bytes": memory_warm,
+                "rss_end_bytes": memory_end,
+                "peak_rss_bytes": peak[0],
+                "growth_bytes": memory_end - memory_warm,
+            },
+            "stage_latency": latency_snapshot(),
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="concurrent workers (default: 4)")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests after warmup (default: 200)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--http", action="store_true", help="go through a local threaded HTTP server")
+    parser.add_argument("--real-models", action="store_true", help="load the real models instead of stubs")
+    parser.add_argument("--token-delay-ms", type=float, default=0.0,
+                        help="simulated decode time per generated token for the stub model")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--max-regression", type=float,
+                        help="exit with status 1 if any compared metric is this many percent worse")
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    # Uploads are written under ./media, so run from a scratch directory
+    workdir = tempfile.mkdtemp(prefix="sahay-load-")
+    os.chdir(workdir)
+
+    # The app prints debug lines; keep stdout for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        setup_django(os.path.join(workdir, "load_test.sqlite3"))
+        report = LoadTest(args).run()
+
+    status = 0
+    if args.baseline:
+        comparison = compare_reports(report, load_report(baseline), COMPARED_METRICS)
+        report["comparison"] = comparison
+        print_comparison(comparison)
+        if args.max_regression is not None and worst_regression(comparison) > args.max_regression:
+            status = 1
+
+    write_report(report, output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory with and without pre-fork model loading.
+
+For each mode, a fresh master process forks N workers:
+  per_worker  each worker loads its own models, as gunicorn does by default
+  prefork     the master loads and freezes the models (career_advisor.prefork)
+              and the workers inherit them copy-on-write
+Every worker runs a warm-up inference and a GC pass. While all of them are
+alive, their USS (memory unique to the process), PSS and RSS are read from
+/proc. The summed PSS of master and workers is the group's real footprint.
+
+--models real uses the app's models and needs the RAG stack. --models synthetic
+(the default) stands in with numpy weights plus many small Python objects, so
+the copy-on-write behaviour can be checked anywhere.
+
+Examples:
+    python benchmarks/prefork_memory.py --workers 4
+    python benchmarks/prefork_memory.py --models real --workers 3 --output prefork.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+from typing import Callable, Dict, List, Tuple
+
+try:
+    from .common import REPORT_VERSION, environment_info, setup_django, setup_paths, write_report
+except ImportError:
+    # Fallback for when running directly
+    from common import REPORT_VERSION, environment_info, setup_django, setup_paths, write_report
+
+MODES = ("per_worker", "prefork")
+
+
+class SyntheticModel:
+    """numpy weights plus a vocabulary of small Python objects, standing in for model and tokenizer"""
+
+    def __init__(self, weight_mb: int, objects: int):
+        import numpy as np
+
+        rows = max(1, weight_mb * 1024 * 1024 // (4 * 1024))
+        self.weights = np.random.default_rng(0).standard_normal((rows, 1024), dtype=np.float32)
+        self.vocab = {f"token{i}": [i, float(i)] for i in range(objects)}
+
+    def infer(self):
+        import numpy as np
+
+        (self.weights @ np.ones(1024, dtype=np.float32)).sum()
+        # Walking the vocabulary touches refcounts, as tokenizer lookups do
+        sum(entry[0] for entry in self.vocab.values())
+
+
+def synthetic_hooks(args) -> Tuple[Callable, Callable, Callable]:
+    state = {}
+
+    def load():
+        state["model"] = SyntheticModel(args.synthetic_mb, args.synthetic_objects)
+
+    def prepare():
+        load()
+        gc.collect()
+        gc.freeze()
+
+    def warm():
+        state["model"].infer()
+
+    return load, prepare, warm
+
+
+def real_hooks(args) -> Tuple[Callable, Callable, Callable]:
+    import tempfile
+
+    setup_django(os.path.join(tempfile.mkdtemp(prefix="sahay-prefork-"), "prefork.sqlite3"))
+    from career_advisor import prefork
+    from career_advisor.rag_service import RAG_AVAILABLE, rag_service
+
+    if not RAG_AVAILABLE:
+        raise SystemExit("--models real needs the RAG dependencies installed")
+    return rag_service.load_models, prefork.prepare_for_fork, lambda: prefork.after_fork(args.workers)
+
+
+def read_memory(pid: int) -> Dict[str, int]:
+    from utils.metrics import shared_memory
+
+    memory = shared_memory(pid)
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                memory["rss_bytes"] = int(line.split()[1]) * 1024
+    return memory
+
+
+def run_mode(mode: str, args) -> Dict:
+    """Body of one measurement subprocess: fork workers, measure them while all are alive"""
+    setup_paths()
+    load, prepare, warm = (real_hooks if args.models == "real" else synthetic_hooks)(args)
+    if mode == "prefork":
+        prepare()
+
+    workers: List[Tuple[int, int, int]] = []
+    for _ in range(args.workers):
+        ready_r, ready_w = os.pipe()
+        exit_r, exit_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                if mode == "per_worker":
+                    load()
+                warm()
+                gc.collect()
+                os.write(ready_w, b"1")
+                os.read(exit_r, 1)
+            except BaseException:
+                status = 1
+                os.write(ready_w, b"0")
+            finally:
+                os._exit(status)
+        os.close(ready_w)
+        os.close(exit_r)
+        workers.append((pid, ready_r, exit_w))
+
+    failures = sum(os.read(ready_r, 1) != b"1" for _, ready_r, _ in workers)
+    samples = [read_memory(pid) for pid, _, _ in workers]
+    master = read_memory(os.getpid())
+    for pid, _, exit_w in workers:
+        os.write(exit_w, b"1")
+        os.waitpid(pid, 0)
+
+    def mean(key):
+        return int(sum(sample.get(key, 0) for sample in samples) / len(samples))
+
+    return {
+        "workers": samples,
+        "failed_workers": failures,
+        "master": master,
+        "worker_uss_mean_bytes": mean("uss_bytes"),
+        "worker_pss_mean_bytes": mean("pss_bytes"),
+        "worker_rss_mean_bytes": mean("rss_bytes"),
+        "total_pss_bytes": master.get("pss_bytes", 0) + sum(sample.get("pss_bytes", 0) for sample in samples),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--models", choices=("synthetic", "real"), default="synthetic")
+    parser.add_argument("--synthetic-mb", type=int, default=256, help="synthetic weight size (default: 256)")
+    parser.add_argument("--synthetic-objects", type=int, default=200000,
+                        help="small Python objects in the synthetic vocabulary (default: 200000)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        raise SystemExit("USS/PSS need /proc/<pid>/smaps_rollup (Linux 4.14+)")
+
+    if args.run_mode:
+        # Child invocation: one mode, JSON on the last stdout line
+        result = run_mode(args.run_mode, args)
+        sys.stdout.flush()
+        print(json.dumps(result))
+        return 0
+
+    # Each mode runs in its own fresh interpreter so neither inherits the other's heap
+    modes = {}
+    passthrough = ["--workers", str(args.workers), "--models", args.models,
+                   "--synthetic-mb", str(args.synthetic_mb), "--synthetic-objects", str(args.synthetic_objects)]
+    for mode in MODES:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-mode", mode] + passthrough,
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise SystemExit(f"{mode} run failed:\n{proc.stderr[-2000:]}")
+        modes[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    before, after = modes["per_worker"], modes["prefork"]
+    report = {
+        "version": REPORT_VERSION,
+        "benchmark": "prefork_memory",
+        "environment": environment_info(),
+        "config": {"workers": args.workers, "models": args.models,
+                   "synthetic_mb": args.synthetic_mb, "synthetic_objects": args.synthetic_objects},
+        "modes": modes,
+        "worker_uss_saved_bytes": before["worker_uss_mean_bytes"] - after["worker_uss_mean_bytes"],
+        "total_pss_saved_bytes": before["total_pss_bytes"] - after["total_pss_bytes"],
+    }
+    mb = 1024 * 1024
+    for mode, result in modes.items():
+        print(f"{mode:<11} worker USS {result['worker_uss_mean_bytes'] / mb:8.1f} MB   "
+              f"total PSS {result['total_pss_bytes'] / mb:8.1f} MB", file=sys.stderr)
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Library-level benchmarks for the resume and RAG code in src/.
+
+Times each stage in isolation: PDF extraction, resume parsing, retriever
+construction, retriever queries and a full get_career_advice call. Models are
+pluggable with --models: "stub" (default, tiny stand-ins suitable for CI),
+"real" (the app's own models), or "package.module:factory" returning an
+(embeddings, generator) pair. Results are compared per stage against a stored
+baseline so regressions in src/rag and src/utils show up before release.
+
+Examples:
+    python benchmarks/rag_bench.py
+    python benchmarks/rag_bench.py --stages parse_resume,build_retriever --min-time 2
+    python benchmarks/rag_bench.py --save-baseline
+    python benchmarks/rag_bench.py --max-regression 25
+"""
+
+import argparse
+import contextlib
+import importlib
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from .common import (BASE_DIR, REPORT_VERSION, SAMPLE_RESUME, compare_reports, environment_info,
+                         load_report, print_comparison, setup_paths, worst_regression, write_report)
+    from .stubs import HashEmbeddings, StubGenerator
+except ImportError:
+    # Fallback for when running directly
+    from common import (BASE_DIR, REPORT_VERSION, SAMPLE_RESUME, compare_reports, environment_info,
+                        load_report, print_comparison, setup_paths, worst_regression, write_report)
+    from stubs import HashEmbeddings, StubGenerator
+
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmarks", "baselines", "rag_bench.json")
+
+QUERIES = [
+    "What programming languages does the candidate know?",
+    "Describe the candidate's projects",
+    "What is the candidate's education?",
+]
+
+ADVICE_QUESTION = "What skills should I learn next for a data scientist role?"
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup function when a stage can't run in this environment"""
+
+
+def load_models(spec: str) -> Tuple[Optional[object], Optional[object]]:
+    """(embeddings, generator) for --models; None means the app's own default"""
+    if spec == "stub":
+        return HashEmbeddings(), StubGenerator()
+    if spec == "real":
+        return None, None
+    module_name, _, factory = spec.partition(":")
+    if not factory:
+        raise SystemExit(f"--models must be stub, real or module:factory, not {spec!r}")
+    return getattr(importlib.import_module(module_name), factory)()
+
+
+class Context:
+    """Objects shared between stages, built lazily so each stage can run alone"""
+
+    def __init__(self, models: str):
+        self.models = models
+        self._embeddings, self._generator = load_models(models)
+        self._raw_text = None
+        self._resume_data = None
+        self._retriever = None
+
+    def rag_modules(self):
+        try:
+            from rag import retriever, vector_store
+        except ImportError as e:
+            raise SkipBenchmark(f"RAG stack not importable: {e}")
+        if self._embeddings is not None:
+            vector_store._embeddings = self._embeddings
+        return retriever
+
+    @property
+    def raw_text(self) -> str:
+        if self._raw_text is None:
+            from utils.pdf_parser import extract_text_from_pdf
+            self._raw_text = extract_text_from_pdf(SAMPLE_RESUME)
+        return self._raw_text
+
+    @property
+    def resume_data(self) -> Dict:
+        if self._resume_data is None:
+            from utils.resume_parser import parse_resume
+            self._resume_data = parse_resume(self.raw_text)
+        return self._resume_data
+
+    @property
+    def retriever(self):
+        if self._retriever is None:
+            self._retriever = self.rag_modules().build_retriever(SAMPLE_RESUME, resume_data=self.resume_data)
+            if self._retriever is None:
+                raise SkipBenchmark("build_retriever returned None")
+        return self._retriever
+
+    def pipeline(self):
+        self.rag_modules()
+        from rag.rag_pipeline import CareerRAGPipeline
+        return CareerRAGPipeline(SAMPLE_RESUME, cached_model=self._generator, resume_data=self.resume_data)
+
+
+# Each setup takes the Context and returns the zero-argument callable to time
+def setup_pdf_extraction(ctx: Context) -> Callable:
+    from utils.pdf_parser import extract_text_from_pdf
+    return lambda: extract_text_from_pdf(SAMPLE_RESUME)
+
+
+def setup_parse_resume(ctx: Context) -> Callable:
+    from utils.resume_parser import parse_resume
+    raw_text = ctx.raw_text
+    return lambda: parse_resume(raw_text)
+
+
+def setup_build_retriever(ctx: Context) -> Callable:
+    retriever_module = ctx.rag_modules()
+    resume_data = ctx.resume_data
+    return lambda: retriever_module.build_retriever(SAMPLE_RESUME, resume_data=resume_data)
+
+
+def setup_retriever_query(ctx: Context) -> Callable:
+    retriever = ctx.retriever
+    state = {"i": 0}
+
+    def run():
+        state["i"] += 1
+        return retriever.invoke(QUERIES[state["i"] % len(QUERIES)])
+    return run
+
+
+def setup_career_advice(ctx: Context) -> Callable:
+    pipeline = ctx.pipeline()
+
+    def run():
+        # Start each call from an empty history so every round does the same work
+        pipeline.clear_history()
+        result = pipeline.get_career_advice(ADVICE_QUESTION)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        return result
+    return run
+
+
+BENCHMARKS = {
+    "pdf_extraction": setup_pdf_extraction,
+    "parse_resume": setup_parse_resume,
+    "build_retriever": setup_build_retriever,
+    "retriever_query": setup_retriever_query,
+    "career_advice": setup_career_advice,
+}
+
+
+def measure(func: Callable, min_time: float, min_rounds: int, max_rounds: int) -> Dict:
+    """Run func after one warmup call until min_time has passed (within the round limits)"""
+    func()
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    ms = [t * 1000 for t in timings]
+    return {
+        "rounds": len(ms),
+        "min_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(0.95 * len(ms)))], 3),
+        "stdev_ms": round(statistics.stdev(ms), 3) if len(ms) > 1 else 0.0,
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def run_benchmarks(names: List[str], args) -> Dict:
+    ctx = Context(args.models)
+    stages = {}
+    for name in names:
+        try:
+            func = BENCHMARKS[name](ctx)
+            stages[name] = measure(func, args.min_time, args.min_rounds, args.max_rounds)
+        except SkipBenchmark as e:
+            stages[name] = {"skipped": str(e)}
+        except Exception as e:
+            stages[name] = {"error": f"{type(e).__name__}: {e}"}
+        print(f"{name:<16} {stages[name]}", file=sys.stderr)
+    return stages
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", default=",".join(BENCHMARKS),
+                        help=f"comma-separated stages (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--models", default="stub", help="stub, real or module:factory (default: stub)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to spend per stage (default: 0.5)")
+    parser.add_argument("--min-rounds", type=int, default=5)
+    parser.add_argument("--max-rounds", type=int, default=1000)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="report to compare against (default: benchmarks/baselines/rag_bench.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--max-regression", type=float,
+                        help="exit with status 1 if any stage median is this many percent slower")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.stages.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    setup_paths()
+    # Library code prints progress; keep stdout for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        stages = run_benchmarks(names, args)
+
+    report = {
+        "version": REPORT_VERSION,
+        "benchmark": "rag_bench",
+        "environment": environment_info(),
+        "config": {"models": args.models, "min_time": args.min_time,
+                   "min_rounds": args.min_rounds, "max_rounds": args.max_rounds},
+        "stages": stages,
+    }
+
+    status = 0
+    skipped = sorted(name for name, result in stages.items() if "skipped" in result)
+    if args.save_baseline and skipped:
+        # A baseline missing the RAG stages would silently stop guarding them
+        print(f"Not saving a baseline with skipped stages ({', '.join(skipped)}); "
+              f"record it on a full install", file=sys.stderr)
+        status = 1
+    elif args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        write_report(report, args.baseline)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        baseline = load_report(args.baseline)
+        if baseline.get("config", {}).get("models") != args.models:
+            print("Baseline was recorded with different models; comparison may not be meaningful", file=sys.stderr)
+        comparison = compare_reports(report, baseline, [(f"stages.{name}.median_ms", "lower") for name in names])
+        report["comparison"] = comparison
+        print_comparison(comparison)
+        if args.max_regression is not None and worst_regression(comparison) > args.max_regression:
+            status = 1
+
+    if args.output or not args.save_baseline:
+        write_report(report, args.output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
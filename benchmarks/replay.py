@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded traffic log (settings.TRAFFIC_LOG_PATH) against a fresh
+RAGService, to evaluate cache policies and scheduling on realistic traffic.
+
+Each record switches the service to the record's resume, as a request from
+that user would, and then re-runs the chat question or skills-gap analysis.
+Resumes are found by content hash in --resume-dir. Hashes that can't be found
+get a synthetic resume per hash, so the cache sees the same pattern of
+distinct resumes. Pacing follows the recorded timestamps divided by --speed
+(0 replays as fast as possible). With --workers above 1, requests share the
+one service and its current pipeline, as concurrent requests in a single app
+process do.
+
+Examples:
+    python benchmarks/replay.py logs/traffic.jsonl --speed 10 --output replay.json
+    python benchmarks/replay.py logs/traffic.jsonl --speed 0 --resume-dir media/resumes --workers 4
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    from .common import (REPORT_VERSION, compare_reports, environment_info, load_report,
+                         print_comparison, setup_django, worst_regression, write_report)
+    from .stubs import install_stub_models, synthetic_resume_pdf
+except ImportError:
+    # Fallback for when running directly
+    from common import (REPORT_VERSION, compare_reports, environment_info, load_report,
+                        print_comparison, setup_django, worst_regression, write_report)
+    from stubs import install_stub_models, synthetic_resume_pdf
+
+KINDS = ("chat", "skills_gap")
+
+COMPARED_METRICS = [("pipeline_cache.hit_rate", "higher"), ("schedule_lag_ms.p95_ms", "lower")]
+for _kind in KINDS:
+    COMPARED_METRICS += [(f"kinds.{_kind}.replayed_ms.p50_ms", "lower"),
+                         (f"kinds.{_kind}.replayed_ms.p95_ms", "lower")]
+
+
+def load_log(path: str, limit: Optional[int] = None) -> List[Dict]:
+    """Records of known kinds, in timestamp order"""
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("kind") in KINDS:
+                records.append(record)
+    records.sort(key=lambda record: record["ts"])
+    return records[:limit] if limit else records
+
+
+class ResumeResolver:
+    """Maps recorded resume hashes to PDF files on disk"""
+
+    def __init__(self, resume_dir: Optional[str], workdir: str):
+        self.workdir = workdir
+        self.paths: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if resume_dir:
+            for name in os.listdir(resume_dir):
+                path = os.path.join(resume_dir, name)
+                if name.lower().endswith(".pdf") and os.path.isfile(path):
+                    with open(path, "rb") as f:
+                        self.paths[hashlib.md5(f.read()).hexdigest()] = path
+        self.found = len(self.paths)
+        self.synthetic = 0
+
+    def path_for(self, resume_hash: str) -> str:
+        with self._lock:
+            path = self.paths.get(resume_hash)
+            if path is None:
+                # Same recorded hash, same synthetic resume
+                path = os.path.join(self.workdir, f"synthetic_{resume_hash}.pdf")
+                with open(path, "wb") as f:
+                    f.write(synthetic_resume_pdf(int(resume_hash[:8], 16)))
+                self.paths[resume_hash] = path
+                self.synthetic += 1
+            return path
+
+
+class Replayer:
+    def __init__(self, service, resolver: ResumeResolver):
+        self.service = service
+        self.resolver = resolver
+        self.current_hash = None
+        self.results: List[Dict] = []
+
+    def _switch_resume(self, resume_hash: Optional[str]):
+        if not resume_hash or resume_hash == self.current_hash:
+            return
+        path = self.resolver.path_for(resume_hash)
+        if not self.service.initialize_rag(path):
+            self.service.ingest_resume(path)
+        self.current_hash = resume_hash
+
+    def _run(self, record: Dict) -> str:
+        """Replay one record on the service; returns the route that answered it"""
+        from career_advisor.role_catalog import get_role_catalog
+
+        if record["kind"] == "chat":
+            question = record.get("question") or ""
+            route = self.service.route_question(question)
+            # As in the chat view, a skills-gap question only gets a template when it names a role
+            if route and (route[0] != "skills_gap" or get_role_catalog().find_role(question) is not None):
+                return "intent"
+            result = self.service.get_career_advice(question)
+            return "fallback" if "error" in result else "rag"
+        result = self.service.analyze_skills_gap_rag(record.get("target_role") or "Data Scientist")
+        return "fallback" if "error" in result else "rag"
+
+    def replay(self, record: Dict, lag: float):
+        start = time.perf_counter()
+        try:
+            self._switch_resume(record.get("resume_hash"))
+            route = self._run(record)
+        except Exception as e:
+            route = "error: %s" % type(e).__name__
+        self.results.append({
+            "kind": record["kind"],
+            "seconds": time.perf_counter() - start,
+            "lag": lag,
+            "route": route,
+            "recorded_ms": record.get("duration_ms"),
+            "recorded_route": record.get("route"),
+            "recorded_cache": record.get("cache"),
+        })
+
+
+def cache_counts() -> Dict[str, float]:
+    from career_advisor.rag_service import PIPELINE_CACHE_REQUESTS
+    return {labels[0]: value for labels, value in PIPELINE_CACHE_REQUESTS.samples()}
+
+
+def run_replay(records: List[Dict], replayer: Replayer, speed: float, workers: int) -> float:
+    """Dispatch records at their (scaled) recorded offsets; returns wall time"""
+    if not records:
+        return 0.0
+    origin = records[0]["ts"]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        for record in records:
+            due = (record["ts"] - origin) / speed if speed > 0 else 0.0
+            wait = due - (time.perf_counter() - start)
+            if wait > 0:
+                time.sleep(wait)
+            lag = max(0.0, (time.perf_counter() - start) - due)
+            if workers == 1:
+                replayer.replay(record, lag)
+            else:
+                pool.submit(replayer.replay, record, lag)
+    return time.perf_counter() - start
+
+
+def summarise(results: List[Dict], duration: float, before: Dict, after: Dict) -> Dict:
+    from utils.metrics import LatencyHistogram
+
+    window = max(1, len(results))
+    lag = LatencyHistogram(window=window)
+    kinds = {}
+    for result in results:
+        lag.observe(result["lag"])
+        entry = kinds.setdefault(result["kind"], {
+            "replayed": LatencyHistogram(window=window), "recorded": LatencyHistogram(window=window),
+            "routes": {}, "recorded_routes": {}, "recorded_cache": {},
+        })
+        entry["replayed"].observe(result["seconds"])
+        if result["recorded_ms"] is not None:
+            entry["recorded"].observe(result["recorded_ms"] / 1000)
+        entry["routes"][result["route"]] = entry["routes"].get(result["route"], 0) + 1
+        recorded_route = str(result["recorded_route"])
+        entry["recorded_routes"][recorded_route] = entry["recorded_routes"].get(recorded_route, 0) + 1
+        recorded_cache = str(result["recorded_cache"])
+        entry["recorded_cache"][recorded_cache] = entry["recorded_cache"].get(recorded_cache, 0) + 1
+
+    hits = after.get("hit", 0) - before.get("hit", 0)
+    misses = after.get("miss", 0) - before.get("miss", 0)
+    return {
+        "requests": len(results),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(results) / duration, 3) if duration else 0.0,
+        "schedule_lag_ms": lag.summary(),
+        "pipeline_cache": {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        },
+        "kinds": {
+            kind: {
+                "replayed_ms": entry["replayed"].summary(),
+                "recorded_ms": entry["recorded"].summary(),
+                "routes": entry["routes"],
+                "recorded_routes": entry["recorded_routes"],
+                "recorded_cache": entry["recorded_cache"],
+            }
+            for kind, entry in sorted(kinds.items())
+        },
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="JSONL traffic log written by the recorder")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="pacing multiplier: 1 is original, 10 is ten times faster, 0 is no pacing")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent replay workers (default: 1)")
+    parser.add_argument("--limit", type=int, help="replay only the first N records")
+    parser.add_argument("--resume-dir", help="directory of PDFs to match against recorded resume hashes")
+    parser.add_argument("--real-models", action="store_true", help="load the real models instead of stubs")
+    parser.add_argument("--token-delay-ms", type=float, default=0.0,
+                        help="simulated decode time per generated token for the stub model")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier replay report to compare against")
+    parser.add_argument("--max-regression", type=float,
+                        help="exit with status 1 if any compared metric is this many percent worse")
+    args = parser.parse_args(argv)
+
+    log_path = os.path.abspath(args.log)
+    resume_dir = os.path.abspath(args.resume_dir) if args.resume_dir else None
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+    records = load_log(log_path, args.limit)
+
+    workdir = tempfile.mkdtemp(prefix="sahay-replay-")
+    os.chdir(workdir)
+
+    # The app prints debug lines; keep stdout for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        setup_django(os.path.join(workdir, "replay.sqlite3"))
+        from career_advisor.rag_service import RAG_AVAILABLE, RAGService
+
+        service = RAGService()
+        stubbed = False
+        if not args.real_models:
+            stubbed = install_stub_models(service, seconds_per_token=args.token_delay_ms / 1000)
+
+        resolver = ResumeResolver(resume_dir, workdir)
+        replayer = Replayer(service, resolver)
+        before = cache_counts()
+        duration = run_replay(records, replayer, args.speed, args.workers)
+        report = summarise(replayer.results, duration, before, cache_counts())
+
+    report.update({
+        "version": REPORT_VERSION,
+        "benchmark": "replay",
+        "environment": dict(environment_info(), rag_available=RAG_AVAILABLE, stub_models=stubbed),
+        "config": {"log": log_path, "records": len(records), "speed": args.speed, "workers": args.workers},
+        "resumes": {"on_disk": resolver.found, "synthetic": resolver.synthetic},
+    })
+
+    status = 0
+    if baseline:
+        comparison = compare_reports(report, load_report(baseline), COMPARED_METRICS)
+        report["comparison"] = comparison
+        print_comparison(comparison)
+        if args.max_regression is not None and worst_regression(comparison) > args.max_regression:
+            status = 1
+
+    write_report(report, output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
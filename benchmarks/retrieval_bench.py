@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Dense-only versus hybrid (BM25 + dense) retrieval over synthetic resumes.
+
+Each resume is chunked as the app does (utils.chunking) and queried two ways:
+  keyword   "Has the candidate worked with Node.js?" - hit if a returned chunk
+            contains the tool name
+  semantic  "Where did the candidate study?" - hit if the section that
+            answers it is returned
+Both modes rank with the same code the app uses (utils.lexical_index and
+utils.vector_index), so dense scores are cosine similarities.
+Latency covers the query embedding, so the hybrid mode's lexical fast path
+shows up as time saved.
+
+With --models stub the embeddings are hashed bags of words, which behave much
+like keyword search; use --models real for representative hit rates. Stub
+query embeddings are also nearly free, so --query-embed-ms adds the time a
+real model takes per query embedding (all-MiniLM-L6-v2 on one CPU core takes
+roughly 5-15 ms) to show what the fast path saves.
+
+Examples:
+    python benchmarks/retrieval_bench.py
+    python benchmarks/retrieval_bench.py --query-embed-ms 10
+    python benchmarks/retrieval_bench.py --models real --resumes 50 --k 3
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+try:
+    from .common import REPORT_VERSION, environment_info, setup_paths, write_report
+    from .stubs import HashEmbeddings, synthetic_resume_text
+except ImportError:
+    # Fallback for when running directly
+    from common import REPORT_VERSION, environment_info, setup_paths, write_report
+    from stubs import HashEmbeddings, synthetic_resume_text
+
+SEMANTIC_QUERIES = {
+    "education": ["Where did the candidate study?", "What degree does the candidate hold?"],
+    "experience": ["Tell me about their internship", "What jobs has the candidate had?"],
+    "projects": ["What has the candidate built?", "Describe the candidate's side work"],
+    "certifications": ["Which courses has the candidate completed?"],
+}
+
+KEYWORD_TEMPLATES = [
+    "Has the candidate worked with {skill}?",
+    "{skill} experience",
+    "Does the resume mention {skill}",
+]
+
+
+def build_cases(text: str, sections: List[str], rng: random.Random) -> List[Dict]:
+    """Queries for one resume, each with how to recognise a hit"""
+    skills_line = text.split("SKILLS\n", 1)[1].splitlines()[0]
+    cases = []
+    for skill in rng.sample(skills_line.split(", "), 3):
+        query = rng.choice(KEYWORD_TEMPLATES).format(skill=skill)
+        cases.append({"kind": "keyword", "query": query, "contains": skill.lower()})
+    for section, queries in SEMANTIC_QUERIES.items():
+        if section in sections:
+            cases.append({"kind": "semantic", "query": rng.choice(queries), "section": section})
+    return cases
+
+
+class SlowQueryEmbeddings(HashEmbeddings):
+    """Stub embeddings that take a fixed time per query, like a real model"""
+
+    def __init__(self, seconds: float):
+        super().__init__()
+        self.seconds = seconds
+
+    def embed_query(self, text: str):
+        time.sleep(self.seconds)
+        return super().embed_query(text)
+
+
+def load_embedder(models: str, query_embed_ms: float = 0.0):
+    if models == "stub":
+        return SlowQueryEmbeddings(query_embed_ms / 1000) if query_embed_ms else HashEmbeddings()
+    from sentence_transformers import SentenceTransformer
+    from utils.model_paths import resolve_model_path
+
+    model = SentenceTransformer(resolve_model_path("all-MiniLM-L6-v2"))
+
+    class Embedder:
+        def embed_documents(self, texts):
+            return model.encode(texts, convert_to_numpy=True)
+
+        def embed_query(self, text):
+            return model.encode([text], convert_to_numpy=True)[0]
+    return Embedder()
+
+
+def is_hit(case: Dict, chunks: List[str], sections: List[str], positions: List[int]) -> bool:
+    if case["kind"] == "keyword":
+        return any(case["contains"] in chunks[p].lower() for p in positions)
+    return any(sections[p] == case["section"] for p in positions)
+
+
+def run(args) -> Dict:
+    from utils.chunking import chunk_resume
+    from utils.lexical_index import BM25Index, hybrid_rank, top_k
+    from utils.vector_index import build_vector_index, normalise
+
+    embedder = load_embedder(args.models, args.query_embed_ms)
+    rng = random.Random(args.seed)
+    results = {mode: {"hits": {"keyword": [], "semantic": []}, "ms": [], "lexical": 0, "filled": 0}
+               for mode in ("dense", "hybrid")}
+
+    for seed in range(args.resumes):
+        text = synthetic_resume_text(seed)
+        resume_chunks = chunk_resume(text)
+        chunks = [chunk.text for chunk in resume_chunks]
+        sections = [chunk.section for chunk in resume_chunks]
+        index = build_vector_index(embedder.embed_documents(chunks))
+        lexical_index = BM25Index(chunks)
+
+        def dense_scores(query):
+            return index.similarities(normalise(embedder.embed_query(query)))
+
+        for case in build_cases(text, sections, rng):
+            query = case["query"]
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                dense_positions = top_k(dense_scores(query), args.k)
+                results["dense"]["ms"].append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                hybrid_positions, path = hybrid_rank(lexical_index.scores(query), lambda: dense_scores(query), args.k)
+                results["hybrid"]["ms"].append((time.perf_counter() - start) * 1000)
+            results["dense"]["hits"][case["kind"]].append(is_hit(case, chunks, sections, dense_positions))
+            results["hybrid"]["hits"][case["kind"]].append(is_hit(case, chunks, sections, hybrid_positions))
+            results["hybrid"]["lexical"] += path == "lexical"
+            results["hybrid"]["filled"] += path == "filled"
+
+    modes = {}
+    for mode, result in results.items():
+        ms = sorted(result["ms"])
+        queries = sum(len(hits) for hits in result["hits"].values())
+        summary = {
+            "queries": queries,
+            "hit_rate": round(sum(sum(hits) for hits in result["hits"].values()) / queries, 3),
+            "keyword_hit_rate": round(statistics.fmean(result["hits"]["keyword"]), 3),
+            "semantic_hit_rate": round(statistics.fmean(result["hits"]["semantic"]), 3),
+            "mean_ms": round(statistics.fmean(ms), 4),
+            "median_ms": round(statistics.median(ms), 4),
+            "p95_ms": round(ms[min(len(ms) - 1, int(0.95 * len(ms)))], 4),
+        }
+        if mode == "hybrid":
+            summary["lexical_fast_path"] = round(result["lexical"] / queries, 3)
+            summary["filled_from_dense"] = round(result["filled"] / queries, 3)
+        modes[mode] = summary
+    return modes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", choices=("stub", "real"), default="stub")
+    parser.add_argument("--resumes", type=int, default=30, help="synthetic resumes to query (default: 30)")
+    parser.add_argument("--k", type=int, default=3, help="chunks returned per query (default: 3)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (default: 5)")
+    parser.add_argument("--query-embed-ms", type=float, default=0.0,
+                        help="simulated time per query embedding with --models stub (default: 0)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    setup_paths()
+    modes = run(args)
+    for mode, summary in modes.items():
+        print(f"{mode:<7} {summary}", file=sys.stderr)
+
+    report = {
+        "version": REPORT_VERSION,
+        "benchmark": "retrieval_bench",
+        "environment": environment_info(),
+        "config": {"models": args.models, "resumes": args.resumes, "k": args.k,
+                   "repeat": args.repeat, "seed": args.seed, "query_embed_ms": args.query_embed_ms},
+        "modes": modes,
+        "hit_rate_gain": round(modes["hybrid"]["hit_rate"] - modes["dense"]["hit_rate"], 3),
+        "median_speedup": round(modes["dense"]["median_ms"] / max(modes["hybrid"]["median_ms"], 1e-6), 2),
+        "mean_speedup": round(modes["dense"]["mean_ms"] / max(modes["hybrid"]["mean_ms"], 1e-6), 2),
+    }
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Role scoring time against synthetic role catalogs of several sizes.
+
+data/role_catalog.json ships about 50 roles, far fewer than a production
+taxonomy. This builds catalogs of hundreds to thousands of synthetic roles
+(each needing a handful of skills from a shared vocabulary) and times
+rank_roles() for one resume and score_many() for a batch of resumes, so the
+CSR scoring path can be checked at realistic catalog sizes.
+
+Examples:
+    python benchmarks/role_catalog_bench.py
+    python benchmarks/role_catalog_bench.py --sizes 500,5000 --resumes 1000 --output catalog.json
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+try:
+    from .common import REPORT_VERSION, environment_info, setup_paths, write_report
+except ImportError:
+    # Fallback for when running directly
+    from common import REPORT_VERSION, environment_info, setup_paths, write_report
+
+DEFAULT_SIZES = "50,200,1000,5000"
+
+
+def median_us(func: Callable, rounds: int) -> float:
+    func()
+    timings: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1e6, 2)
+
+
+def skill_name(number: int) -> str:
+    # Letters rather than digits, which skill normalisation strips as version numbers
+    letters = ""
+    while True:
+        number, digit = divmod(number, 26)
+        letters += chr(ord("a") + digit)
+        if not number:
+            return "skill" + letters
+
+
+def synthetic_roles(count: int, vocabulary: int, rng: random.Random) -> List[Dict]:
+    """Roles needing 4-15 skills each, drawn with a skew so some skills are common"""
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    roles = []
+    for row in range(count):
+        skills = set()
+        target = rng.randint(4, 15)
+        while len(skills) < target:
+            skills.update(rng.choices(range(vocabulary), weights=weights, k=target - len(skills)))
+        roles.append({"name": "Role %d" % row, "skills": [skill_name(skill) for skill in sorted(skills)]})
+    return roles
+
+
+def run(args) -> Dict:
+    from career_advisor.role_catalog import RoleCatalog
+
+    rng = random.Random(args.seed)
+    sizes = {}
+    for size in [int(value) for value in args.sizes.split(",") if value.strip()]:
+        catalog = RoleCatalog(synthetic_roles(size, args.vocabulary, rng))
+        resumes = np.zeros((args.resumes, catalog.n_skills), dtype=bool)
+        for row in resumes:
+            row[rng.sample(range(catalog.n_skills), min(args.skills, catalog.n_skills))] = True
+        state = {"i": 0}
+
+        def rank_one():
+            state["i"] += 1
+            return catalog.rank_roles(resumes[state["i"] % len(resumes)], top_k=3)
+
+        results = {
+            "skills": catalog.n_skills,
+            "required_skills": int(len(catalog.indices)),
+            "rank_roles_us": median_us(rank_one, args.rounds),
+            "score_many_us": median_us(lambda: catalog.score_many(resumes), max(1, args.rounds // 10)),
+        }
+        results["score_many_us_per_resume"] = round(results["score_many_us"] / args.resumes, 3)
+        sizes[str(size)] = results
+        print(f"{size:>6} {results}", file=sys.stderr)
+    return sizes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated role counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--vocabulary", type=int, default=2000, help="distinct skills across all roles (default: 2000)")
+    parser.add_argument("--resumes", type=int, default=500, help="resumes per score_many() batch (default: 500)")
+    parser.add_argument("--skills", type=int, default=12, help="skills per synthetic resume (default: 12)")
+    parser.add_argument("--rounds", type=int, default=200, help="timed runs per measurement (default: 200)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    setup_paths()
+    report = {
+        "version": REPORT_VERSION,
+        "benchmark": "role_catalog_bench",
+        "environment": environment_info(),
+        "config": {"sizes": args.sizes, "vocabulary": args.vocabulary, "resumes": args.resumes,
+                   "skills": args.skills, "rounds": args.rounds, "seed": args.seed},
+        "sizes": run(args),
+    }
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Tiny stand-ins for the embedding and generation models, so benchmarks measure
+the app (parsing, chunking, indexing, prompt packing, Django) instead of model
+downloads and CPU inference.
+"""
+
+import hashlib
+import random
+import time
+import zlib
+from typing import List
+
+import numpy as np
+
+try:
+    from langchain.embeddings.base import Embeddings
+except ImportError:
+    Embeddings = object
+
+EMBEDDING_DIM = 384  # Same width as all-MiniLM-L6-v2
+
+STUB_REPLY = (
+    "Based on your resume, focus on strengthening your core skills, build one or two "
+    "end-to-end projects that show them, and apply to roles that match your experience."
+)
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic bag-of-words embeddings using hashed token buckets"""
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in text.lower().split():
+            vector[zlib.crc32(token.encode()) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text).tolist()
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with the attributes the service reads; ids are assigned as words are seen"""
+
+    eos_token_id = 50256
+    pad_token_id = 50256
+
+    def __init__(self):
+        self.vocab = {}
+        self.words = []
+
+    def encode(self, text: str) -> List[int]:
+        ids = []
+        for word in text.split():
+            if word not in self.vocab:
+                self.vocab[word] = len(self.words)
+                self.words.append(word)
+            ids.append(self.vocab[word])
+        return ids
+
+    def decode(self, ids, skip_special_tokens: bool = False) -> str:
+        return " ".join(self.words[i] for i in ids)
+
+
+class StubGenerator:
+    """Callable shaped like a transformers text-generation pipeline.
+
+    Returns the prompt followed by a canned reply, like the real pipeline does
+    without return_full_text=False. An optional per-token delay simulates decode time.
+    """
+
+    task = "text-generation"
+
+    def __init__(self, reply: str = STUB_REPLY, seconds_per_token: float = 0.0):
+        self.reply = reply
+        self.seconds_per_token = seconds_per_token
+        self.tokenizer = StubTokenizer()
+        # No local model, so the pipeline sends it prompt text
+        self.model = None
+
+    def _generate(self, prompt: str, max_new_tokens: int = None) -> List[dict]:
+        words = self.reply.split()[:max_new_tokens]
+        if self.seconds_per_token:
+            time.sleep(self.seconds_per_token * len(words))
+        return [{"generated_text": prompt + " " + " ".join(words)}]
+
+    def __call__(self, prompts, **kwargs):
+        max_new_tokens = kwargs.get("max_new_tokens")
+        if isinstance(prompts, str):
+            return self._generate(prompts, max_new_tokens)
+        return [self._generate(prompt, max_new_tokens) for prompt in prompts]
+
+
+def install_stub_models(service, seconds_per_token: float = 0.0) -> bool:
+    """Swap the shared embedding model and the service's generator for stubs.
+
+    Returns False when the RAG stack isn't importable, in which case the app
+    runs its rule-based fallbacks and no models are involved anyway.
+    """
+    from career_advisor import rag_service as rag_service_module
+
+    if not rag_service_module.RAG_AVAILABLE:
+        return False
+
+    from rag import vector_store
+
+    vector_store._embeddings = HashEmbeddings()
+    service._global_model = StubGenerator(seconds_per_token=seconds_per_token)
+    service._model_info = {
+        "model_name": "stub",
+        "parameters": "0",
+        "optimization": "benchmark stub",
+    }
+    return True
+
+
+SYNTHETIC_SKILLS = [
+    "Python", "Java", "SQL", "JavaScript", "React", "Django", "Docker", "Kubernetes",
+    "AWS", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Pandas",
+    "NumPy", "Git", "Linux", "HTML", "CSS", "Node.js", "MongoDB", "PostgreSQL",
+    "Tableau", "Excel", "C++", "Go", "Spark", "Hadoop", "REST APIs", "Figma",
+]
+
+
+def synthetic_resume_text(seed: int) -> str:
+    """Plausible resume text with a seed-dependent name and skill set"""
+    rng = random.Random(seed)
+    name = "Candidate %d" % seed
+    skills = rng.sample(SYNTHETIC_SKILLS, rng.randint(6, 14))
+    projects = [
+        "%s Dashboard - built with %s and %s" % (rng.choice(["Sales", "Health", "Traffic", "Budget"]),
+                                                 skills[0], skills[1]),
+        "%s Service - deployed a %s backend" % (rng.choice(["Booking", "Chat", "Search"]), skills[2]),
+    ]
+    return "\n".join([
+        name,
+        "candidate%d@example.com | +1 555 %03d %04d" % (seed, seed % 1000, seed % 10000),
+        "",
+        "EDUCATION",
+        "B.Tech in Computer Science, Example University, 20%02d" % (15 + seed % 10),
+        "",
+        "EXPERIENCE",
+        "Software Engineer Intern, Example Corp - worked on %s and %s" % (skills[0], skills[-1]),
+        "",
+        "SKILLS",
+        ", ".join(skills),
+        "",
+        "PROJECTS",
+    ] + projects + [
+        "",
+        "CERTIFICATIONS",
+        "%s Fundamentals (%s)" % (rng.choice(skills), hashlib.md5(name.encode()).hexdigest()[:6]),
+    ])
+
+
+def synthetic_resume_pdf(seed: int) -> bytes:
+    """Single-page PDF of synthetic_resume_text, built with PyMuPDF"""
+    import fitz
+
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 60), synthetic_resume_text(seed), fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
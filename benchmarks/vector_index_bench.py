@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Build and top-k query time of the vector index backends at several corpus sizes.
+
+utils.vector_index keeps small corpora in a numpy matrix and switches to FAISS
+above SAHAY_NUMPY_INDEX_MAX_CHUNKS. This times both backends on random unit
+vectors of the embedding width, so the threshold can be set where the curves
+cross on the deployment hardware. A single resume has about 5-20 chunks.
+
+Examples:
+    python benchmarks/vector_index_bench.py
+    python benchmarks/vector_index_bench.py --sizes 8,64,512,4096 --k 3 --output index.json
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+try:
+    from .common import REPORT_VERSION, environment_info, setup_paths, write_report
+    from .stubs import EMBEDDING_DIM
+except ImportError:
+    # Fallback for when running directly
+    from common import REPORT_VERSION, environment_info, setup_paths, write_report
+    from stubs import EMBEDDING_DIM
+
+DEFAULT_SIZES = "8,16,32,64,128,256,512,1024,4096"
+
+
+def median_us(func: Callable, rounds: int) -> float:
+    func()
+    timings: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1e6, 2)
+
+
+def run(args) -> Dict:
+    from utils.vector_index import FaissIndex, NumpyIndex, normalise
+
+    backends = {"numpy": NumpyIndex}
+    try:
+        import faiss  # noqa: F401
+        backends["faiss"] = FaissIndex
+    except ImportError:
+        print("faiss not installed; timing the numpy backend only", file=sys.stderr)
+
+    rng = np.random.default_rng(args.seed)
+    sizes = {}
+    for size in [int(value) for value in args.sizes.split(",") if value.strip()]:
+        vectors = normalise(rng.standard_normal((size, args.dim), dtype=np.float32))
+        queries = normalise(rng.standard_normal((64, args.dim), dtype=np.float32))
+        state = {"i": 0}
+        results = {}
+        for name, backend in backends.items():
+            index = backend(vectors)
+
+            def query():
+                state["i"] += 1
+                return index.search(queries[state["i"] % len(queries)], args.k)
+
+            results[name] = {
+                "build_us": median_us(lambda: backend(vectors), args.rounds),
+                "query_us": median_us(query, args.rounds),
+                "memory_bytes": index.memory_bytes(),
+            }
+        if "faiss" in results:
+            # Both backends are exact, so they must agree on the nearest neighbour
+            probe = queries[0]
+            results["same_top1"] = bool(
+                NumpyIndex(vectors).search(probe, 1)[0][0] == FaissIndex(vectors).search(probe, 1)[0][0]
+            )
+        sizes[str(size)] = results
+        print(f"{size:>6} {results}", file=sys.stderr)
+    return sizes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated corpus sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=200, help="timed runs per measurement (default: 200)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    setup_paths()
+    report = {
+        "version": REPORT_VERSION,
+        "benchmark": "vector_index_bench",
+        "environment": environment_info(),
+        "config": {"sizes": args.sizes, "dim": args.dim, "k": args.k, "rounds": args.rounds, "seed": args.seed},
+        "sizes": run(args),
+    }
+    write_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
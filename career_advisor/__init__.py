@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Fix the import path issue: the app's modules import src/ packages (utils, rag, model_server) directly
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+src_path = os.path.join(project_root, 'src')
+
+# Add src to Python path properly
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
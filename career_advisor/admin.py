@@ -1,3 +1,20 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Resume, ResumeSection, ResumeSkill
+
+
+class ResumeSkillInline(admin.TabularInline):
+    model = ResumeSkill
+    extra = 0
+
+
+class ResumeSectionInline(admin.TabularInline):
+    model = ResumeSection
+    extra = 0
+
+
+@admin.register(Resume)
+class ResumeAdmin(admin.ModelAdmin):
+    list_display = ('content_hash', 'contact_email', 'file_path', 'updated_at')
+    search_fields = ('content_hash', 'contact_email', 'skills__normalized')
+    inlines = [ResumeSkillInline, ResumeSectionInline]
@@ -1,6 +1,39 @@
+import logging
+import os
+import sys
+import threading
+
 from django.apps import AppConfig
 
 
+def _serves_requests() -> bool:
+    """False for management commands other than runserver, and for runserver's autoreloader parent"""
+    if os.path.basename(sys.argv[0]) in ("manage.py", "django-admin"):
+        if len(sys.argv) < 2 or sys.argv[1] != "runserver":
+            return False
+        return os.environ.get("RUN_MAIN") == "true" or "--noreload" in sys.argv
+    return True
+
+
+def _prewarm(service):
+    try:
+        service.prewarm()
+    except Exception:
+        # Already logged; /ready keeps reporting the failure
+        pass
+
+
 class CareerAdvisorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "career_advisor"
+
+    def ready(self):
+        from django.conf import settings
+
+        # In pre-fork mode gunicorn's hooks load the models; a thread here would be forked mid-load
+        prefork = getattr(settings, "PREFORK_MODELS", False)
+        if getattr(settings, "PREWARM_ON_STARTUP", False) and not prefork and _serves_requests():
+            from .rag_service import rag_service
+
+            logging.info("Prewarming models in the background; /ready reports 503 until done")
+            threading.Thread(target=_prewarm, args=(rag_service,), name="prewarm", daemon=True).start()
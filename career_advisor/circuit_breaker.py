@@ -0,0 +1,124 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Routes requests away from the LLM path while it is failing, slow or saturated.
+
+    The breaker watches the outcome and latency of recent RAG calls. It opens
+    when too many of them failed or the p90 latency exceeds the SLO, and
+    stays open for cooldown seconds. Then one probe call is let through
+    (half-open), and its outcome closes or re-opens the circuit. Independently
+    of the state, a call is refused while max_in_flight calls are already
+    running.
+    """
+
+    def __init__(self, latency_slo: float = 6.0, error_rate: float = 0.5, window: int = 20,
+                 min_calls: int = 5, cooldown: float = 30.0, max_in_flight: int = 2):
+        self.latency_slo = latency_slo
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.max_in_flight = max_in_flight
+        self._calls = deque(maxlen=window)  # (seconds, ok)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._open_reason = None
+        self._probing = False
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+        return self._state
+
+    def acquire(self) -> Optional[str]:
+        """None if a call may go ahead (the caller must release() it), else why not"""
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN:
+                return self._open_reason
+            if state == HALF_OPEN:
+                if self._probing:
+                    return self._open_reason
+                self._probing = True
+            elif self._in_flight >= self.max_in_flight:
+                return "saturated"
+            self._in_flight += 1
+            return None
+
+    def release(self, seconds: float, ok: bool):
+        """Record the outcome of a call that acquire() let through"""
+        with self._lock:
+            self._in_flight -= 1
+            self._calls.append((seconds, ok))
+            if self._state == HALF_OPEN:
+                self._probing = False
+                if ok and seconds <= self.latency_slo:
+                    logging.info("RAG circuit closed after a successful probe")
+                    self._state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._open(self._open_reason)
+                return
+            reason = self._trip_reason()
+            if reason and self._state == CLOSED:
+                self._open(reason)
+
+    def _trip_reason(self) -> Optional[str]:
+        if len(self._calls) < self.min_calls:
+            return None
+        failures = sum(1 for _, ok in self._calls if not ok)
+        if failures / len(self._calls) >= self.error_rate:
+            return "errors"
+        latencies = sorted(seconds for seconds, _ in self._calls)
+        if latencies[int(0.9 * (len(latencies) - 1))] > self.latency_slo:
+            return "slow"
+        return None
+
+    def _open(self, reason: str):
+        logging.warning(f"RAG circuit open ({reason}); using rule-based answers for {self.cooldown:.0f}s")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._open_reason = reason
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            latencies = sorted(seconds for seconds, _ in self._calls)
+            return {
+                "state": self._current_state(),
+                "reason": self._open_reason if self._state != CLOSED else None,
+                "in_flight": self._in_flight,
+                "recent_calls": len(self._calls),
+                "recent_errors": sum(1 for _, ok in self._calls if not ok),
+                "p90_ms": round(1000 * latencies[int(0.9 * (len(latencies) - 1))]) if latencies else None,
+                "latency_slo_ms": round(1000 * self.latency_slo),
+            }
+
+
+def breaker_from_env() -> CircuitBreaker:
+    """A breaker configured by SAHAY_RAG_SLO_MS, SAHAY_RAG_MAX_IN_FLIGHT and SAHAY_RAG_COOLDOWN_S"""
+    return CircuitBreaker(
+        latency_slo=int(os.environ.get("SAHAY_RAG_SLO_MS", "6000")) / 1000,
+        max_in_flight=int(os.environ.get("SAHAY_RAG_MAX_IN_FLIGHT", "2")),
+        cooldown=float(os.environ.get("SAHAY_RAG_COOLDOWN_S", "30")),
+    )
@@ -0,0 +1,104 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Example questions per intent; each intent is represented by the centroid of its examples.
+# "open_ended" exists only to pull general questions away from the canned intents.
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    "skills_gap": [
+        "What skills am I missing?",
+        "Which skills do I need to learn?",
+        "What is my skills gap?",
+        "What skills should I develop next?",
+        "What am I lacking for my target role?",
+        "Which skills should I improve to get hired?",
+        "What do I need to learn to become a data scientist?",
+    ],
+    "career_paths": [
+        "What career paths suit me?",
+        "Which jobs am I a good fit for?",
+        "What roles should I apply for?",
+        "What career options do I have with my skills?",
+        "Which career should I choose?",
+        "What kind of jobs match my profile?",
+    ],
+    "resume_summary": [
+        "Summarize my resume",
+        "What does my resume say about me?",
+        "Give me an overview of my resume",
+        "How many skills and projects do I have?",
+        "What are my main skills?",
+        "Tell me about my profile",
+    ],
+    "open_ended": [
+        "How should I prepare for a technical interview?",
+        "How do I negotiate a higher salary?",
+        "Should I do a master's degree or start working?",
+        "How can I explain a gap in my employment history?",
+        "What is it like to work at a startup compared to a big company?",
+        "How do I ask my manager for a promotion?",
+        "Can you help me write a cover letter?",
+    ],
+}
+
+# Intents answered from templates instead of the LLM
+CANNED_INTENTS = ("skills_gap", "career_paths", "resume_summary")
+
+# Minimum cosine similarity to the nearest centroid, and lead over the runner-up
+DEFAULT_THRESHOLD = 0.55
+DEFAULT_MARGIN = 0.05
+
+
+class IntentRouter:
+    """Nearest-centroid intent classifier over sentence embeddings"""
+
+    def __init__(self, embed_fn: Callable[[str], List[float]],
+                 embed_many_fn: Optional[Callable[[List[str]], List[List[float]]]] = None,
+                 examples: Optional[Dict[str, List[str]]] = None,
+                 threshold: float = DEFAULT_THRESHOLD, margin: float = DEFAULT_MARGIN):
+        self.embed_fn = embed_fn
+        self.embed_many_fn = embed_many_fn or (lambda texts: [embed_fn(text) for text in texts])
+        self.examples = examples or INTENT_EXAMPLES
+        self.threshold = threshold
+        self.margin = margin
+        self.intents: List[str] = []
+        self._centroids = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _build_centroids(self):
+        """Embed the examples once and reduce each intent to a unit centroid"""
+        intents = list(self.examples)
+        centroids = []
+        for intent in intents:
+            vectors = self._normalize(np.asarray(self.embed_many_fn(self.examples[intent]), dtype=np.float32))
+            centroids.append(vectors.mean(axis=0))
+        self.intents = intents
+        self._centroids = self._normalize(np.stack(centroids))
+        logging.info(f"Intent router ready with {len(intents)} intents")
+
+    def classify(self, question: str) -> Tuple[str, float, float]:
+        """Nearest intent, its similarity, and its lead over the runner-up"""
+        if self._centroids is None:
+            with self._lock:
+                if self._centroids is None:
+                    self._build_centroids()
+        query = self._normalize(np.asarray(self.embed_fn(question), dtype=np.float32))
+        scores = self._centroids @ query
+        order = np.argsort(scores)[::-1]
+        best = int(order[0])
+        runner_up = float(scores[order[1]]) if len(order) > 1 else -1.0
+        return self.intents[best], float(scores[best]), float(scores[best]) - runner_up
+
+    def route(self, question: str) -> Optional[Tuple[str, float]]:
+        """Canned intent for a confidently matched question, else None"""
+        intent, score, lead = self.classify(question)
+        if intent in CANNED_INTENTS and score >= self.threshold and lead >= self.margin:
+            return intent, score
+        return None
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from career_advisor import rag_service as rag_service_module
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the embedding and generation models and run a dummy call through each. "
+        "With --save-to, also write local snapshots for SAHAY_MODEL_DIR."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--save-to",
+            help="directory to save model snapshots in; point SAHAY_MODEL_DIR at it",
+        )
+
+    def handle(self, *args, **options):
+        if not rag_service_module.RAG_AVAILABLE:
+            raise CommandError("RAG dependencies are not installed; there are no models to prewarm")
+
+        service = rag_service_module.rag_service
+        try:
+            timings = service.prewarm()
+        except Exception as e:
+            raise CommandError(f"Prewarm failed: {e}")
+
+        for stage, seconds in timings.items():
+            self.stdout.write(f"{stage}: {seconds:.2f}s")
+
+        if options["save_to"]:
+            for path in service.save_model_snapshots(options["save_to"]):
+                self.stdout.write(f"Saved {path}")
+
+        self.stdout.write(self.style.SUCCESS("Models loaded and warm"))
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Resume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=32, unique=True)),
+                ('file_path', models.CharField(max_length=500)),
+                ('contact_email', models.CharField(blank=True, db_index=True, max_length=254)),
+                ('parsed_data', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('position', models.PositiveIntegerField()),
+                ('content', models.TextField()),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='career_advisor.resume')),
+            ],
+            options={
+                'ordering': ['resume', 'name', 'position'],
+                'indexes': [models.Index(fields=['resume', 'name', 'position'], name='career_advi_resume__19a6be_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('normalized', models.CharField(max_length=200)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skills', to='career_advisor.resume')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['normalized', 'resume'], name='career_advi_normali_b862cf_idx')],
+                'constraints': [models.UniqueConstraint(fields=('resume', 'normalized'), name='unique_resume_skill')],
+            },
+        ),
+    ]
@@ -1,3 +1,126 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count
 
-# Create your models here.
+from utils.resume_parser import normalize_skill
+
+# Parsed sections that are stored as rows in ResumeSection
+SECTION_NAMES = [
+    'education', 'experience', 'projects', 'certifications',
+    'achievements', 'extracurricular',
+]
+
+
+class ResumeQuerySet(models.QuerySet):
+    def with_skills(self, skills):
+        """Resumes listing every one of the given skills (index lookup on ResumeSkill)"""
+        normalized = {normalize_skill(skill) for skill in skills}
+        normalized.discard('')
+        if not normalized:
+            return self
+        matching = (
+            ResumeSkill.objects.filter(normalized__in=normalized)
+            .values('resume_id')
+            .annotate(matched=Count('normalized', distinct=True))
+            .filter(matched=len(normalized))
+            .values('resume_id')
+        )
+        return self.filter(pk__in=matching)
+
+
+class ResumeManager(models.Manager.from_queryset(ResumeQuerySet)):
+    def load_parsed_data(self, content_hash):
+        """Return the stored parsed resume for a content hash with a single query"""
+        return (
+            self.filter(content_hash=content_hash)
+            .values_list('parsed_data', flat=True)
+            .first()
+        )
+
+    @transaction.atomic
+    def ingest(self, content_hash, file_path, parsed_data):
+        """Store a parsed resume with its sections and normalised skills in bulk"""
+        contact = parsed_data.get('contact') or {}
+        resume, _ = self.update_or_create(
+            content_hash=content_hash,
+            defaults={
+                'file_path': file_path,
+                'contact_email': contact.get('email', '').lower(),
+                'parsed_data': parsed_data,
+            },
+        )
+
+        # Replace any rows from a previous ingest of the same content
+        resume.sections.all().delete()
+        resume.skills.all().delete()
+
+        ResumeSection.objects.bulk_create([
+            ResumeSection(resume=resume, name=name, position=position, content=content)
+            for name in SECTION_NAMES
+            for position, content in enumerate(parsed_data.get(name) or [])
+        ])
+
+        skills = {}
+        for skill in parsed_data.get('skills') or []:
+            normalized = normalize_skill(skill)
+            if normalized and normalized not in skills:
+                skills[normalized] = skill[:200]
+        ResumeSkill.objects.bulk_create([
+            ResumeSkill(resume=resume, name=name, normalized=normalized[:200])
+            for normalized, name in skills.items()
+        ])
+
+        return resume
+
+
+class Resume(models.Model):
+    """A parsed resume, keyed by the MD5 of the uploaded PDF"""
+    content_hash = models.CharField(max_length=32, unique=True)
+    file_path = models.CharField(max_length=500)
+    contact_email = models.CharField(max_length=254, blank=True, db_index=True)
+    parsed_data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ResumeManager()
+
+    class Meta:
+        ordering = ['-updated_at']
+
+    def __str__(self):
+        return self.contact_email or self.content_hash
+
+
+class ResumeSection(models.Model):
+    """One item of a parsed resume section (education, experience, projects, ...)"""
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='sections')
+    name = models.CharField(max_length=50)
+    position = models.PositiveIntegerField()
+    content = models.TextField()
+
+    class Meta:
+        ordering = ['resume', 'name', 'position']
+        indexes = [
+            models.Index(fields=['resume', 'name', 'position']),
+        ]
+
+    def __str__(self):
+        return f"{self.name}[{self.position}]"
+
+
+class ResumeSkill(models.Model):
+    """A normalised skill listed on a resume"""
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='skills')
+    name = models.CharField(max_length=200)
+    normalized = models.CharField(max_length=200)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['resume', 'normalized'], name='unique_resume_skill'),
+        ]
+        indexes = [
+            # Covers "resumes with skill X" lookups without touching the table
+            models.Index(fields=['normalized', 'resume']),
+        ]
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,51 @@
+"""
+Pre-fork model sharing for gunicorn (see gunicorn.conf.py).
+
+The master loads the models once, before forking, and workers inherit the
+weights copy-on-write. Tensor storage is plain malloc'd memory that nothing
+writes to during inference, so those pages stay shared. The risk is in the
+Python objects around it: reference counts and GC bookkeeping write to object
+headers, and each write copies a page into the worker. gc.freeze() moves
+everything loaded so far out of the collector's reach, so workers' collections
+don't touch those pages.
+"""
+
+import gc
+import logging
+import os
+import sys
+
+from .rag_service import rag_service
+
+
+def freeze_module(module):
+    """Put a torch module in inference mode so nothing allocates or writes gradients"""
+    module.eval()
+    for parameter in module.parameters():
+        parameter.requires_grad_(False)
+
+
+def prepare_for_fork() -> dict:
+    """Load the models in the master and freeze them; run no inference before forking"""
+    # Fast tokenizers' thread pool doesn't survive fork
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    timings = rag_service.load_models()
+    for module in rag_service.torch_modules():
+        freeze_module(module)
+    gc.collect()
+    gc.freeze()
+    logging.info(f"Models loaded in the master before fork: {timings}; {gc.get_freeze_count()} objects frozen")
+    return timings
+
+
+def after_fork(workers: int):
+    """Per-worker setup: split CPU threads between workers, then warm up this worker"""
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // max(1, workers)))
+    # Inference runs here rather than in the master, so thread pools are created after fork
+    try:
+        rag_service.prewarm()
+    except Exception:
+        # Already logged; the worker still serves fallbacks and /ready reports the failure
+        pass
@@ -0,0 +1,182 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = ".prof"
+_NAME_RE = re.compile(r"^[\w.-]+\.prof$")
+
+# Profiles of work a profiled request handed to other threads, collected by that request's thread
+_local = threading.local()
+
+
+class ProfileStore:
+    """Directory of cProfile dumps kept as a ring bounded by file count and total size"""
+
+    def __init__(self, directory: str, max_files: int = 50, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> Optional[str]:
+        # Only accept names this store generated, so a download can't escape the directory
+        if not _NAME_RE.match(name):
+            return None
+        return os.path.join(self.directory, name)
+
+    def save(self, profiler, request, duration: float) -> str:
+        """Dump a cProfile.Profile (or pstats.Stats) for request; returns the profile's name"""
+        slug = re.sub(r"[^\w]+", "_", request.path).strip("_")[:60] or "root"
+        name = "%s-%06d-%s-%s-%dms%s" % (
+            time.strftime("%Y%m%dT%H%M%S"), int(time.time() * 1e6) % 1000000,
+            request.method.lower(), slug, duration * 1000, PROFILE_SUFFIX,
+        )
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.directory, name))
+            self._prune()
+        return name
+
+    def _prune(self):
+        entries = self.list()
+        total = sum(entry["size"] for entry in entries)
+        # list() is newest first, so drop from the end
+        while entries and (len(entries) > self.max_files or total > self.max_bytes):
+            oldest = entries.pop()
+            total -= oldest["size"]
+            try:
+                os.remove(os.path.join(self.directory, oldest["name"]))
+            except OSError:
+                pass
+
+    def list(self) -> List[Dict]:
+        """Saved profiles, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(PROFILE_SUFFIX):
+                stat = entry.stat()
+                entries.append({"name": entry.name, "size": stat.st_size, "created": stat.st_mtime})
+        entries.sort(key=lambda entry: (entry["created"], entry["name"]), reverse=True)
+        return entries
+
+    def open_path(self, name: str) -> Optional[str]:
+        """Filesystem path of a saved profile, or None if it doesn't exist"""
+        path = self._path(name)
+        if path is None or not os.path.isfile(path):
+            return None
+        return path
+
+    def summary(self, name: str, sort: str = "cumulative", limit: int = 40) -> Optional[str]:
+        """pstats text report for a saved profile"""
+        path = self.open_path(name)
+        if path is None:
+            return None
+        out = io.StringIO()
+        stats = pstats.Stats(path, stream=out)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+_store = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Process-wide profile store configured from settings"""
+    global _store
+    if _store is None:
+        _store = ProfileStore(
+            getattr(settings, "PROFILING_DIR", os.path.join(settings.BASE_DIR, "profiles")),
+            max_files=getattr(settings, "PROFILING_MAX_FILES", 50),
+            max_bytes=getattr(settings, "PROFILING_MAX_BYTES", 50 * 1024 * 1024),
+        )
+    return _store
+
+
+def profiled(func):
+    """func, run under its own profiler when the calling request is being profiled.
+
+    For work a view hands to another thread, which the request's profiler
+    can't see. Its profile is merged into the request's if it finishes
+    before the response does.
+    """
+    profiles = getattr(_local, "worker_profiles", None)
+    if profiles is None:
+        return func
+
+    def run(*args, **kwargs):
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            profiles.append(profiler)
+    return run
+
+
+class ProfilingMiddleware:
+    """Run cProfile around the view for sampled requests or staff requests sending the profiling header.
+
+    Off unless PROFILING_ENABLED is set. Must come after AuthenticationMiddleware
+    so the header can be restricted to staff users.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "PROFILING_ENABLED", False)
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        self.header = "HTTP_" + getattr(settings, "PROFILING_HEADER", "X-Sahay-Profile").upper().replace("-", "_")
+        self.path_prefixes = tuple(getattr(settings, "PROFILING_PATHS", ()))
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def should_profile(self, request) -> bool:
+        if not self.enabled:
+            return False
+        if self.path_prefixes and not request.path.startswith(self.path_prefixes):
+            return False
+        user = getattr(request, "user", None)
+        if request.META.get(self.header) and user is not None and user.is_staff:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.should_profile(request):
+            return None
+
+        # cProfile hooks are per-thread, so only this request's view is measured,
+        # plus any work it hands off through profiled()
+        profiler = cProfile.Profile()
+        _local.worker_profiles = []
+        start = time.perf_counter()
+        try:
+            response = profiler.runcall(view_func, request, *view_args, **view_kwargs)
+        finally:
+            workers = list(_local.worker_profiles)
+            _local.worker_profiles = None
+        duration = time.perf_counter() - start
+
+        stats = profiler
+        if workers:
+            stats = pstats.Stats(profiler)
+            for worker in workers:
+                stats.add(worker)
+        try:
+            name = get_profile_store().save(stats, request, duration)
+            response["X-Sahay-Profile-Id"] = name
+            logger.info("Saved profile %s for %s %s (%.0f ms)", name, request.method, request.path, duration * 1000)
+        except OSError as e:
+            logger.warning("Could not save profile for %s: %s", request.path, e)
+        return response
@@ -1,34 +1,102 @@
 import os
-import sys
 import logging
-from typing import Dict, List, Optional
+import importlib.util
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Tuple
 import traceback
 import pickle
 import hashlib
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
-# Fix the import path issue
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(current_dir)
-src_path = os.path.join(project_root, 'src')
-
-# Add src to Python path properly
-if src_path not in sys.path:
-    sys.path.insert(0, src_path)
-
-try:
-    # Now try to import RAG components
-    from rag.rag_pipeline import CareerRAGPipeline
-    from utils.pdf_parser import extract_text_from_pdf
-    from utils.resume_parser import parse_resume
-    RAG_AVAILABLE = True
-    logging.info("RAG components imported successfully!")
-except ImportError as e:
-    logging.warning(f"RAG components not available: {e}")
-    RAG_AVAILABLE = False
-    # Print more details for debugging
-    print(f"Import error details: {e}")
-    print(f"Python path: {sys.path}")
-    print(f"Looking for modules in: {src_path}")
+from django.db import DatabaseError
+
+from .models import Resume
+
+from utils.resume_parser import parse_resume
+from utils.metrics import get_counter, get_gauge, latency_snapshot, process_memory, stage_summary
+from utils.generation_budget import budget_report, default_budget_seconds
+from utils.memory import format_bytes, module_bytes
+from utils.model_paths import resolve_model_path, snapshot_name
+from model_server.client import ModelServerError, RemoteGenerator, get_model_client
+
+from .circuit_breaker import CLOSED, breaker_from_env
+from .intent_router import IntentRouter
+from .profiling import profiled
+from .role_catalog import compute_skill_features, get_role_catalog
+
+# Packages the RAG pipeline needs. Finding them is cheap; importing them
+# (torch, transformers, langchain) takes seconds, so that waits for first use.
+RAG_DEPENDENCIES = ("langchain", "langchain_community", "transformers", "torch", "sentence_transformers", "faiss")
+
+_missing_dependencies = [name for name in RAG_DEPENDENCIES if importlib.util.find_spec(name) is None]
+RAG_AVAILABLE = not _missing_dependencies
+if RAG_AVAILABLE:
+    logging.info("RAG dependencies found; components will be imported on first use")
+else:
+    logging.warning(f"RAG components not available, missing: {', '.join(_missing_dependencies)}")
+
+_rag_components = None
+_rag_components_lock = threading.Lock()
+
+def load_rag_components() -> SimpleNamespace:
+    """Import the RAG pipeline and embedding helpers on first use"""
+    global _rag_components, RAG_AVAILABLE
+    if _rag_components is None:
+        with _rag_components_lock:
+            if _rag_components is None:
+                try:
+                    from rag.rag_pipeline import SKILLS_GAP_QUESTION, CareerRAGPipeline
+                    from rag.vector_store import get_embeddings, loaded_embeddings
+                except ImportError as e:
+                    # Installed but broken; stop trying on every request
+                    logging.warning(f"RAG components failed to import: {e}")
+                    RAG_AVAILABLE = False
+                    raise
+                _rag_components = SimpleNamespace(
+                    CareerRAGPipeline=CareerRAGPipeline,
+                    SKILLS_GAP_QUESTION=SKILLS_GAP_QUESTION,
+                    get_embeddings=get_embeddings,
+                    loaded_embeddings=loaded_embeddings,
+                )
+                logging.info("RAG components imported successfully!")
+    return _rag_components
+
+PIPELINE_CACHE_REQUESTS = get_counter(
+    "sahay_pipeline_cache_requests_total", "Lookups of cached RAG pipelines by result.", ("result",)
+)
+PIPELINES_EVICTED = get_counter(
+    "sahay_pipelines_superseded_total", "Cached RAG pipelines evicted because a newer version of the resume was uploaded."
+)
+GENERATED_TOKENS = get_counter("sahay_generated_tokens_total", "Tokens generated by the answer model.")
+RAG_ROUTES = get_counter(
+    "sahay_rag_routes_total", "Answers by route: rag, or why the rule-based answer was used.", ("reason",)
+)
+# How far past its generation budget a RAG answer may run before the hedge is returned
+HEDGE_GRACE = 1.25
+ANSWER_CACHE_REQUESTS = get_counter(
+    "sahay_answer_cache_total", "Skills-gap answer cache lookups by result.", ("result",)
+)
+PRECOMPUTES = get_counter(
+    "sahay_precomputed_answers_total",
+    "Speculative skills-gap analyses by outcome: computed, cached (already there), superseded, "
+    "preempted (stopped for a live call and requeued) or failed.",
+    ("outcome",),
+)
+# Speculative skills-gap analyses after an upload: how many suggested roles, and how
+# long the worker must have had no live RAG call before one starts
+PRECOMPUTE_ENABLED = os.environ.get("SAHAY_PRECOMPUTE", "1") == "1"
+PRECOMPUTE_ROLES = int(os.environ.get("SAHAY_PRECOMPUTE_ROLES", "3"))
+PRECOMPUTE_IDLE_SECONDS = int(os.environ.get("SAHAY_PRECOMPUTE_IDLE_MS", "500")) / 1000
+# The live answer budget by default. A live call that arrives meanwhile stops a local
+# model at once, but on the model server it can queue behind a speculative one this long.
+PRECOMPUTE_BUDGET_SECONDS = int(
+    os.environ.get("SAHAY_PRECOMPUTE_BUDGET_MS", round(default_budget_seconds() * 1000))
+) / 1000
+RAG_QUEUE_DEPTH = get_gauge("sahay_rag_queue_depth", "RAG calls running or waiting in this worker.")
 
 class RAGService:
     """Service layer for RAG operations with CPU-optimized model caching"""
@@ -36,10 +104,27 @@ class RAGService:
     def __init__(self):
         self.rag_pipeline = None
         self.current_resume_path = None
+        self.current_resume_hash = None
         self.current_resume_data = None
         self._model_cache = {}  # Cache for different resume hashes
+        self._uploaders = {}  # Resume hash -> keys of the sessions that uploaded it
         self._global_model = None  # Global model instance
         self._model_info = {}  # Track model performance info
+        self._intent_router = None  # Built on first routed question
+        self.readiness = "cold"  # cold -> warming -> ready (or failed)
+        self.readiness_error = None
+        self._prewarm_lock = threading.Lock()
+        self.circuit = breaker_from_env()
+        # RAG calls run here so a request can stop waiting for one at its deadline
+        self._executor = ThreadPoolExecutor(max_workers=self.circuit.max_in_flight, thread_name_prefix="rag")
+        self._last_live_call = 0.0  # time.monotonic() of the latest live RAG call's start or end
+        self._answer_cache = OrderedDict()  # (resume hash, role) -> skills-gap analysis
+        self._answer_cache_size = int(os.environ.get("SAHAY_ANSWER_CACHE_SIZE", "256"))
+        self._answer_lock = threading.Lock()
+        self._precompute_queue = queue.Queue()
+        self._precompute_thread = None
+        self._precompute_lock = threading.Lock()
+        self._preempt = threading.Event()  # Set when a live RAG call starts; a speculative one then stops
         logging.info(f"RAGService initialized. RAG_AVAILABLE: {RAG_AVAILABLE}")
         
     def _get_resume_hash(self, resume_path: str) -> str:
@@ -53,6 +138,8 @@ class RAGService:
     
     def _load_global_model(self):
         """Load the CPU-optimized AI model once and keep it in memory"""
+        if self._global_model is None and self._connect_model_server():
+            return
         if self._global_model is None:
             try:
                 logging.info("Loading CPU-optimized DialoGPT-small model into memory...")
@@ -63,7 +150,7 @@ class RAGService:
                 # Load the CPU-optimized model
                 self._global_model = pipeline(
                     "text-generation",
-                    model="microsoft/DialoGPT-small",  # Only 117M params vs 345M
+                    model=resolve_model_path("microsoft/DialoGPT-small"),  # Only 117M params vs 345M
                     device=-1,  # Force CPU
                     torch_dtype=torch.float32,  # Use float32 for CPU compatibility
                     max_length=120,  # Reasonable response length
@@ -80,8 +167,6 @@ class RAGService:
                     "model_name": "microsoft/DialoGPT-small",
                     "parameters": "117M",
                     "optimization": "CPU-optimized",
-                    "memory_usage": "Low",
-                    "response_time": "Fast"
                 }
                 
                 logging.info("CPU-optimized DialoGPT-small model loaded successfully!")
@@ -95,7 +180,7 @@ class RAGService:
                     logging.info("Trying fallback to DistilGPT2...")
                     self._global_model = pipeline(
                         "text-generation",
-                        model="distilgpt2",  # Only 82M parameters
+                        model=resolve_model_path("distilgpt2"),  # Only 82M parameters
                         device=-1,
                         max_length=100,
                         do_sample=True,
@@ -105,16 +190,40 @@ class RAGService:
                         "model_name": "distilgpt2",
                         "parameters": "82M",
                         "optimization": "Ultra-lightweight",
-                        "memory_usage": "Very Low",
-                        "response_time": "Very Fast"
                     }
                     logging.info("Fallback DistilGPT2 model loaded successfully!")
                 except Exception as fallback_e:
                     logging.error(f"Fallback model also failed: {fallback_e}")
                     self._global_model = None
     
-    def initialize_rag(self, resume_path: str) -> bool:
-        """Initialize RAG pipeline with a resume"""
+    def _connect_model_server(self) -> bool:
+        """Generate on the shared model server when SAHAY_MODEL_SERVER is set and it answers"""
+        client = get_model_client()
+        if client is None:
+            return False
+        try:
+            info = client.info()
+        except ModelServerError as e:
+            logging.warning(f"Model server unavailable, loading the model in this worker: {e}")
+            return False
+        self._global_model = RemoteGenerator(client, model_name=info.get("tokenizer", "microsoft/DialoGPT-small"))
+        self._model_info = {
+            "model_name": info.get("generation_model", "model server"),
+            "parameters": "shared",
+            "optimization": f"Model server ({info.get('backend', 'unknown')})",
+        }
+        logging.info(f"Generating on the model server: {self._model_info}")
+        return True
+    
+    def initialize_rag(self, resume_path: str, previous_hash: Optional[str] = None,
+                       session_key: Optional[str] = None) -> bool:
+        """Initialize RAG pipeline with a resume.
+
+        previous_hash is the version the uploading session (session_key) had
+        before; it is only linked if that session uploaded it. Only the chunks
+        that changed are then embedded, and the old pipeline is evicted once
+        no other session still uses it.
+        """
         if not RAG_AVAILABLE:
             logging.warning("RAG not available, cannot initialize")
             return False
@@ -122,18 +231,17 @@ class RAGService:
         try:
             logging.info(f"Initializing RAG with resume: {resume_path}")
             
-            # Parse resume first
-            raw_text = extract_text_from_pdf(resume_path)
-            parsed_data = parse_resume(raw_text)
-            
-            # Generate resume hash for caching
-            resume_hash = self._get_resume_hash(resume_path)
+            # Parse resume first (or load it from the store)
+            resume_hash, parsed_data, _ = self.ingest_resume(resume_path)
+            previous_hash = self._previous_version(resume_hash, previous_hash, session_key)
             
             # Check if we have cached pipeline for this resume
             if resume_hash in self._model_cache:
+                PIPELINE_CACHE_REQUESTS.inc("hit")
                 logging.info("Using cached RAG pipeline for this resume")
                 self.rag_pipeline = self._model_cache[resume_hash]
             else:
+                PIPELINE_CACHE_REQUESTS.inc("miss")
                 # Load global model if not already loaded
                 self._load_global_model()
                 
@@ -142,14 +250,23 @@ class RAGService:
                     return False
                 
                 # Create new RAG pipeline with cached model
-                logging.info("Creating new RAG pipeline with cached model...")
-                self.rag_pipeline = CareerRAGPipeline(resume_path, cached_model=self._global_model)
+                previous = self._model_cache.get(previous_hash)
+                if previous is not None:
+                    logging.info(f"Re-indexing changed chunks of resume {previous_hash}")
+                else:
+                    logging.info("Creating new RAG pipeline with cached model...")
+                self.rag_pipeline = load_rag_components().CareerRAGPipeline(
+                    resume_path, cached_model=self._global_model, resume_data=parsed_data, previous=previous
+                )
                 
                 # Cache this pipeline
                 self._model_cache[resume_hash] = self.rag_pipeline
                 logging.info("RAG pipeline cached for future use")
             
+            self._supersede(previous_hash, resume_hash, session_key)
+            
             self.current_resume_path = resume_path
+            self.current_resume_hash = resume_hash
             self.current_resume_data = parsed_data
             
             logging.info("RAG pipeline initialized successfully!")
@@ -160,33 +277,370 @@ class RAGService:
             traceback.print_exc()
             return False
     
-    def get_career_advice(self, question: str) -> Dict:
-        """Get AI-powered career advice using RAG"""
+    def _previous_version(self, resume_hash: str, previous_hash: Optional[str],
+                          session_key: Optional[str]) -> Optional[str]:
+        """Hash of the cached version this session's upload replaces, if any"""
+        if not session_key or not previous_hash or previous_hash == resume_hash:
+            return None
+        if previous_hash not in self._model_cache or session_key not in self._uploaders.get(previous_hash, ()):
+            return None
+        return previous_hash
+    
+    def _supersede(self, previous_hash: Optional[str], resume_hash: str, session_key: Optional[str]):
+        """Record the session's new version, and evict the replaced one unless another session still uses it"""
+        if not session_key:
+            return
+        self._uploaders.setdefault(resume_hash, set()).add(session_key)
+        if not previous_hash:
+            return
+        uploaders = self._uploaders.get(previous_hash, set())
+        uploaders.discard(session_key)
+        if uploaders:
+            return
+        self._uploaders.pop(previous_hash, None)
+        if self._model_cache.pop(previous_hash, None) is not None:
+            PIPELINES_EVICTED.inc()
+            logging.info(f"Evicted superseded RAG pipeline {previous_hash}")
+            with self._answer_lock:
+                for key in [key for key in self._answer_cache if key[0] == previous_hash]:
+                    del self._answer_cache[key]
+    
+    def get_career_advice(self, question: str, budget_seconds: Optional[float] = None,
+                          abandoned: Optional[threading.Event] = None) -> Dict:
+        """Get AI-powered career advice using RAG, within a latency budget ($SAHAY_ANSWER_BUDGET_MS by default).
+
+        abandoned is set by answer_hedged once nobody waits for the answer; it then stays out of the chat history.
+        """
         if not self.rag_pipeline:
             return {"error": "RAG pipeline not initialized"}
             
+        RAG_QUEUE_DEPTH.inc()
         try:
             logging.info(f"Getting career advice for: {question}")
-            result = self.rag_pipeline.get_career_advice(question)
+            result = self.rag_pipeline.get_career_advice(question, budget_seconds=budget_seconds, discard=abandoned)
             logging.info(f"RAG response: {result}")
+            self._count_generated_tokens(result)
             return result
         except Exception as e:
             logging.error(f"Error getting career advice: {e}")
             return {"error": str(e)}
+        finally:
+            RAG_QUEUE_DEPTH.dec()
+
+    def query_cache_outcome(self, question: str) -> Optional[str]:
+        """"hit" if the question's embedding is already cached, else "miss"; None without RAG"""
+        if not RAG_AVAILABLE:
+            return None
+
+        try:
+            embeddings = load_rag_components().get_embeddings()
+            return "hit" if embeddings.is_cached(question) else "miss"
+        except Exception as e:
+            logging.error(f"Error checking the query cache: {e}")
+            return None
+
+    def route_question(self, question: str) -> Optional[Tuple[str, float]]:
+        """Match a chat question to a canned intent using the embedding model"""
+        if not RAG_AVAILABLE:
+            return None
+            
+        try:
+            if self._intent_router is None:
+                embeddings = load_rag_components().get_embeddings()
+                self._intent_router = IntentRouter(embeddings.embed_query, embeddings.embed_documents)
+            return self._intent_router.route(question)
+        except Exception as e:
+            logging.error(f"Error routing question: {e}")
+            return None
     
-    def analyze_skills_gap_rag(self, target_role: str) -> Dict:
-        """Analyze skills gap using RAG"""
-        if not self.rag_pipeline:
+    def analyze_skills_gap_rag(self, target_role: str, budget_seconds: Optional[float] = None,
+                               abandoned: Optional[threading.Event] = None, resume_hash: Optional[str] = None) -> Dict:
+        """Analyze skills gap using RAG.
+
+        resume_hash (the session's) picks that resume's cached pipeline, and the
+        answer is cached under it; an abandoned answer is cached too, but kept
+        out of the chat history. Without it the current pipeline is used and
+        nothing is cached.
+        """
+        pipeline = self._model_cache.get(resume_hash) if resume_hash else None
+        if pipeline is None:
+            resume_hash = None
+            pipeline = self.rag_pipeline
+        if not pipeline:
             return {"error": "RAG pipeline not initialized"}
             
+        RAG_QUEUE_DEPTH.inc()
         try:
             logging.info(f"Analyzing skills gap for role: {target_role}")
-            result = self.rag_pipeline.analyze_skills_gap(target_role)
+            result = pipeline.analyze_skills_gap(target_role, budget_seconds=budget_seconds, discard=abandoned)
             logging.info(f"Skills gap analysis result: {result}")
+            self._count_generated_tokens(result)
+            if 'error' not in result and resume_hash:
+                self._store_answer(resume_hash, target_role, result)
             return result
         except Exception as e:
             logging.error(f"Error analyzing skills gap: {e}")
             return {"error": str(e)}
+        finally:
+            RAG_QUEUE_DEPTH.dec()
+    
+    def answer_hedged(self, rag_call: Callable[[float, threading.Event], Dict], fallback_call: Callable[[], Dict],
+                      budget_seconds: Optional[float] = None) -> Tuple[Dict, bool, str]:
+        """Run rag_call(budget_seconds, abandoned) with the rule-based answer as a hedge; returns (result, rag_used, reason).
+
+        The circuit breaker may route straight to the fallback. Otherwise the
+        fallback is computed while the LLM runs and returned if the LLM errors
+        or misses its deadline, in which case abandoned is set. reason is "rag"
+        or why the fallback was used: unavailable, errors/slow (circuit open),
+        saturated, deadline or error.
+        """
+        reason = self.circuit.acquire() if self.is_available() else "unavailable"
+        if reason:
+            RAG_ROUTES.inc(reason)
+            return fallback_call(), False, reason
+        
+        budget_seconds = budget_seconds or default_budget_seconds()
+        start = time.perf_counter()
+        self._last_live_call = time.monotonic()
+        self._preempt.set()
+        abandoned = threading.Event()
+        future = self._executor.submit(profiled(rag_call), budget_seconds, abandoned)
+        
+        def finished(done):
+            # A call that misses the deadline still reports its latency when it finishes
+            self._last_live_call = time.monotonic()
+            self.circuit.release(time.perf_counter() - start, done.exception() is None and 'error' not in done.result())
+        future.add_done_callback(finished)
+        fallback = fallback_call()
+        try:
+            result = future.result(timeout=max(0.0, start + HEDGE_GRACE * budget_seconds - time.perf_counter()))
+        except FutureTimeout:
+            reason = "deadline"
+            abandoned.set()
+        else:
+            reason = "error" if 'error' in result else "rag"
+        RAG_ROUTES.inc(reason)
+        if reason == "rag":
+            return result, True, reason
+        logging.info(f"Using the rule-based answer ({reason})")
+        return fallback, False, reason
+    
+    def cached_skills_gap(self, resume_hash: Optional[str], target_role: str) -> Optional[Dict]:
+        """A skills-gap analysis already computed (or precomputed) for this resume and role"""
+        with self._answer_lock:
+            key = (resume_hash, target_role.strip().lower())
+            result = self._answer_cache.get(key)
+            if result is not None:
+                self._answer_cache.move_to_end(key)
+        ANSWER_CACHE_REQUESTS.inc("hit" if result is not None else "miss")
+        return result
+    
+    def _store_answer(self, resume_hash: str, target_role: str, result: Dict):
+        with self._answer_lock:
+            self._answer_cache[(resume_hash, target_role.strip().lower())] = result
+            while len(self._answer_cache) > self._answer_cache_size:
+                self._answer_cache.popitem(last=False)
+    
+    def schedule_precompute(self, resume_hash: str, roles: List[str]) -> int:
+        """Queue skills-gap analyses of the top suggested roles to run when the worker is idle"""
+        if not PRECOMPUTE_ENABLED or not self.is_available():
+            return 0
+        roles = roles[:PRECOMPUTE_ROLES]
+        for role in roles:
+            self._precompute_queue.put((resume_hash, role))
+        # Started on first use, so prefork masters never hold the thread
+        with self._precompute_lock:
+            if self._precompute_thread is None:
+                self._precompute_thread = threading.Thread(
+                    target=self._precompute_loop, name="rag-precompute", daemon=True
+                )
+                self._precompute_thread.start()
+        return len(roles)
+    
+    def _wait_until_idle(self):
+        """Block until no live RAG call has run for PRECOMPUTE_IDLE_SECONDS and the circuit is closed"""
+        while True:
+            # A live call starting after this check sets it again, and the speculative one yields
+            self._preempt.clear()
+            idle_for = time.monotonic() - self._last_live_call
+            if self.circuit.in_flight == 0 and self.circuit.state == CLOSED and idle_for >= PRECOMPUTE_IDLE_SECONDS:
+                return
+            time.sleep(max(PRECOMPUTE_IDLE_SECONDS - idle_for, 0.05))
+    
+    def _precompute_loop(self):
+        while True:
+            resume_hash, role = self._precompute_queue.get()
+            self._wait_until_idle()
+            try:
+                self._precompute(resume_hash, role)
+            except Exception as e:
+                PRECOMPUTES.inc("failed")
+                logging.warning(f"Precomputing the {role} skills gap failed: {e}")
+    
+    def _precompute(self, resume_hash: str, role: str):
+        # The user may have uploaded a newer version in the meantime
+        pipeline = self._model_cache.get(resume_hash)
+        if pipeline is None:
+            PRECOMPUTES.inc("superseded")
+            return
+        with self._answer_lock:
+            cached = (resume_hash, role.strip().lower()) in self._answer_cache
+        if cached:
+            PRECOMPUTES.inc("cached")
+            return
+        start = time.perf_counter()
+        result = pipeline.analyze_skills_gap(
+            role, budget_seconds=PRECOMPUTE_BUDGET_SECONDS, speculative=True, discard=self._preempt
+        )
+        if result.get("cancelled"):
+            # A live call started and cut the answer short; try again when idle
+            PRECOMPUTES.inc("preempted")
+            self._precompute_queue.put((resume_hash, role))
+            return
+        if 'error' in result:
+            PRECOMPUTES.inc("failed")
+            logging.warning(f"Precomputing the {role} skills gap failed: {result['error']}")
+            return
+        self._count_generated_tokens(result)
+        self._store_answer(resume_hash, role, result)
+        PRECOMPUTES.inc("computed")
+        logging.info(f"Precomputed the {role} skills gap in {time.perf_counter() - start:.2f}s")
+    
+    def answer_cache_info(self) -> Dict:
+        counts = {labels[0]: int(value) for labels, value in ANSWER_CACHE_REQUESTS.samples()}
+        hits, misses = counts.get("hit", 0), counts.get("miss", 0)
+        return {
+            "entries": len(self._answer_cache),
+            "pending": self._precompute_queue.qsize(),
+            "precomputed": int(dict(PRECOMPUTES.samples()).get(("computed",), 0)),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(100 * hits / (hits + misses), 1) if hits + misses else 0.0,
+        }
+    
+    def _count_generated_tokens(self, result: Dict):
+        """Add the answer's token count, as reported by the pipeline, to the generated-tokens counter"""
+        if result.get("generated_tokens"):
+            GENERATED_TOKENS.inc(amount=result["generated_tokens"])
+    
+    def ingest_resume(self, resume_path: str):
+        """Parse a resume once and store it; returns (hash, parsed data, stored)"""
+        # Generate resume hash for caching
+        resume_hash = self._get_resume_hash(resume_path)
+        
+        # Reuse the stored parse for content we have already seen
+        parsed_data = self.load_parsed_resume(resume_hash)
+        if parsed_data is not None:
+            return resume_hash, parsed_data, True
+        
+        # PyMuPDF adds ~100 ms to startup, so it is imported with the first upload
+        from utils.pdf_parser import extract_text_from_pdf
+        raw_text = extract_text_from_pdf(resume_path)
+        parsed_data = parse_resume(raw_text)
+        
+        # Skill features are memoised with the resume so views never rescan skills
+        parsed_data['skill_features'] = compute_skill_features(parsed_data.get('skills', []))
+        
+        stored = self.store_parsed_resume(resume_hash, resume_path, parsed_data)
+        return resume_hash, parsed_data, stored
+    
+    def load_parsed_resume(self, resume_hash: str) -> Optional[Dict]:
+        """Load a previously parsed resume from the database"""
+        try:
+            return Resume.objects.load_parsed_data(resume_hash)
+        except DatabaseError as e:
+            logging.warning(f"Resume store unavailable: {e}")
+            return None
+    
+    def store_parsed_resume(self, resume_hash: str, resume_path: str, parsed_data: Dict) -> bool:
+        """Persist a parsed resume with its sections and skills"""
+        try:
+            Resume.objects.ingest(resume_hash, resume_path, parsed_data)
+            return True
+        except DatabaseError as e:
+            logging.warning(f"Could not store parsed resume: {e}")
+            return False
+    
+    def load_models(self) -> Dict:
+        """Load the embedding and generation models without running them; returns timings in seconds"""
+        timings = {}
+        if not RAG_AVAILABLE:
+            return timings
+        start = time.perf_counter()
+        load_rag_components().get_embeddings()
+        timings["embedding_load"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self._load_global_model()
+        if self._global_model is None:
+            raise RuntimeError("generation model failed to load")
+        timings["generation_load"] = time.perf_counter() - start
+        return timings
+    
+    def torch_modules(self) -> List:
+        """The loaded torch modules (generator and embedding model)"""
+        embeddings = _rag_components.loaded_embeddings() if _rag_components else None
+        modules = [getattr(self._global_model, "model", None), getattr(embeddings, "model", None)]
+        return [module for module in modules if module is not None]
+    
+    def prewarm(self) -> Dict:
+        """Load both models and run a dummy embedding and generation; returns timings in seconds"""
+        with self._prewarm_lock:
+            if self.readiness == "ready":
+                return {}
+            self.readiness = "warming"
+            try:
+                timings = self.load_models()
+                if RAG_AVAILABLE:
+                    start = time.perf_counter()
+                    load_rag_components().get_embeddings().embed_query("warmup")
+                    timings["embedding"] = time.perf_counter() - start
+                    
+                    start = time.perf_counter()
+                    self._global_model("Hello", max_new_tokens=1)
+                    timings["generation"] = time.perf_counter() - start
+                    
+                    # Embeds the intent examples so the first routed question is fast too
+                    start = time.perf_counter()
+                    self.route_question("warmup")
+                    timings["intent_router"] = time.perf_counter() - start
+                    
+                    start = time.perf_counter()
+                    self.precompute_template_queries()
+                    timings["template_queries"] = time.perf_counter() - start
+            except Exception as e:
+                self.readiness = "failed"
+                self.readiness_error = str(e)
+                logging.error(f"Prewarm failed: {e}")
+                raise
+            
+            self.readiness = "ready"
+            self.readiness_error = None
+            logging.info(f"Models prewarmed: {timings}")
+            return timings
+    
+    def precompute_template_queries(self) -> int:
+        """Pin query embeddings for the skills-gap question of every catalog role"""
+        components = load_rag_components()
+        embeddings = components.get_embeddings()
+        if not hasattr(embeddings, "precompute"):
+            return 0
+        questions = [components.SKILLS_GAP_QUESTION.format(role=role) for role in get_role_catalog().role_names]
+        return embeddings.precompute(questions)
+    
+    def save_model_snapshots(self, directory: str) -> List[str]:
+        """Save the loaded models under directory, in the layout SAHAY_MODEL_DIR expects"""
+        paths = []
+        if hasattr(self._global_model, "save_pretrained"):
+            path = os.path.join(directory, snapshot_name(self._model_info.get("model_name", "generator")))
+            self._global_model.save_pretrained(path)
+            paths.append(path)
+        embeddings = _rag_components.loaded_embeddings() if _rag_components else None
+        if getattr(embeddings, "model", None) is not None:
+            path = os.path.join(directory, snapshot_name(embeddings.model_name))
+            embeddings.model.save(path)
+            paths.append(path)
+        return paths
     
     def get_resume_data(self) -> Optional[Dict]:
         """Get current resume data"""
@@ -198,11 +652,32 @@ class RAGService:
     
     def get_cache_info(self) -> Dict:
         """Get information about model caching and performance"""
+        generation = stage_summary("generation")
+        memory = self.get_memory_info()
+        model_info = dict(self._model_info)
+        if model_info:
+            # Measured rather than advertised response time and footprint
+            model_info["response_time"] = (
+                f"{generation['p50_ms']:.0f} ms (p50)" if generation else "No data yet"
+            )
+            model_info["memory_usage"] = format_bytes(memory["generator_bytes"])
+        
+        embeddings = _rag_components.loaded_embeddings() if _rag_components else None
+        query_cache = embeddings.cache_stats() if hasattr(embeddings, "cache_stats") else None
+        
         return {
             "global_model_loaded": self._global_model is not None,
             "cached_pipelines": len(self._model_cache),
             "rag_available": self.is_available(),
-            "model_info": self._model_info,
+            "model_info": model_info,
+            "stage_latency": latency_snapshot(),
+            "query_cache": query_cache,
+            "generation_budget": budget_report(),
+            "circuit": self.circuit.snapshot(),
+            "answer_cache": self.answer_cache_info(),
+            "memory": {
+                key: value for key, value in memory.items() if key != "pipelines"
+            },
             "performance_tips": [
                 "Using CPU-optimized model for better performance",
                 "Model cached in memory for instant responses",
@@ -210,5 +685,32 @@ class RAGService:
             ]
         }
 
+    def get_memory_info(self, limit: Optional[int] = None) -> Dict:
+        """Estimated memory held by models, cached pipelines and the process"""
+        generator = getattr(self._global_model, "model", None)
+        # Don't import the RAG stack just to report that nothing is loaded
+        embeddings = _rag_components.loaded_embeddings() if _rag_components else None
+        
+        pipelines = []
+        for resume_hash, pipeline in list(self._model_cache.items()):
+            try:
+                usage = pipeline.memory_usage()
+            except Exception as e:
+                logging.warning(f"Could not measure pipeline {resume_hash}: {e}")
+                continue
+            usage["resume_hash"] = resume_hash
+            pipelines.append(usage)
+        pipelines.sort(key=lambda usage: usage["total_bytes"], reverse=True)
+        
+        memory = process_memory()
+        memory.update({
+            "generator_bytes": module_bytes(generator),
+            "embedding_bytes": module_bytes(getattr(embeddings, "model", None)),
+            "pipelines_bytes": sum(usage["total_bytes"] for usage in pipelines),
+            "conversation_bytes": sum(usage["conversation_bytes"] for usage in pipelines),
+            "pipelines": pipelines[:limit] if limit else pipelines,
+        })
+        return memory
+
 # Global RAG service instance
 rag_service = RAGService() 
\ No newline at end of file
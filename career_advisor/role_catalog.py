@@ -0,0 +1,242 @@
+import os
+import json
+import hashlib
+import re
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.resume_parser import normalize_skill
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'role_catalog.json'
+)
+
+# Longest skill phrase (in words) looked up inside a free-form resume skill
+_MAX_NGRAM = 3
+
+# Stripped from the words of a question before looking for role names in it
+_EDGE_PUNCTUATION = '.,;:!?"\'()[]'
+
+# Keywords the rule-based views branch on, matched as substrings of each skill
+SKILL_KEYWORDS = ('python', 'java', 'sql', 'machine learning')
+
+# Resumes scored per block in score_many(), bounds the (N, nnz) temporary
+_BULK_BLOCK_CELLS = 16 * 1024 * 1024
+
+
+class RoleCatalog:
+    """Sparse role-by-skill matrix for vectorised skills-gap scoring"""
+
+    def __init__(self, roles: List[Dict], aliases: Optional[Dict[str, str]] = None, version=None):
+        self.version = str(version or 0)
+        self.aliases = {normalize_skill(k): normalize_skill(v) for k, v in (aliases or {}).items()}
+
+        # Column per distinct normalised skill, keeping the first display name seen
+        self.vocabulary: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+        role_columns = []
+        for role in roles:
+            columns = []
+            for skill in role.get('skills', []):
+                key = self._canonical(skill)
+                if key not in self.vocabulary:
+                    self.vocabulary[key] = len(self.skill_names)
+                    self.skill_names.append(skill)
+                columns.append(self.vocabulary[key])
+            role_columns.append(columns)
+
+        self.role_names = [role['name'] for role in roles]
+        self.role_index: Dict[str, int] = {}
+        for row, role in enumerate(roles):
+            for name in [role['name']] + list(role.get('aliases', [])):
+                self.role_index.setdefault(self._role_key(name), row)
+        self._max_role_words = max((len(key.split()) for key in self.role_index), default=0)
+
+        # Sparse role-by-skill matrix in CSR form: role r needs indices[indptr[r]:indptr[r + 1]]
+        self.indptr = np.zeros(len(roles) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum([len(columns) for columns in role_columns])
+        self.indices = np.array(
+            [column for columns in role_columns for column in columns], dtype=np.int32
+        )
+        self.role_sizes = np.diff(self.indptr)
+
+        logging.info(f"Role catalog loaded: {len(self.role_names)} roles, "
+                     f"{len(self.skill_names)} skills")
+
+    @classmethod
+    def from_file(cls, path: str) -> 'RoleCatalog':
+        """Load a catalog from a JSON file with "roles" and optional "aliases" """
+        with open(path, 'rb') as f:
+            content = f.read()
+        data = json.loads(content)
+        # Fingerprint the content so skill ids memoised against an edited file are recomputed
+        version = f"{data.get('version', 0)}-{hashlib.md5(content).hexdigest()[:8]}"
+        return cls(data['roles'], data.get('aliases'), version=version)
+
+    @staticmethod
+    def _role_key(name: str) -> str:
+        return re.sub(r'\s+', ' ', name.strip().lower())
+
+    def _canonical(self, skill: str) -> str:
+        key = normalize_skill(skill)
+        return self.aliases.get(key, key)
+
+    def __len__(self):
+        return len(self.role_names)
+
+    @property
+    def n_skills(self) -> int:
+        return len(self.skill_names)
+
+    def find_role(self, name: str) -> Optional[int]:
+        """Row index for a role name or alias, case-insensitive.
+
+        For longer text, such as a chat question, the longest role name or alias
+        it mentions as whole words.
+        """
+        key = self._role_key(name)
+        row = self.role_index.get(key)
+        if row is not None:
+            return row
+        words = [word.strip(_EDGE_PUNCTUATION) for word in key.split()]
+        for size in range(min(self._max_role_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                row = self.role_index.get(' '.join(words[start:start + size]))
+                if row is not None:
+                    return row
+        return None
+
+    def skill_ids(self, skills: Iterable[str]) -> List[int]:
+        """Catalog columns mentioned by a list of free-form resume skills"""
+        found = set()
+        for skill in skills:
+            key = normalize_skill(skill)
+            if not key:
+                continue
+            candidates = {key}
+            words = [w for w in re.split(r'[\s,()\[\]]+', key) if w]
+            for size in range(1, min(_MAX_NGRAM, len(words)) + 1):
+                for start in range(len(words) - size + 1):
+                    phrase = ' '.join(words[start:start + size])
+                    # Single short words ("c", "r") only count as the whole skill
+                    if size == 1 and len(phrase) < 2 and phrase != key:
+                        continue
+                    candidates.add(phrase)
+            for candidate in candidates:
+                column = self.vocabulary.get(self.aliases.get(candidate, candidate))
+                if column is not None:
+                    found.add(column)
+        return sorted(found)
+
+    def encode_ids(self, skill_ids: Iterable[int]) -> np.ndarray:
+        """Boolean skill vector for a list of catalog columns"""
+        vector = np.zeros(self.n_skills, dtype=bool)
+        vector[list(skill_ids)] = True
+        return vector
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """Boolean skill vector for a list of free-form resume skills"""
+        return self.encode_ids(self.skill_ids(skills))
+
+    def _matched_counts(self, hits: np.ndarray) -> np.ndarray:
+        # Per-role sums of the gathered hits, as differences of a running total
+        totals = np.zeros(hits.shape[:-1] + (hits.shape[-1] + 1,), dtype=np.int32)
+        np.cumsum(hits, axis=-1, out=totals[..., 1:])
+        return totals[..., self.indptr[1:]] - totals[..., self.indptr[:-1]]
+
+    def coverage(self, resume_vector: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Matched skill counts and coverage ratios for every role at once"""
+        matched = self._matched_counts(resume_vector[self.indices])
+        return matched, matched / np.maximum(self.role_sizes, 1)
+
+    def role_skills(self, role: int) -> List[str]:
+        """Display names of the skills a role needs, in catalog order"""
+        columns = self.indices[self.indptr[role]:self.indptr[role + 1]]
+        return [self.skill_names[column] for column in columns]
+
+    def missing_skills(self, resume_vector: np.ndarray, role: int) -> List[str]:
+        """Display names of the skills a role needs that the resume lacks"""
+        columns = self.indices[self.indptr[role]:self.indptr[role + 1]]
+        return [self.skill_names[column] for column in columns[~resume_vector[columns]]]
+
+    def matched_skills(self, resume_vector: np.ndarray, role: int) -> List[str]:
+        """Display names of the role's skills the resume already has"""
+        columns = self.indices[self.indptr[role]:self.indptr[role + 1]]
+        return [self.skill_names[column] for column in columns[resume_vector[columns]]]
+
+    def rank_roles(self, resume_vector: np.ndarray, top_k: int = 5) -> List[Dict]:
+        """Best matching roles by coverage, then by number of matched skills; only roles with a match"""
+        matched, ratio = self.coverage(resume_vector)
+        top_k = min(top_k, len(self.role_names))
+        if top_k <= 0:
+            return []
+        candidates = np.argpartition(-ratio, top_k - 1)[:top_k]
+        order = candidates[np.lexsort((-matched[candidates], -ratio[candidates]))]
+        # Roles the resume matches no skill of aren't "close", so an empty resume gets none
+        return [
+            {
+                'role': self.role_names[row],
+                'coverage': float(ratio[row]),
+                'matched': int(matched[row]),
+                'required': int(self.role_sizes[row]),
+            }
+            for row in order if matched[row] > 0
+        ]
+
+    def score_many(self, resume_vectors: np.ndarray) -> np.ndarray:
+        """Coverage matrix of shape (N resumes, M roles) for stacked resume vectors"""
+        resume_vectors = np.atleast_2d(resume_vectors)
+        scores = np.empty((resume_vectors.shape[0], len(self.role_names)), dtype=np.float32)
+        sizes = np.maximum(self.role_sizes, 1)
+        block = max(1, _BULK_BLOCK_CELLS // max(len(self.indices), 1))
+        for start in range(0, resume_vectors.shape[0], block):
+            hits = resume_vectors[start:start + block][:, self.indices]
+            scores[start:start + block] = self._matched_counts(hits) / sizes
+        return scores
+
+    def score_resumes(self, skill_lists: Iterable[Iterable[str]]) -> np.ndarray:
+        """Bulk API: coverage of N free-form skill lists against every role"""
+        vectors = [self.encode(skills) for skills in skill_lists]
+        if not vectors:
+            return np.empty((0, len(self.role_names)), dtype=np.float32)
+        return self.score_many(np.stack(vectors))
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_role_catalog() -> RoleCatalog:
+    """Process-wide role catalog, loaded from settings.ROLE_CATALOG_PATH on first use"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                from django.conf import settings
+                path = getattr(settings, 'ROLE_CATALOG_PATH', DEFAULT_CATALOG_PATH)
+                _catalog = RoleCatalog.from_file(path)
+    return _catalog
+
+
+def compute_skill_features(skills: List[str]) -> Dict:
+    """Normalised skill features for a resume, computed once at ingest"""
+    catalog = get_role_catalog()
+    lowered = [skill.lower() for skill in skills]
+    return {
+        'catalog_version': catalog.version,
+        'skill_ids': catalog.skill_ids(skills),
+        'keywords': [keyword for keyword in SKILL_KEYWORDS if any(keyword in skill for skill in lowered)],
+        'skills_count': len(skills),
+    }
+
+
+def get_skill_features(resume_data: Dict) -> Dict:
+    """Memoised skill features of a parsed resume, recomputed only for a changed catalog"""
+    features = resume_data.get('skill_features')
+    if not features or features.get('catalog_version') != get_role_catalog().version:
+        features = compute_skill_features(resume_data.get('skills', []))
+        resume_data['skill_features'] = features
+    return features
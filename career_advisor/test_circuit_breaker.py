@@ -0,0 +1,88 @@
+import pytest
+
+from career_advisor import circuit_breaker
+from career_advisor.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_breaker(**kwargs):
+    options = {"latency_slo": 1.0, "error_rate": 0.5, "window": 10, "min_calls": 4, "cooldown": 30.0,
+               "max_in_flight": 2}
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+def call(breaker, seconds=0.1, ok=True):
+    reason = breaker.acquire()
+    if reason is None:
+        breaker.release(seconds, ok)
+    return reason
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        assert call(breaker, ok=False) is None
+    assert breaker.state == CLOSED
+
+
+def test_opens_on_errors_and_refuses_calls(clock):
+    breaker = make_breaker()
+    for ok in (True, True, False, False):
+        call(breaker, ok=ok)
+    assert breaker.state == OPEN
+    assert breaker.acquire() == "errors"
+    assert breaker.snapshot()["reason"] == "errors"
+
+
+def test_opens_when_p90_latency_exceeds_the_slo(clock):
+    breaker = make_breaker()
+    for seconds in (0.1, 0.1, 2.0, 2.0):
+        call(breaker, seconds=seconds)
+    assert breaker.state == OPEN
+    assert breaker.acquire() == "slow"
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, ok=False)
+    clock[0] += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.acquire() is None
+    # Only one probe at a time
+    assert breaker.acquire() == "errors"
+    breaker.release(0.1, True)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["recent_calls"] == 0
+
+
+def test_failed_or_slow_probe_reopens(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, seconds=5.0)
+    clock[0] += 30
+    assert call(breaker, seconds=0.1, ok=False) is None
+    assert breaker.state == OPEN
+    clock[0] += 29
+    assert breaker.acquire() == "slow"
+    clock[0] += 1
+    assert call(breaker, seconds=5.0) is None
+    assert breaker.state == OPEN
+
+
+def test_refuses_calls_beyond_max_in_flight(clock):
+    breaker = make_breaker(max_in_flight=2)
+    assert breaker.acquire() is None
+    assert breaker.acquire() is None
+    assert breaker.acquire() == "saturated"
+    assert breaker.in_flight == 2
+    breaker.release(0.1, True)
+    assert breaker.acquire() is None
+    assert breaker.state == CLOSED
@@ -0,0 +1,112 @@
+import pytest
+
+from benchmarks.stubs import HashEmbeddings
+from career_advisor.intent_router import CANNED_INTENTS, IntentRouter
+
+# Held-out chat questions (none is an INTENT_EXAMPLES entry) labelled with the
+# canned intent that should answer them, or None for questions the LLM should get
+LABELLED_QUESTIONS = [
+    ("What skills am I missing to become a data analyst?", "skills_gap"),
+    ("Which skills should I learn next?", "skills_gap"),
+    ("What do I need to learn to be a DevOps engineer?", "skills_gap"),
+    ("What is my skills gap for a backend developer role?", "skills_gap"),
+    ("Which skills am I lacking?", "skills_gap"),
+    ("What should I improve to get hired as an ML engineer?", "skills_gap"),
+    ("What jobs am I a good fit for?", "career_paths"),
+    ("Which career paths match my skills?", "career_paths"),
+    ("What roles should I apply to?", "career_paths"),
+    ("What kind of career options do I have?", "career_paths"),
+    ("Which jobs suit my profile?", "career_paths"),
+    ("Can you summarize my resume?", "resume_summary"),
+    ("Give me a quick overview of my resume", "resume_summary"),
+    ("What are my strongest skills?", "resume_summary"),
+    ("How many projects do I have on my resume?", "resume_summary"),
+    ("Tell me about my profile", "resume_summary"),
+    ("How do I prepare for a system design interview?", None),
+    ("How can I negotiate my salary offer?", None),
+    ("Should I pursue a PhD or join industry?", None),
+    ("How do I explain a career break to recruiters?", None),
+    ("Is it better to join a startup or a big tech company?", None),
+    ("How do I write a good cover letter?", None),
+    ("What is the best way to network on LinkedIn?", None),
+    ("How do I deal with a difficult manager?", None),
+    ("Should I learn Rust or Go in 2024?", None),
+    ("How do I switch from mechanical engineering to software?", None),
+]
+
+
+def routing_report(router):
+    """Precision (routed questions that went to the right intent) and recall over LABELLED_QUESTIONS"""
+    routed = correct = 0
+    for question, label in LABELLED_QUESTIONS:
+        route = router.route(question)
+        if route is not None:
+            routed += 1
+            correct += route[0] == label
+    labelled = sum(1 for _, label in LABELLED_QUESTIONS if label is not None)
+    return {"precision": correct / routed if routed else 1.0, "recall": correct / labelled}
+
+
+def hash_router(**kwargs):
+    embeddings = HashEmbeddings()
+    return IntentRouter(embeddings.embed_query, embeddings.embed_documents, **kwargs)
+
+
+def test_labelled_questions_cover_every_canned_intent():
+    assert {label for _, label in LABELLED_QUESTIONS} == set(CANNED_INTENTS) | {None}
+
+
+def test_default_thresholds_route_precisely():
+    report = routing_report(hash_router())
+    # A wrong template is worse than a slower LLM answer, so precision is what the thresholds protect
+    assert report["precision"] == 1.0
+    assert report["recall"] >= 0.5
+
+
+def test_without_thresholds_open_ended_questions_get_templates():
+    report = routing_report(hash_router(threshold=0.0, margin=0.0))
+    assert report["precision"] < 1.0
+
+
+def test_real_embeddings_route_precisely():
+    pytest.importorskip("sentence_transformers")
+    from rag.vector_store import get_embeddings
+
+    embeddings = get_embeddings()
+    report = routing_report(IntentRouter(embeddings.embed_query, embeddings.embed_documents))
+    assert report["precision"] >= 0.95
+    assert report["recall"] >= 0.6
+
+
+def test_classify_reports_lead_over_runner_up():
+    router = IntentRouter(lambda text: [1.0, 0.2] if "skills" in text else [0.0, 1.0],
+                          examples={"skills_gap": ["skills"], "open_ended": ["other"]})
+    intent, score, lead = router.classify("my skills")
+    assert intent == "skills_gap"
+    assert score == pytest.approx(1.0)
+    assert lead == pytest.approx(1.0 - 0.2 / (1.04 ** 0.5))
+    assert router.route("anything else") is None
+
+
+def test_skills_gap_template_needs_a_role_in_the_question():
+    from career_advisor.views import answer_for_intent
+
+    resume = {"skills": ["Python", "SQL"]}
+    assert answer_for_intent("skills_gap", resume, "What skills am I missing?") is None
+    answer = answer_for_intent("skills_gap", resume, "What skills do I need to become a data analyst?")
+    assert answer.startswith("For Data Analyst you have 2 of 5 core skills.")
+
+
+def test_intent_without_a_template_goes_to_rag():
+    from career_advisor.views import answer_for_intent
+
+    assert answer_for_intent("interview_prep", {"skills": ["Python"]}, "How do I prepare for interviews?") is None
+
+
+def test_find_role_in_a_question():
+    from career_advisor.role_catalog import get_role_catalog
+
+    catalog = get_role_catalog()
+    assert catalog.role_names[catalog.find_role("How do I become a machine learning engineer?")] == "ML Engineer"
+    assert catalog.role_names[catalog.find_role("Skills for a big data engineer, please.")] == "Big Data Engineer"
+    assert catalog.find_role("What skills am I missing?") is None
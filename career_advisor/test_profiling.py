@@ -0,0 +1,74 @@
+import cProfile
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from career_advisor.profiling import ProfileStore
+
+
+def make_profile():
+    profiler = cProfile.Profile()
+    profiler.runcall(sum, range(100))
+    return profiler
+
+
+def write_old_profile(directory, name, age, size=10):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as handle:
+        handle.write(b"x" * size)
+    created = time.time() - age
+    os.utime(path, (created, created))
+    return path
+
+
+def test_save_names_the_profile_after_the_request(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles"))
+    name = store.save(make_profile(), SimpleNamespace(path="/chat/ask/", method="POST"), 0.25)
+    assert name.endswith("-post-chat_ask-250ms.prof")
+    assert [entry["name"] for entry in store.list()] == [name]
+    assert "sum" in store.summary(name)
+
+
+def test_oldest_profiles_are_pruned_past_the_file_limit(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=3)
+    for age, name in enumerate(["d.prof", "c.prof", "b.prof", "a.prof"], start=1):
+        write_old_profile(str(tmp_path), name, age * 60)
+    newest = store.save(make_profile(), SimpleNamespace(path="/", method="GET"), 0.1)
+    assert [entry["name"] for entry in store.list()] == [newest, "d.prof", "c.prof"]
+
+
+def test_oldest_profiles_are_pruned_past_the_size_limit(tmp_path):
+    write_old_profile(str(tmp_path), "old.prof", 120, size=1000)
+    write_old_profile(str(tmp_path), "new.prof", 60, size=1000)
+    store = ProfileStore(str(tmp_path), max_bytes=1500)
+    newest = store.save(make_profile(), SimpleNamespace(path="/", method="GET"), 0.1)
+    assert os.path.getsize(tmp_path / newest) < 500
+    assert [entry["name"] for entry in store.list()] == [newest, "new.prof"]
+
+
+def test_other_files_are_neither_listed_nor_pruned(tmp_path):
+    write_old_profile(str(tmp_path), "notes.txt", 600)
+    store = ProfileStore(str(tmp_path), max_files=1)
+    store.save(make_profile(), SimpleNamespace(path="/", method="GET"), 0.1)
+    assert os.path.exists(tmp_path / "notes.txt")
+
+
+@pytest.mark.parametrize("name", [
+    "../secret.prof", "..%2Fsecret.prof", "sub/secret.prof", "sub\\secret.prof", "/tmp/secret.prof",
+    "secret.txt", "secret.prof/", "", ".prof",
+])
+def test_names_that_could_leave_the_directory_are_rejected(tmp_path, name):
+    directory = tmp_path / "profiles"
+    directory.mkdir()
+    (directory / "sub").mkdir()
+    for path in (tmp_path / "secret.prof", directory / "sub" / "secret.prof", directory / "secret.txt"):
+        path.write_bytes(b"x")
+    store = ProfileStore(str(directory))
+    assert store.open_path(name) is None
+    assert store.summary(name) is None
+
+
+def test_missing_profile_is_not_found(tmp_path):
+    assert ProfileStore(str(tmp_path)).open_path("missing.prof") is None
@@ -0,0 +1,217 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from career_advisor import profiling
+from career_advisor import rag_service as rag_service_module
+from career_advisor.circuit_breaker import CircuitBreaker
+from career_advisor.rag_service import RAGService
+
+
+def fallback():
+    return {"answer": "rule-based"}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = RAGService()
+    monkeypatch.setattr(service, "is_available", lambda: True)
+    service.circuit = CircuitBreaker(latency_slo=5.0, max_in_flight=2)
+    yield service
+    service._executor.shutdown(wait=True)
+
+
+def test_hedge_returns_the_rag_answer_in_time(service):
+    result, rag_used, reason = service.answer_hedged(lambda budget, abandoned: {"answer": "llm"}, fallback, 1.0)
+    assert (result, rag_used, reason) == ({"answer": "llm"}, True, "rag")
+
+
+def test_hedge_abandons_a_late_rag_call(service):
+    seen = {}
+    release = threading.Event()
+
+    def slow(budget, abandoned):
+        release.wait(5)
+        seen["abandoned"] = abandoned.is_set()
+        return {"answer": "late"}
+
+    result, rag_used, reason = service.answer_hedged(slow, fallback, 0.05)
+    assert (result, rag_used, reason) == (fallback(), False, "deadline")
+    release.set()
+    service._executor.shutdown(wait=True)
+    assert seen["abandoned"] is True
+
+
+def test_hedge_uses_the_fallback_when_the_circuit_refuses(service):
+    service.circuit.max_in_flight = 0
+    rag_calls = []
+    result, rag_used, reason = service.answer_hedged(lambda budget, abandoned: rag_calls.append(1), fallback, 1.0)
+    assert (result, rag_used, reason) == (fallback(), False, "saturated")
+    assert rag_calls == []
+
+
+def test_rag_call_is_profiled_with_the_request(service, monkeypatch):
+    workers = []
+    monkeypatch.setattr(profiling._local, "worker_profiles", workers, raising=False)
+    service.answer_hedged(lambda budget, abandoned: {"answer": "llm"}, fallback, 1.0)
+    assert len(workers) == 1
+
+
+class FakePipeline:
+    def __init__(self, name, during=None, stops_on_discard=True):
+        self.name = name
+        self.during = during
+        self.stops_on_discard = stops_on_discard
+        self.calls = []
+
+    def analyze_skills_gap(self, target_role, budget_seconds=None, speculative=False, discard=None):
+        self.calls.append((target_role, speculative, discard))
+        if self.during:
+            self.during()
+        result = {"answer": "%s gap for %s" % (self.name, target_role)}
+        if discard is not None and discard.is_set() and self.stops_on_discard:
+            result["cancelled"] = True
+        return result
+
+
+def test_answer_cache_is_keyed_by_resume_and_normalised_role(service):
+    service._store_answer("h1", "Data Scientist", {"answer": "a"})
+    assert service.cached_skills_gap("h1", "  data scientist ") == {"answer": "a"}
+    assert service.cached_skills_gap("h2", "Data Scientist") is None
+    assert service.cached_skills_gap("h1", "Data Analyst") is None
+
+
+def test_answer_cache_evicts_the_least_recently_used(service):
+    service._answer_cache_size = 2
+    service._store_answer("h", "A", {"answer": "a"})
+    service._store_answer("h", "B", {"answer": "b"})
+    service.cached_skills_gap("h", "A")
+    service._store_answer("h", "C", {"answer": "c"})
+    assert service.cached_skills_gap("h", "B") is None
+    assert service.cached_skills_gap("h", "A") == {"answer": "a"}
+
+
+def test_skills_gap_uses_and_caches_under_the_given_resume(service):
+    service._model_cache["h1"] = FakePipeline("first")
+    service.rag_pipeline = service._model_cache["h2"] = FakePipeline("second")
+    result = service.analyze_skills_gap_rag("Data Analyst", resume_hash="h1")
+    assert result == {"answer": "first gap for Data Analyst"}
+    assert service.cached_skills_gap("h1", "Data Analyst") == result
+    assert service.cached_skills_gap("h2", "Data Analyst") is None
+
+
+def test_skills_gap_without_a_cached_resume_is_not_cached(service):
+    service.rag_pipeline = FakePipeline("current")
+    assert service.analyze_skills_gap_rag("Data Analyst", resume_hash="gone") == {
+        "answer": "current gap for Data Analyst"}
+    service.analyze_skills_gap_rag("Data Analyst")
+    assert service._answer_cache == {}
+
+
+def test_precompute_caches_a_speculative_answer(service):
+    pipeline = service._model_cache["h1"] = FakePipeline("first")
+    service._precompute("h1", "Data Analyst")
+    assert pipeline.calls == [("Data Analyst", True, service._preempt)]
+    assert service.cached_skills_gap("h1", "data analyst") == {"answer": "first gap for Data Analyst"}
+    # Already there
+    service._precompute("h1", "Data Analyst")
+    assert len(pipeline.calls) == 1
+
+
+def test_precompute_yields_to_a_live_call(service):
+    service._model_cache["h1"] = FakePipeline("first", during=service._preempt.set)
+    service._precompute("h1", "Data Analyst")
+    assert service.cached_skills_gap("h1", "Data Analyst") is None
+    assert service._precompute_queue.get_nowait() == ("h1", "Data Analyst")
+
+
+def test_precompute_keeps_an_answer_the_live_call_did_not_cut(service):
+    # E.g. the model server, which finishes the answer anyway
+    service._model_cache["h1"] = FakePipeline("first", during=service._preempt.set, stops_on_discard=False)
+    service._precompute("h1", "Data Analyst")
+    assert service.cached_skills_gap("h1", "Data Analyst") == {"answer": "first gap for Data Analyst"}
+    assert service._precompute_queue.empty()
+
+
+def test_precompute_budget_defaults_to_the_live_budget():
+    assert rag_service_module.PRECOMPUTE_BUDGET_SECONDS == rag_service_module.default_budget_seconds()
+
+
+def test_precompute_skips_a_superseded_resume(service):
+    service._precompute("gone", "Data Analyst")
+    assert service._answer_cache == {}
+
+
+def test_precompute_thread_is_started_once(service, monkeypatch):
+    started = []
+    monkeypatch.setattr(service, "_precompute_loop", lambda: started.append(1))
+    threads = [threading.Thread(target=service.schedule_precompute, args=("h1", ["Data Analyst"]))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    service._precompute_thread.join()
+    assert started == [1]
+
+
+class IndexedPipeline:
+    """Stands in for CareerRAGPipeline; remembers which pipeline it reused vectors from"""
+
+    def __init__(self, resume_path, cached_model=None, resume_data=None, previous=None):
+        self.resume_path = resume_path
+        self.previous = previous
+
+
+@pytest.fixture
+def uploads(service, monkeypatch):
+    """upload(path, session_key) runs initialize_rag the way the upload view does; a file's hash is its path"""
+    monkeypatch.setattr(rag_service_module, "RAG_AVAILABLE", True)
+    monkeypatch.setattr(rag_service_module, "load_rag_components",
+                        lambda: SimpleNamespace(CareerRAGPipeline=IndexedPipeline))
+    monkeypatch.setattr(service, "_load_global_model", lambda: setattr(service, "_global_model", object()))
+    monkeypatch.setattr(service, "ingest_resume",
+                        lambda path: (path, {"contact": {"email": "jane@example.com"}}, True))
+    sessions = {}
+
+    def upload(path, session_key):
+        assert service.initialize_rag(path, previous_hash=sessions.get(session_key), session_key=session_key)
+        sessions[session_key] = service.current_resume_hash
+        return service.rag_pipeline
+    return upload
+
+
+def test_reupload_in_the_same_session_reuses_and_evicts(service, uploads):
+    first = uploads("v1", "alice")
+    service._store_answer("v1", "Data Analyst", {"answer": "old"})
+    second = uploads("v2", "alice")
+    assert second.previous is first
+    assert "v1" not in service._model_cache
+    assert service.cached_skills_gap("v1", "Data Analyst") is None
+
+
+def test_upload_with_the_same_email_from_another_session_touches_nothing(service, uploads):
+    first = uploads("v1", "alice")
+    service._store_answer("v1", "Data Analyst", {"answer": "alice's"})
+    other = uploads("mallory", "mallory")
+    assert other.previous is None
+    assert service._model_cache["v1"] is first
+    assert service.cached_skills_gap("v1", "Data Analyst") == {"answer": "alice's"}
+
+
+def test_a_version_another_session_uses_is_not_evicted(service, uploads):
+    shared = uploads("v1", "alice")
+    assert uploads("v1", "bob") is shared
+    assert uploads("v2", "alice").previous is shared
+    assert service._model_cache["v1"] is shared
+    # Evicted once its last session moves on
+    uploads("v3", "bob")
+    assert "v1" not in service._model_cache
+
+
+def test_upload_without_a_session_is_not_linked(service, uploads):
+    uploads("v1", "alice")
+    assert service.initialize_rag("v2", previous_hash="v1", session_key=None)
+    assert service.rag_pipeline.previous is None
+    assert "v1" in service._model_cache
@@ -0,0 +1,130 @@
+import numpy as np
+
+from career_advisor.role_catalog import RoleCatalog
+
+ROLES = [
+    {"name": "Data Analyst", "aliases": ["BI Analyst"], "skills": ["SQL", "Excel", "Tableau", "Statistics"]},
+    {"name": "Data Scientist", "skills": ["Python", "SQL", "Machine Learning", "Statistics"]},
+    {"name": "Frontend Developer", "skills": ["JavaScript", "React", "CSS"]},
+]
+ALIASES = {"ML": "Machine Learning", "JS": "JavaScript"}
+
+
+def make_catalog():
+    return RoleCatalog(ROLES, ALIASES, version=1)
+
+
+def test_skill_ids_resolve_aliases_and_phrases():
+    catalog = make_catalog()
+    names = [catalog.skill_names[i] for i in catalog.skill_ids(["js", "Applied ML", "Advanced SQL."])]
+    assert sorted(names) == ["JavaScript", "Machine Learning", "SQL"]
+
+
+def test_skill_ids_ignore_single_letters_inside_phrases():
+    catalog = RoleCatalog([{"name": "R Developer", "skills": ["R", "SQL"]}])
+    assert catalog.skill_ids(["Vitamin R knowledge"]) == []
+    assert [catalog.skill_names[i] for i in catalog.skill_ids(["R"])] == ["R"]
+
+
+def test_coverage_matches_a_per_role_loop():
+    catalog = make_catalog()
+    vector = catalog.encode(["SQL", "Python", "Statistics", "React"])
+    matched, ratio = catalog.coverage(vector)
+    for row in range(len(catalog)):
+        expected = sum(vector[catalog.vocabulary[catalog._canonical(skill)]] for skill in ROLES[row]["skills"])
+        assert matched[row] == expected
+        assert ratio[row] == expected / len(ROLES[row]["skills"])
+
+
+def test_missing_and_matched_skills():
+    catalog = make_catalog()
+    vector = catalog.encode(["SQL", "Python"])
+    role = catalog.find_role("data scientist")
+    assert catalog.matched_skills(vector, role) == ["Python", "SQL"]
+    assert catalog.missing_skills(vector, role) == ["Machine Learning", "Statistics"]
+
+
+def test_find_role_by_name_or_alias():
+    catalog = make_catalog()
+    assert catalog.find_role("  DATA   analyst ") == 0
+    assert catalog.find_role("bi analyst") == 0
+    assert catalog.find_role("Astronaut") is None
+
+
+def test_rank_roles_orders_by_coverage_then_matches():
+    catalog = make_catalog()
+    ranked = catalog.rank_roles(catalog.encode(["SQL", "Statistics", "Python", "React"]), top_k=3)
+    assert [match["role"] for match in ranked] == ["Data Scientist", "Data Analyst", "Frontend Developer"]
+    assert ranked[0] == {"role": "Data Scientist", "coverage": 0.75, "matched": 3, "required": 4}
+
+
+def test_rank_roles_breaks_coverage_ties_by_matched_skills():
+    catalog = RoleCatalog([
+        {"name": "Small", "skills": ["SQL", "Excel"]},
+        {"name": "Large", "skills": ["SQL", "Excel", "Python", "Java"]},
+    ])
+    ranked = catalog.rank_roles(catalog.encode(["SQL", "Excel", "Python"]), top_k=1)
+    assert [match["role"] for match in ranked] == ["Small"]
+    ranked = catalog.rank_roles(catalog.encode(["SQL", "Python"]), top_k=2)
+    assert [match["role"] for match in ranked] == ["Large", "Small"]
+
+
+def test_rank_roles_is_empty_for_a_resume_without_catalog_skills():
+    catalog = make_catalog()
+    assert catalog.rank_roles(catalog.encode([]), top_k=3) == []
+    assert catalog.rank_roles(catalog.encode(["Underwater basket weaving"])) == []
+
+
+def test_score_many_matches_coverage_for_each_resume():
+    catalog = make_catalog()
+    skill_lists = [["SQL"], ["React", "CSS", "JS"], [], ["Python", "ML", "Statistics", "SQL"]]
+    scores = catalog.score_resumes(skill_lists)
+    assert scores.shape == (4, 3)
+    for row, skills in enumerate(skill_lists):
+        np.testing.assert_allclose(scores[row], catalog.coverage(catalog.encode(skills))[1])
+
+
+def test_score_many_in_blocks(monkeypatch):
+    from career_advisor import role_catalog
+
+    catalog = make_catalog()
+    vectors = np.random.default_rng(0).random((50, catalog.n_skills)) < 0.5
+    expected = catalog.score_many(vectors)
+    # Two resumes per block
+    monkeypatch.setattr(role_catalog, "_BULK_BLOCK_CELLS", 2 * len(catalog.indices))
+    np.testing.assert_array_equal(catalog.score_many(vectors), expected)
+
+
+def test_score_resumes_with_no_resumes():
+    assert make_catalog().score_resumes([]).shape == (0, 3)
+
+
+def test_skill_features_are_memoised_on_the_resume(monkeypatch):
+    from career_advisor import role_catalog
+
+    monkeypatch.setattr(role_catalog, "_catalog", make_catalog())
+    resume = {"skills": ["Python", "SQL", "machine learning"]}
+    features = role_catalog.get_skill_features(resume)
+    assert resume["skill_features"] is features
+    assert features["catalog_version"] == "1"
+    assert features["keywords"] == ["python", "sql", "machine learning"]
+
+    calls = []
+    monkeypatch.setattr(role_catalog, "compute_skill_features", lambda skills: calls.append(skills))
+    assert role_catalog.get_skill_features(resume) is features
+    assert calls == []
+
+
+def test_skill_features_are_recomputed_for_a_new_catalog_version(monkeypatch):
+    from career_advisor import role_catalog
+
+    monkeypatch.setattr(role_catalog, "_catalog", make_catalog())
+    resume = {"skills": ["React"]}
+    stale = role_catalog.get_skill_features(resume)
+
+    monkeypatch.setattr(role_catalog, "_catalog", RoleCatalog(ROLES + [{"name": "Designer", "skills": ["Figma"]}],
+                                                              ALIASES, version=2))
+    resume["skills"].append("Figma")
+    fresh = role_catalog.get_skill_features(resume)
+    assert fresh is not stale and fresh["catalog_version"] == "2"
+    assert len(fresh["skill_ids"]) == 2
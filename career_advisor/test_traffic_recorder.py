@@ -0,0 +1,50 @@
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from career_advisor.traffic_recorder import MAX_TEXT_LENGTH, TrafficRecorder, anonymise_session, scrub_text
+
+PII = ["jane.doe+jobs@example.co.in", "+91 98765 43210", "(555) 123-4567", "555.123.4567",
+       "https://linkedin.com/in/jane-doe", "linkedin.com/in/jane-doe"]
+
+
+def fake_request(session_key="abc123"):
+    return SimpleNamespace(session=SimpleNamespace(session_key=session_key))
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("detail", PII)
+def test_personal_details_are_scrubbed(detail):
+    scrubbed = scrub_text("Hi, I'm Jane (%s). What should I learn next?" % detail)
+    assert detail not in scrubbed
+    assert "@" not in scrubbed and not re.search(r"\d{3}", scrubbed)
+    assert scrubbed.endswith("What should I learn next?")
+
+
+def test_recorded_questions_carry_no_personal_details(tmp_path):
+    recorder = TrafficRecorder(str(tmp_path / "logs" / "traffic.jsonl"), enabled=True)
+    question = "Reach me at %s or %s. Am I ready for a data role?" % (PII[0], PII[1])
+    recorder.record("chat", fake_request(), "f" * 32, 0.0123, question=question, route="rag", cache="miss")
+    [entry] = read_records(tmp_path / "logs" / "traffic.jsonl")
+    assert entry["question"] == "Reach me at <email> or <phone>. Am I ready for a data role?"
+    assert entry["session"] == anonymise_session("abc123") and "abc123" not in json.dumps(entry)
+    assert (entry["kind"], entry["route"], entry["cache"], entry["duration_ms"]) == ("chat", "rag", "miss", 12.3)
+
+
+def test_long_questions_are_capped_and_other_fields_kept(tmp_path):
+    recorder = TrafficRecorder(str(tmp_path / "traffic.jsonl"), enabled=True)
+    recorder.record("chat", fake_request(None), None, 0.5, question="x" * (MAX_TEXT_LENGTH + 50), cache=None)
+    [entry] = read_records(tmp_path / "traffic.jsonl")
+    assert len(entry["question"]) == MAX_TEXT_LENGTH
+    assert entry["session"] is None and entry["cache"] is None
+
+
+def test_disabled_recorder_writes_nothing(tmp_path):
+    TrafficRecorder(str(tmp_path / "traffic.jsonl")).record("chat", fake_request(), None, 0.1, question="hi")
+    assert not (tmp_path / "traffic.jsonl").exists()
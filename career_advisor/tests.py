@@ -1,3 +1,77 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
 from django.test import TestCase
 
-# Create your tests here.
+from . import rag_service as rag_service_module
+from .models import Resume, ResumeSection, ResumeSkill
+
+PARSED = {
+    'contact': {'email': 'Jane@Example.com'},
+    'education': ['B.Tech Computer Science, XYZ University'],
+    'experience': ['Software Engineer, Acme Corp', 'Intern, Example Labs'],
+    'projects': ['Chatbot in Flask'],
+    'skills': ['Python', 'python', 'SQL', 'Machine Learning'],
+}
+
+
+class ResumeStoreTests(TestCase):
+    def test_ingest_creates_section_and_skill_rows(self):
+        resume = Resume.objects.ingest('a' * 32, 'media/resumes/jane.pdf', PARSED)
+        self.assertEqual(resume.contact_email, 'jane@example.com')
+        sections = list(resume.sections.values_list('name', 'position', 'content'))
+        self.assertEqual(sections, [
+            ('education', 0, 'B.Tech Computer Science, XYZ University'),
+            ('experience', 0, 'Software Engineer, Acme Corp'),
+            ('experience', 1, 'Intern, Example Labs'),
+            ('projects', 0, 'Chatbot in Flask'),
+        ])
+        # Skills are stored once per normalised name
+        self.assertEqual(sorted(resume.skills.values_list('normalized', flat=True)),
+                         ['machine learning', 'python', 'sql'])
+
+    def test_reingest_replaces_rows(self):
+        Resume.objects.ingest('a' * 32, 'jane.pdf', PARSED)
+        Resume.objects.ingest('a' * 32, 'jane.pdf', PARSED)
+        self.assertEqual(Resume.objects.count(), 1)
+        self.assertEqual(ResumeSection.objects.count(), 4)
+        self.assertEqual(ResumeSkill.objects.count(), 3)
+
+    def test_load_parsed_data_takes_one_query(self):
+        Resume.objects.ingest('a' * 32, 'jane.pdf', PARSED)
+        with self.assertNumQueries(1):
+            self.assertEqual(Resume.objects.load_parsed_data('a' * 32), PARSED)
+        with self.assertNumQueries(1):
+            self.assertIsNone(Resume.objects.load_parsed_data('b' * 32))
+
+    def test_with_skills_needs_every_skill(self):
+        jane = Resume.objects.ingest('a' * 32, 'jane.pdf', PARSED)
+        Resume.objects.ingest('b' * 32, 'sam.pdf', {'skills': ['SQL', 'Excel']})
+        self.assertEqual(list(Resume.objects.with_skills(['sql', 'PYTHON'])), [jane])
+        self.assertEqual(Resume.objects.with_skills(['SQL']).count(), 2)
+        self.assertEqual(Resume.objects.with_skills([]).count(), 2)
+
+
+class IngestResumeTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.pdf_path = os.path.join(directory, 'Resume.pdf')
+        shutil.copy(os.path.join(settings.BASE_DIR, 'data', 'Resume.pdf'), self.pdf_path)
+        self.service = rag_service_module.RAGService()
+
+    def test_same_pdf_is_parsed_once(self):
+        with mock.patch.object(rag_service_module, 'parse_resume', wraps=rag_service_module.parse_resume) as parse:
+            first_hash, first, stored = self.service.ingest_resume(self.pdf_path)
+            rows = (ResumeSection.objects.count(), ResumeSkill.objects.count())
+            second_hash, second, _ = self.service.ingest_resume(self.pdf_path)
+        self.assertTrue(stored)
+        self.assertGreater(rows[1], 0)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(second_hash, first_hash)
+        self.assertEqual(second, first)
+        self.assertEqual(Resume.objects.count(), 1)
+        self.assertEqual((ResumeSection.objects.count(), ResumeSkill.objects.count()), rows)
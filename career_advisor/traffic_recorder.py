@@ -0,0 +1,79 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_TEXT_LENGTH = 1000
+
+# Personal details users sometimes paste into questions
+_SCRUB_PATTERNS = [
+    (re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"), "<email>"),
+    (re.compile(r"\bhttps?://\S+|\bwww\.\S+|linkedin\.com/\S+", re.IGNORECASE), "<url>"),
+    (re.compile(r"\+?\d[\d\s().-]{7,}\d"), "<phone>"),
+]
+
+
+def scrub_text(text: str) -> str:
+    """Replace emails, URLs and phone numbers, and cap the length"""
+    for pattern, replacement in _SCRUB_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text[:MAX_TEXT_LENGTH]
+
+
+def anonymise_session(session_key: Optional[str]) -> Optional[str]:
+    """Stable per-session id that can't be turned back into the session cookie"""
+    if not session_key:
+        return None
+    return hashlib.sha256((settings.SECRET_KEY + session_key).encode()).hexdigest()[:16]
+
+
+class TrafficRecorder:
+    """Append-only JSONL log of chat and analysis requests for offline replay"""
+
+    def __init__(self, path: str, enabled: bool = False):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, request, resume_hash: Optional[str], duration: float, **fields):
+        if not self.enabled:
+            return
+        entry = {
+            "ts": round(time.time(), 3),
+            "kind": kind,
+            "session": anonymise_session(request.session.session_key),
+            "resume_hash": resume_hash,
+            "duration_ms": round(duration * 1000, 2),
+        }
+        for key, value in fields.items():
+            entry[key] = scrub_text(value) if isinstance(value, str) else value
+        line = json.dumps(entry, sort_keys=True)
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            logger.warning("Could not write traffic log %s: %s", self.path, e)
+
+
+_recorder = None
+
+
+def get_traffic_recorder() -> TrafficRecorder:
+    """Process-wide recorder configured from settings"""
+    global _recorder
+    if _recorder is None:
+        _recorder = TrafficRecorder(
+            getattr(settings, "TRAFFIC_LOG_PATH", os.path.join(settings.BASE_DIR, "logs", "traffic.jsonl")),
+            enabled=getattr(settings, "TRAFFIC_LOG_ENABLED", False),
+        )
+    return _recorder
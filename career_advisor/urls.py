@@ -12,4 +12,9 @@ urlpatterns = [
     path('chat/', views.career_chat, name='career_chat'),
     path('roadmap/', views.learning_roadmap, name='learning_roadmap'),
     path('performance/', views.performance_status, name='performance_status'),
+    path('performance/memory/', views.memory_debug, name='memory_debug'),
+    path('performance/profiles/', views.profile_list, name='profile_list'),
+    path('performance/profiles/<str:name>', views.profile_download, name='profile_download'),
+    path('metrics', views.metrics, name='metrics'),
+    path('ready', views.ready, name='ready'),
 ] 
\ No newline at end of file
@@ -1,19 +1,32 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.urls import reverse
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
 import json
+import logging
 import os
 import sys
+import time
 
 # Import our RAG service
 from .rag_service import rag_service
+from .role_catalog import get_role_catalog, get_skill_features
+from .profiling import get_profile_store
+from .traffic_recorder import get_traffic_recorder
 
-# Add src to path for our existing modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from utils.metrics import get_counter, render_prometheus, stage_timer
 
-from utils.pdf_parser import extract_text_from_pdf
-from utils.resume_parser import parse_resume
+UPLOADS = get_counter("sahay_uploads_total", "Resume uploads by outcome.", ("outcome",))
+CHAT_REQUESTS = get_counter("sahay_chat_requests_total", "Chat answers by route.", ("route",))
+
+def get_resume_data(request):
+    """Resume data for this request: live RAG state, then session, then the resume store"""
+    resume_data = rag_service.get_resume_data() or request.session.get('resume_data')
+    if not resume_data and request.session.get('resume_hash'):
+        resume_data = rag_service.load_parsed_resume(request.session['resume_hash'])
+    return resume_data
 
 def home(request):
     """Home page view"""
@@ -22,12 +35,11 @@ def home(request):
 def upload_resume(request):
     """Handle resume upload"""
     if request.method == 'POST':
-        print(f"DEBUG: POST request received")
-        print(f"DEBUG: Files in request: {list(request.FILES.keys())}")
+        logging.debug(f"Upload POST with files: {list(request.FILES.keys())}")
         
         if 'resume' in request.FILES:
             resume_file = request.FILES['resume']
-            print(f"DEBUG: Resume file found: {resume_file.name}")
+            logging.debug(f"Resume file found: {resume_file.name}")
             
             # Save file temporarily
             file_path = os.path.join('media', 'resumes', resume_file.name)
@@ -37,56 +49,66 @@ def upload_resume(request):
                 for chunk in resume_file.chunks():
                     destination.write(chunk)
             
-            print(f"DEBUG: File saved to: {file_path}")
+            logging.debug(f"File saved to: {file_path}")
             
-            # Initialize RAG pipeline
-            if rag_service.initialize_rag(file_path):
-                print(f"DEBUG: RAG pipeline initialized successfully")
+            # Initialize RAG pipeline; a re-upload re-indexes only what changed
+            if not request.session.session_key:
+                request.session.save()
+            with stage_timer("upload"):
+                initialized = rag_service.initialize_rag(
+                    file_path, previous_hash=request.session.get('resume_hash'),
+                    session_key=request.session.session_key,
+                )
+            if initialized:
+                logging.debug("RAG pipeline initialized successfully")
+                request.session['resume_hash'] = rag_service.current_resume_hash
+                request.session['resume_file'] = file_path
+                # Most users open the skills gap next; analyse the likeliest roles while idle
+                rag_service.schedule_precompute(
+                    rag_service.current_resume_hash, suggest_career_paths(rag_service.current_resume_data)
+                )
+                UPLOADS.inc("rag")
                 messages.success(request, 'Resume uploaded and AI analysis initialized successfully!')
                 return redirect('career_advisor:analyze_resume')
             else:
-                print(f"DEBUG: RAG pipeline failed, trying fallback")
+                logging.debug("RAG pipeline failed, trying fallback")
                 # Fallback to basic parsing if RAG fails
                 try:
-                    import sys
-                    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-                    from utils.pdf_parser import extract_text_from_pdf
-                    from utils.resume_parser import parse_resume
+                    resume_hash, parsed_data, stored = rag_service.ingest_resume(file_path)
                     
-                    raw_text = extract_text_from_pdf(file_path)
-                    parsed_data = parse_resume(raw_text)
+                    # Keep the parse in the session only if the store is unavailable
+                    if not stored:
+                        request.session['resume_data'] = parsed_data
                     
                     # Store in session for analysis
-                    request.session['resume_data'] = parsed_data
+                    request.session['resume_hash'] = resume_hash
                     request.session['resume_file'] = file_path
                     
-                    print(f"DEBUG: Fallback parsing successful")
+                    logging.debug("Fallback parsing successful")
+                    UPLOADS.inc("basic")
                     messages.warning(request, 'Resume uploaded with basic analysis. AI features may be limited.')
                     return redirect('career_advisor:analyze_resume')
                     
                 except Exception as e:
-                    print(f"DEBUG: Error in fallback parsing: {e}")
+                    logging.error(f"Error in fallback parsing: {e}")
+                    UPLOADS.inc("error")
                     messages.error(request, f'Error processing resume: {str(e)}')
                     return redirect('career_advisor:home')
         else:
-            print(f"DEBUG: No resume file in request")
+            logging.debug("No resume file in request")
             messages.error(request, 'No resume file uploaded.')
             return redirect('career_advisor:upload_resume')
     
-    print(f"DEBUG: GET request, rendering upload form")
     return render(request, 'career_advisor/upload.html')
 
 def analyze_resume(request):
     """Show resume analysis"""
-    # Try to get data from RAG service first
-    resume_data = rag_service.get_resume_data()
+    # Try to get data from RAG service first, then session/store
+    resume_data = get_resume_data(request)
     
     if not resume_data:
-        # Fallback to session data
-        resume_data = request.session.get('resume_data')
-        if not resume_data:
-            messages.warning(request, 'Please upload a resume first.')
-            return redirect('career_advisor:home')
+        messages.warning(request, 'Please upload a resume first.')
+        return redirect('career_advisor:home')
     
     # Get cache info for performance monitoring
     cache_info = rag_service.get_cache_info()
@@ -105,35 +127,41 @@ def analyze_resume(request):
 
 def skills_gap_analysis(request):
     """Skills gap analysis view"""
-    resume_data = rag_service.get_resume_data() or request.session.get('resume_data')
+    resume_data = get_resume_data(request)
     if not resume_data:
         messages.warning(request, 'Please upload a resume first.')
         return redirect('career_advisor:home')
     
     if request.method == 'POST':
         target_role = request.POST.get('target_role', 'Data Scientist')
+        start = time.perf_counter()
         
-        # Try RAG-based analysis first
-        if rag_service.is_available():
-            analysis = rag_service.analyze_skills_gap_rag(target_role)
-            if 'error' not in analysis:
-                # RAG analysis successful
-                context = {
-                    'resume_data': resume_data,
-                    'analysis': analysis,
-                    'target_role': target_role,
-                    'rag_used': True,
-                }
-                return render(request, 'career_advisor/skills_gap.html', context)
+        # A precomputed (or earlier) AI analysis is returned at once
+        analysis = rag_service.cached_skills_gap(request.session.get('resume_hash'), target_role)
+        if analysis is not None:
+            rag_used, rag_reason = True, 'cached'
+        else:
+            # RAG-based analysis, hedged with the rule-based one
+            analysis, rag_used, rag_reason = rag_service.answer_hedged(
+                lambda budget, abandoned: rag_service.analyze_skills_gap_rag(
+                    target_role, budget_seconds=budget, abandoned=abandoned,
+                    resume_hash=request.session.get('resume_hash'),
+                ),
+                lambda: analyze_skills_gap_fallback(resume_data, target_role),
+            )
         
-        # Fallback to rule-based analysis
-        analysis = analyze_skills_gap_fallback(resume_data, target_role)
+        get_traffic_recorder().record(
+            'skills_gap', request, request.session.get('resume_hash'), time.perf_counter() - start,
+            target_role=target_role, route='rag' if rag_used else 'fallback', reason=rag_reason,
+            cache='hit' if rag_reason == 'cached' else 'miss',
+        )
         
         context = {
             'resume_data': resume_data,
             'analysis': analysis,
             'target_role': target_role,
-            'rag_used': False,
+            'rag_used': rag_used,
+            'rag_reason': rag_reason,
         }
         
         return render(request, 'career_advisor/skills_gap.html', context)
@@ -142,7 +170,7 @@ def skills_gap_analysis(request):
 
 def career_paths(request):
     """Career path suggestions view"""
-    resume_data = rag_service.get_resume_data() or request.session.get('resume_data')
+    resume_data = get_resume_data(request)
     if not resume_data:
         messages.warning(request, 'Please upload a resume first.')
         return redirect('career_advisor:home')
@@ -160,7 +188,7 @@ def career_paths(request):
 
 def career_chat(request):
     """Career advice chat view"""
-    resume_data = rag_service.get_resume_data() or request.session.get('resume_data')
+    resume_data = get_resume_data(request)
     if not resume_data:
         messages.warning(request, 'Please upload a resume first.')
         return redirect('career_advisor:home')
@@ -168,16 +196,17 @@ def career_chat(request):
     if request.method == 'POST':
         question = request.POST.get('question', '')
         if question:
-            # Try RAG-based response first
-            if rag_service.is_available():
-                rag_response = rag_service.get_career_advice(question)
-                if 'error' not in rag_response:
-                    answer = rag_response.get('answer', 'I apologize, but I couldn\'t generate a response.')
-                    return JsonResponse({'answer': answer, 'rag_used': True})
-            
-            # Fallback to rule-based response
-            answer = get_career_advice_fallback(question, resume_data)
-            return JsonResponse({'answer': answer, 'rag_used': False})
+            start = time.perf_counter()
+            # Checked first, since answering caches the question's embedding
+            cache = rag_service.query_cache_outcome(question)
+            with stage_timer("chat"):
+                payload, route = answer_chat_question(question, resume_data)
+            CHAT_REQUESTS.inc(route)
+            get_traffic_recorder().record(
+                'chat', request, request.session.get('resume_hash'), time.perf_counter() - start,
+                question=question, route=route, intent=payload.get('intent'), cache=cache,
+            )
+            return JsonResponse(payload)
     
     context = {
         'resume_data': resume_data,
@@ -185,9 +214,27 @@ def career_chat(request):
     }
     return render(request, 'career_advisor/chat.html', context)
 
+def answer_chat_question(question, resume_data):
+    """Answer a chat question; returns the JSON payload and the route that answered it"""
+    # Answer FAQ-style questions from templates without running the LLM
+    route = rag_service.route_question(question)
+    if route:
+        intent, _ = route
+        answer = answer_for_intent(intent, resume_data, question)
+        if answer is not None:
+            return {'answer': answer, 'rag_used': False, 'intent': intent}, 'intent'
+    
+    # RAG-based response, hedged with the rule-based one
+    response, rag_used, rag_reason = rag_service.answer_hedged(
+        lambda budget, abandoned: rag_service.get_career_advice(question, budget_seconds=budget, abandoned=abandoned),
+        lambda: {'answer': get_career_advice_fallback(question, resume_data)},
+    )
+    answer = response.get('answer', 'I apologize, but I couldn\'t generate a response.')
+    return {'answer': answer, 'rag_used': rag_used, 'rag_reason': rag_reason}, 'rag' if rag_used else 'fallback'
+
 def learning_roadmap(request):
     """Learning roadmap view"""
-    resume_data = rag_service.get_resume_data() or request.session.get('resume_data')
+    resume_data = get_resume_data(request)
     if not resume_data:
         messages.warning(request, 'Please upload a resume first.')
         return redirect('career_advisor:home')
@@ -207,34 +254,94 @@ def performance_status(request):
     """Show RAG performance and caching status"""
     cache_info = rag_service.get_cache_info()
     
+    if request.GET.get('format') == 'json':
+        return JsonResponse(cache_info)
+    
     context = {
         'cache_info': cache_info,
         'rag_available': rag_service.is_available(),
+        'show_memory_debug': settings.DEBUG or request.user.is_staff,
     }
     
     return render(request, 'career_advisor/performance.html', context)
 
+def memory_debug(request):
+    """List the largest cached pipelines and model footprints (DEBUG or staff only)"""
+    if not (settings.DEBUG or request.user.is_staff):
+        raise Http404
+    
+    try:
+        limit = int(request.GET.get('limit', 20))
+    except ValueError:
+        limit = 20
+    return JsonResponse(rag_service.get_memory_info(limit=limit))
+
+def profile_list(request):
+    """List saved request profiles (DEBUG or staff only)"""
+    if not (settings.DEBUG or request.user.is_staff):
+        raise Http404
+    
+    profiles = get_profile_store().list()
+    for profile in profiles:
+        profile['download_url'] = reverse('career_advisor:profile_download', args=[profile['name']])
+    return JsonResponse({'enabled': getattr(settings, 'PROFILING_ENABLED', False), 'profiles': profiles})
+
+def profile_download(request, name):
+    """Download a saved profile, or view it as a pstats report with ?format=text"""
+    if not (settings.DEBUG or request.user.is_staff):
+        raise Http404
+    
+    store = get_profile_store()
+    if request.GET.get('format') == 'text':
+        report = store.summary(name, sort=request.GET.get('sort', 'cumulative'))
+        if report is None:
+            raise Http404
+        return HttpResponse(report, content_type='text/plain; charset=utf-8')
+    
+    path = store.open_path(name)
+    if path is None:
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
+
+def ready(request):
+    """Readiness probe: 503 until this worker's models are warm when prewarming is enabled"""
+    prewarm_required = getattr(settings, 'PREWARM_ON_STARTUP', False) or getattr(settings, 'PREFORK_MODELS', False)
+    is_ready = rag_service.readiness == 'ready' or not prewarm_required
+    payload = {
+        'ready': is_ready,
+        'state': rag_service.readiness,
+        'error': rag_service.readiness_error,
+    }
+    response = JsonResponse(payload, status=200 if is_ready else 503)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+def metrics(request):
+    """Prometheus scrape endpoint"""
+    return HttpResponse(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 # Fallback functions (when RAG is not available)
 def analyze_skills_gap_fallback(resume_data, target_role):
     """Analyze skills gap for a specific role (fallback)"""
-    role_skills = {
-        "data scientist": ["Python", "SQL", "Machine Learning", "Statistics", "Data Visualization"],
-        "software engineer": ["Programming", "Data Structures", "Algorithms", "System Design", "Testing"],
-        "product manager": ["Product Strategy", "User Research", "Data Analysis", "Leadership", "Agile"],
-        "data analyst": ["SQL", "Excel", "Python", "Data Visualization", "Statistical Analysis"],
-        "ml engineer": ["Python", "Machine Learning", "Deep Learning", "MLOps", "Data Engineering"]
-    }
-    
-    target_skills = role_skills.get(target_role.lower(), [])
-    current_skills = set(resume_data.get("skills", []))
-    
-    # Find missing skills
-    missing_skills = [skill for skill in target_skills if skill.lower() not in current_skills]
+    catalog = get_role_catalog()
+    resume_vector = catalog.encode_ids(get_skill_features(resume_data)["skill_ids"])
+    current_skills = list(dict.fromkeys(resume_data.get("skills", [])))
+    
+    role = catalog.find_role(target_role)
+    if role is None:
+        missing_skills = []
+        coverage = None
+    else:
+        # Find missing skills
+        missing_skills = catalog.missing_skills(resume_vector, role)
+        coverage = round(float(catalog.coverage(resume_vector)[1][role]) * 100)
     
     return {
         "target_role": target_role,
-        "current_skills": list(current_skills),
+        "current_skills": current_skills,
         "missing_skills": missing_skills,
+        "coverage": coverage,
+        "closest_roles": catalog.rank_roles(resume_vector, top_k=3),
         "recommendations": generate_skill_recommendations(missing_skills)
     }
 
@@ -259,19 +366,19 @@ def generate_skill_recommendations(missing_skills):
 
 def suggest_career_paths(resume_data):
     """Suggest potential career paths based on current skills"""
-    skills = set(resume_data.get("skills", []))
+    keywords = get_skill_features(resume_data)["keywords"]
     
     career_paths = []
-    if any("python" in skill.lower() for skill in skills):
+    if "python" in keywords:
         career_paths.append("Data Scientist")
         career_paths.append("Software Engineer")
-    if any("sql" in skill.lower() for skill in skills):
+    if "sql" in keywords:
         career_paths.append("Data Analyst")
         career_paths.append("Business Intelligence Developer")
-    if any("machine learning" in skill.lower() for skill in skills):
+    if "machine learning" in keywords:
         career_paths.append("ML Engineer")
         career_paths.append("AI Researcher")
-    if any("java" in skill.lower() for skill in skills):
+    if "java" in keywords:
         career_paths.append("Java Developer")
         career_paths.append("Android Developer")
         
@@ -288,12 +395,12 @@ def get_career_advice_fallback(question, resume_data):
         return "Great question! Use Career Path Suggestions to see what career paths align with your current skills and background."
     
     elif "resume" in question_lower:
-        skills_count = len(resume_data.get('skills', []))
+        skills_count = get_skill_features(resume_data)['skills_count']
         projects_count = len(resume_data.get('projects', []))
         return f"Your resume shows {skills_count} skills and {projects_count} projects. You're well-positioned for tech roles!"
     
     elif "python" in question_lower:
-        if any("python" in skill.lower() for skill in resume_data.get("skills", [])):
+        if "python" in get_skill_features(resume_data)["keywords"]:
             return "Great! You already have Python skills. Consider building more projects and learning advanced topics like Django, Flask, or data science libraries."
         else:
             return "Python is a great skill to add! Start with basic syntax, then move to web development or data science depending on your interests."
@@ -301,9 +408,48 @@ def get_career_advice_fallback(question, resume_data):
     else:
         return "I'm here to help with your career! You can ask me about skills, career paths, resume improvement, or use the interactive features above."
 
+def answer_for_intent(intent, resume_data, question=""):
+    """Templated, resume-aware answer for a routed chat intent, or None to let RAG answer"""
+    features = get_skill_features(resume_data)
+    
+    if intent == "skills_gap":
+        # Only a question that names a catalog role has a templated answer
+        catalog = get_role_catalog()
+        role = catalog.find_role(question)
+        if role is None:
+            return None
+        resume_vector = catalog.encode_ids(features["skill_ids"])
+        role_name = catalog.role_names[role]
+        missing = catalog.missing_skills(resume_vector, role)
+        if not missing:
+            return (f"Your skills fully cover the core requirements for {role_name}. "
+                    f"Use Skills Gap Analysis to check a more senior or different target role.")
+        matched = len(catalog.matched_skills(resume_vector, role))
+        return (f"For {role_name} you have {matched} of {matched + len(missing)} core skills. "
+                f"To close the gap, focus on: {', '.join(missing)}. "
+                f"Use Skills Gap Analysis for a detailed plan.")
+    
+    elif intent == "career_paths":
+        paths = suggest_career_paths(resume_data)
+        return (f"Based on your skills, good career paths for you are: {', '.join(paths)}. "
+                f"Open Career Path Suggestions to explore each one.")
+    
+    elif intent == "resume_summary":
+        skills = resume_data.get('skills', [])
+        summary = (f"Your resume shows {features['skills_count']} skills, "
+                   f"{len(resume_data.get('projects', []))} projects, "
+                   f"{len(resume_data.get('education', []))} education entries and "
+                   f"{len(resume_data.get('experience', []))} experience entries.")
+        if skills:
+            summary += f" Key skills include {', '.join(skills[:5])}."
+        return summary
+    
+    # No template for this intent; the question goes to RAG
+    return None
+
 def generate_learning_roadmap(resume_data):
     """Generate learning roadmap based on skills"""
-    skills = set(resume_data.get("skills", []))
+    keywords = get_skill_features(resume_data)["keywords"]
     
     roadmap = {
         "python_path": [],
@@ -312,7 +458,7 @@ def generate_learning_roadmap(resume_data):
         "general": []
     }
     
-    if any("python" in skill.lower() for skill in skills):
+    if "python" in keywords:
         roadmap["python_path"] = [
             "Advanced Python (Decorators, Generators)",
             "Web Development (Django/Flask)",
@@ -320,7 +466,7 @@ def generate_learning_roadmap(resume_data):
             "Machine Learning (Scikit-learn)"
         ]
     
-    if any("java" in skill.lower() for skill in skills):
+    if "java" in keywords:
         roadmap["java_path"] = [
             "Advanced Java (Collections, Streams)",
             "Spring Framework",
@@ -328,7 +474,7 @@ def generate_learning_roadmap(resume_data):
             "Cloud Deployment (AWS/Azure)"
         ]
     
-    if any("sql" in skill.lower() for skill in skills):
+    if "sql" in keywords:
         roadmap["data_path"] = [
             "Advanced SQL (Window Functions)",
             "Data Visualization (Tableau, Power BI)",
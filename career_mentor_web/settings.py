@@ -47,6 +47,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'career_advisor.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -126,6 +127,31 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Role catalog used by the rule-based skills gap analysis
+ROLE_CATALOG_PATH = os.path.join(BASE_DIR, 'data', 'role_catalog.json')
+
+# Load and warm up the models when a worker starts; /ready returns 503 until done.
+# Set SAHAY_MODEL_DIR to load them from local snapshots (see `manage.py prewarm --save-to`).
+PREWARM_ON_STARTUP = os.environ.get('SAHAY_PREWARM', '') == '1'
+
+# Load the models in the gunicorn master and share them with workers (see gunicorn.conf.py)
+PREFORK_MODELS = os.environ.get('SAHAY_PREFORK', '') == '1'
+
+# Request profiling (off by default). When enabled, staff requests carrying the
+# X-Sahay-Profile header and a random sample of requests run under cProfile.
+PROFILING_ENABLED = os.environ.get('SAHAY_PROFILING', '') == '1'
+PROFILING_SAMPLE_RATE = float(os.environ.get('SAHAY_PROFILING_SAMPLE_RATE', '0'))
+PROFILING_HEADER = 'X-Sahay-Profile'
+PROFILING_PATHS = ('/chat/', '/skills-gap/', '/upload/', '/analyze/')
+PROFILING_DIR = os.path.join(BASE_DIR, 'profiles')
+PROFILING_MAX_FILES = 50
+PROFILING_MAX_BYTES = 50 * 1024 * 1024
+
+# Traffic recording (off by default): anonymised chat and skills-gap requests are
+# appended to a JSONL log that benchmarks/replay.py can play back.
+TRAFFIC_LOG_ENABLED = os.environ.get('SAHAY_TRAFFIC_LOG', '') == '1'
+TRAFFIC_LOG_PATH = os.path.join(BASE_DIR, 'logs', 'traffic.jsonl')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -0,0 +1,22 @@
+"""
+pytest setup: make the project, src and the benchmark stubs importable the way
+manage.py and the app do, and configure Django for tests that import the app.
+"""
+
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+for path in (BASE_DIR, os.path.join(BASE_DIR, "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "career_mentor_web.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+# A manual script for parsing a local resume, not a test module
+collect_ignore = [os.path.join("src", "utils", "local_test.py")]
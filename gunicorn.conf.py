@@ -0,0 +1,25 @@
+# Gunicorn settings, read automatically when gunicorn starts from the project root.
+#
+# Set SAHAY_PREFORK=1 to load the models once in the master and share them
+# copy-on-write with every worker (see career_advisor/prefork.py). Without it
+# each worker loads its own copy on first use.
+import os
+
+prefork = os.environ.get("SAHAY_PREFORK", "") == "1"
+
+workers = int(os.environ.get("WEB_CONCURRENCY", "3"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+preload_app = prefork
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before workers are forked
+    if prefork:
+        from career_advisor.prefork import prepare_for_fork
+        prepare_for_fork()
+
+
+def post_fork(server, worker):
+    if prefork:
+        from career_advisor.prefork import after_fork
+        after_fork(server.cfg.workers)
@@ -0,0 +1 @@
+"""Local inference daemon shared by all web workers, and its client"""
@@ -0,0 +1,203 @@
+"""
+Client for the local model server (server.py).
+
+Each web worker keeps a small pool of connections to the daemon. A connection
+goes back into the pool only after a complete request/response exchange; one
+that failed or timed out mid-frame is closed, since its stream is no longer in
+step with the server.
+"""
+
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from . import protocol
+except ImportError:
+    # Fallback for when running directly
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from model_server import protocol
+
+SOCKET_ENV = "SAHAY_MODEL_SERVER"
+POOL_SIZE_ENV = "SAHAY_MODEL_SERVER_POOL"
+TIMEOUT_ENV = "SAHAY_MODEL_SERVER_TIMEOUT"
+
+
+class ModelServerError(Exception):
+    """The model server could not be reached or rejected the request"""
+
+
+class ModelClient:
+    """Pooled connections to the model server, with a timeout on every call"""
+
+    def __init__(self, socket_path: str, pool_size: int = 4, timeout: float = 60.0, connect_timeout: float = 2.0):
+        self.socket_path = socket_path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._pool = queue.LifoQueue()
+        self._open = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.connect_timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise ModelServerError(f"cannot connect to model server at {self.socket_path}: {e}")
+        return sock
+
+    def _acquire(self, timeout: float) -> socket.socket:
+        if os.getpid() != self._pid:
+            # Forked: the inherited sockets belong to the parent's conversations
+            self._reset()
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._open < self.pool_size
+            if create:
+                self._open += 1
+        if create:
+            try:
+                return self._connect()
+            except ModelServerError:
+                self._discard(None)
+                raise
+        try:
+            return self._pool.get(timeout=timeout)
+        except queue.Empty:
+            raise ModelServerError(f"no free model server connection after {timeout:.2f}s")
+
+    def _discard(self, sock: Optional[socket.socket]):
+        if sock is not None:
+            sock.close()
+        with self._lock:
+            self._open -= 1
+
+    def call(self, op: int, payload: bytes = b"", timeout: Optional[float] = None) -> bytes:
+        """Send one request and return the response payload, within timeout seconds (default self.timeout)"""
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        sock = self._acquire(timeout)
+        try:
+            # Waiting for a free connection counts against the same timeout
+            sock.settimeout(max(deadline - time.monotonic(), 0.001))
+            protocol.send_frame(sock, op, payload)
+            status, body = protocol.recv_frame(sock)
+        except (OSError, protocol.ProtocolError) as e:
+            self._discard(sock)
+            raise ModelServerError(f"model server request failed: {e}")
+        self._pool.put(sock)
+        if status != protocol.STATUS_OK:
+            raise ModelServerError(body.decode("utf-8", "replace"))
+        return body
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return protocol.unpack_vectors(self.call(protocol.OP_EMBED, protocol.pack_strings(texts)))
+
+    def generate(self, prompt: str, max_new_tokens: int = 64, timeout: Optional[float] = None) -> Tuple[str, int]:
+        """Generated continuation of prompt and its token count"""
+        payload = protocol.pack_generate(prompt, max_new_tokens)
+        return protocol.unpack_generated(self.call(protocol.OP_GENERATE, payload, timeout))
+
+    def info(self, timeout: float = 5.0) -> Dict:
+        return protocol.unpack_json(self.call(protocol.OP_INFO, timeout=timeout))
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._pool.get_nowait())
+            except queue.Empty:
+                return
+
+
+class WordTokenizer:
+    """Whitespace tokenizer for a server that names no tokenizer (the stub backend).
+
+    Ids are assigned to words as they are first seen.
+    """
+
+    eos_token_id = None
+
+    def __init__(self):
+        self.vocab: Dict[str, int] = {}
+        self.words: List[str] = []
+        self._lock = threading.Lock()
+
+    def encode(self, text: str) -> List[int]:
+        with self._lock:
+            for word in text.split():
+                if word not in self.vocab:
+                    self.vocab[word] = len(self.words)
+                    self.words.append(word)
+            return [self.vocab[word] for word in text.split()]
+
+    def decode(self, ids, skip_special_tokens: bool = False) -> str:
+        return " ".join(self.words[i] for i in ids)
+
+
+class RemoteGenerator:
+    """Stands in for a transformers text-generation pipeline, running on the model server"""
+
+    task = "text-generation"
+    # No local model, so CareerRAGPipeline sends prompt text; it loads model_name's tokenizer when this is None
+    model = None
+    tokenizer = None
+
+    def __init__(self, client: ModelClient, max_new_tokens: int = 64, model_name: Optional[str] = "microsoft/DialoGPT-small"):
+        self.client = client
+        self.max_new_tokens = max_new_tokens
+        # Whose tokenizer the app loads locally to count prompt tokens; None to count words
+        self.model_name = model_name
+        if model_name is None:
+            self.tokenizer = WordTokenizer()
+
+    def __call__(self, prompts, **kwargs):
+        """timeout (seconds, optional) bounds each generation, e.g. to what is left of an answer's budget"""
+        max_new_tokens = kwargs.get("max_new_tokens", self.max_new_tokens)
+        timeout = kwargs.get("timeout")
+        single = isinstance(prompts, str)
+        outputs = []
+        for prompt in [prompts] if single else prompts:
+            # The pipeline counts the answer's tokens itself
+            text, _ = self.client.generate(prompt, max_new_tokens, timeout=timeout)
+            # Prompt included, like a transformers pipeline by default; the caller strips it
+            outputs.append([{"generated_text": prompt + text}])
+        return outputs[0] if single else outputs
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_model_client() -> Optional[ModelClient]:
+    """Shared client when SAHAY_MODEL_SERVER names a socket, otherwise None"""
+    global _client
+    socket_path = os.environ.get(SOCKET_ENV)
+    if not socket_path:
+        return None
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ModelClient(
+                    socket_path,
+                    pool_size=int(os.environ.get(POOL_SIZE_ENV, "4")),
+                    timeout=float(os.environ.get(TIMEOUT_ENV, "60")),
+                )
+                logging.info(f"Using the model server at {socket_path}")
+    return _client
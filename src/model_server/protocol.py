@@ -0,0 +1,124 @@
+"""
+Binary framing for the local model server.
+
+Every message is a 5-byte header (op or status: uint8, payload length: uint32,
+network byte order) followed by the payload. Strings are a uint32 length plus
+UTF-8 bytes. Embeddings travel as raw little-endian float32, so a batch of
+vectors costs 4 bytes per dimension and no parsing.
+"""
+
+import json
+import socket
+import struct
+from typing import List, Tuple
+
+import numpy as np
+
+# Request ops
+OP_EMBED = 1
+OP_GENERATE = 2
+OP_INFO = 3
+
+# Response statuses
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+HEADER = struct.Struct("!BI")
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+_U32 = struct.Struct("!I")
+_GENERATE = struct.Struct("!H")
+
+
+class ProtocolError(Exception):
+    """Malformed or truncated frame"""
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("connection closed mid-frame")
+        received += count
+    return bytes(buffer)
+
+
+def send_frame(sock: socket.socket, code: int, payload: bytes = b""):
+    sock.sendall(HEADER.pack(code, len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[int, bytes]:
+    code, length = HEADER.unpack(recv_exact(sock, HEADER.size))
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"payload of {length} bytes exceeds the {MAX_PAYLOAD} byte limit")
+    return code, recv_exact(sock, length) if length else b""
+
+
+def pack_strings(texts: List[str]) -> bytes:
+    parts = [_U32.pack(len(texts))]
+    for text in texts:
+        data = text.encode("utf-8")
+        parts.append(_U32.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def unpack_strings(payload: bytes, offset: int = 0) -> Tuple[List[str], int]:
+    try:
+        (count,) = _U32.unpack_from(payload, offset)
+        offset += _U32.size
+        texts = []
+        for _ in range(count):
+            (length,) = _U32.unpack_from(payload, offset)
+            offset += _U32.size
+            texts.append(payload[offset:offset + length].decode("utf-8"))
+            offset += length
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ProtocolError(f"bad string list: {e}")
+    return texts, offset
+
+
+def pack_vectors(vectors: np.ndarray) -> bytes:
+    vectors = np.ascontiguousarray(vectors, dtype="<f4")
+    rows, dim = vectors.shape
+    return _U32.pack(rows) + _U32.pack(dim) + vectors.tobytes()
+
+
+def unpack_vectors(payload: bytes) -> np.ndarray:
+    rows, dim = struct.unpack_from("!II", payload)
+    data = np.frombuffer(payload, dtype="<f4", offset=8)
+    if data.size != rows * dim:
+        raise ProtocolError(f"expected {rows}x{dim} floats, got {data.size}")
+    return data.reshape(rows, dim)
+
+
+def pack_generate(prompt: str, max_new_tokens: int) -> bytes:
+    return _GENERATE.pack(max_new_tokens) + pack_strings([prompt])
+
+
+def unpack_generate(payload: bytes) -> Tuple[str, int]:
+    (max_new_tokens,) = _GENERATE.unpack_from(payload)
+    texts, _ = unpack_strings(payload, _GENERATE.size)
+    if len(texts) != 1:
+        raise ProtocolError("generate expects exactly one prompt")
+    return texts[0], max_new_tokens
+
+
+def pack_generated(text: str, tokens: int) -> bytes:
+    return _U32.pack(tokens) + text.encode("utf-8")
+
+
+def unpack_generated(payload: bytes) -> Tuple[str, int]:
+    (tokens,) = _U32.unpack_from(payload)
+    return payload[_U32.size:].decode("utf-8"), tokens
+
+
+def pack_json(value) -> bytes:
+    return json.dumps(value).encode("utf-8")
+
+
+def unpack_json(payload: bytes):
+    return json.loads(payload.decode("utf-8"))
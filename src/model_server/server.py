@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Local inference daemon: one process owns the embedding and generation models
+and serves every web worker over a Unix domain socket (protocol.py).
+
+Requests from all connections go through one queue per operation. A batcher
+thread drains each queue, waiting at most --max-wait-ms for more requests, so
+concurrent workers share one forward pass instead of taking turns. Generation
+requests are grouped by max_new_tokens, since one batch runs to one length.
+
+Examples:
+    python src/model_server/server.py --socket /run/sahay/models.sock
+    python src/model_server/server.py --stub --socket /tmp/sahay-models.sock
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import logging
+import os
+import queue
+import signal
+import socketserver
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+try:
+    from . import protocol
+    from ..utils.model_paths import resolve_model_path
+except ImportError:
+    # Fallback for when running directly
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from model_server import protocol
+    from utils.model_paths import resolve_model_path
+
+DEFAULT_SOCKET = "/tmp/sahay-models.sock"
+
+
+class TransformersBackend:
+    """The app's real models, configured as RAGService loads them in-process"""
+
+    name = "transformers"
+
+    def __init__(self, embedding_model: str = "all-MiniLM-L6-v2", generation_model: str = "microsoft/DialoGPT-small"):
+        from sentence_transformers import SentenceTransformer
+        from transformers import pipeline
+        import torch
+
+        self.embedder = SentenceTransformer(resolve_model_path(embedding_model))
+        self.generator = pipeline(
+            "text-generation",
+            model=resolve_model_path(generation_model),
+            device=-1,
+            torch_dtype=torch.float32,
+            do_sample=True,
+            temperature=0.7,
+            pad_token_id=50256,
+            low_cpu_mem_usage=True,
+            return_full_text=False,
+        )
+        # Batched prompts of different lengths are padded on the left so generation continues each one
+        self.generator.tokenizer.pad_token_id = 50256
+        self.generator.tokenizer.padding_side = "left"
+        self.info = {
+            "embedding_model": embedding_model,
+            "generation_model": generation_model,
+            # Workers load this tokenizer to budget prompts
+            "tokenizer": generation_model,
+        }
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.embedder.encode(texts, convert_to_numpy=True)
+
+    def generate(self, prompts: List[str], max_new_tokens: int) -> List[Tuple[str, int]]:
+        outputs = self.generator(prompts, max_new_tokens=max_new_tokens, batch_size=len(prompts))
+        results = []
+        for output in outputs:
+            text = output[0]["generated_text"]
+            results.append((text, len(self.generator.tokenizer.encode(text))))
+        return results
+
+
+class StubBackend:
+    """Hash embeddings and a canned reply, for running the server without models"""
+
+    name = "stub"
+
+    def __init__(self, dim: int = 384, token_delay: float = 0.0):
+        self.dim = dim
+        self.token_delay = token_delay
+        # No tokenizer to download: workers fall back to counting words
+        self.info = {"embedding_model": "stub-hash", "generation_model": "stub-echo", "tokenizer": None}
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                digest = hashlib.md5(word.encode("utf-8")).digest()
+                vectors[row, int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def generate(self, prompts: List[str], max_new_tokens: int) -> List[Tuple[str, int]]:
+        words = "Focus on the skills listed for the role and build one project that shows them.".split()
+        reply = words[:max_new_tokens]
+        # One forward pass per token, shared by the whole batch
+        time.sleep(self.token_delay * len(reply))
+        return [(" " + " ".join(reply), len(reply)) for _ in prompts]
+
+
+class Batcher:
+    """Collects requests from all connections and runs them through run_batch together"""
+
+    def __init__(self, name: str, run_batch: Callable[[List], List], max_batch: int, max_wait: float):
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        thread = threading.Thread(target=self._loop, name=f"batcher-{name}", daemon=True)
+        thread.start()
+
+    def submit(self, item):
+        """Queue one request and block until its batch has run"""
+        future = concurrent.futures.Future()
+        self.queue.put((item, future))
+        return future.result()
+
+    def _collect(self) -> List:
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            try:
+                results = self.run_batch([item for item, _ in batch])
+                if len(results) != len(batch):
+                    # Results can't be matched to requests, so none of them is answered
+                    raise RuntimeError(f"returned {len(results)} results for {len(batch)} requests")
+            except Exception as e:
+                logging.error(f"{self.name} batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.items,
+            "batches": self.batches,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued": self.queue.qsize(),
+        }
+
+
+class ModelRequestHandler(socketserver.BaseRequestHandler):
+    """Serves frames on one client connection until the client hangs up"""
+
+    def handle(self):
+        while True:
+            try:
+                op, payload = protocol.recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            except protocol.ProtocolError as e:
+                # The stream can't be resynchronised after a bad header
+                self._send(protocol.STATUS_ERROR, str(e).encode("utf-8"))
+                return
+            try:
+                status, body = protocol.STATUS_OK, self.server.dispatch(op, payload)
+            except Exception as e:
+                status, body = protocol.STATUS_ERROR, str(e).encode("utf-8")
+            if not self._send(status, body):
+                return
+
+    def _send(self, status: int, body: bytes) -> bool:
+        try:
+            protocol.send_frame(self.request, status, body)
+            return True
+        except OSError:
+            return False
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, backend, max_batch: int = 16, max_wait: float = 0.005):
+        if os.path.exists(socket_path):
+            # Left behind by a previous run; binding fails otherwise
+            os.unlink(socket_path)
+        super().__init__(socket_path, ModelRequestHandler)
+        os.chmod(socket_path, 0o660)
+        self.socket_path = socket_path
+        self.backend = backend
+        self.generated_tokens = 0
+        self.started = time.time()
+        self.embed_batcher = Batcher("embed", self._embed_batch, max_batch, max_wait)
+        self.generate_batcher = Batcher("generate", self._generate_batch, max_batch, max_wait)
+
+    def dispatch(self, op: int, payload: bytes) -> bytes:
+        if op == protocol.OP_EMBED:
+            texts, _ = protocol.unpack_strings(payload)
+            return protocol.pack_vectors(self.embed_batcher.submit(texts))
+        if op == protocol.OP_GENERATE:
+            text, tokens = self.generate_batcher.submit(protocol.unpack_generate(payload))
+            return protocol.pack_generated(text, tokens)
+        if op == protocol.OP_INFO:
+            return protocol.pack_json(self.info())
+        raise protocol.ProtocolError(f"unknown op {op}")
+
+    def _embed_batch(self, requests: List[List[str]]) -> List[np.ndarray]:
+        texts = [text for request in requests for text in request]
+        vectors = self.backend.embed(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+        results, start = [], 0
+        for request in requests:
+            results.append(vectors[start:start + len(request)])
+            start += len(request)
+        return results
+
+    def _generate_batch(self, requests: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+        results = [None] * len(requests)
+        by_length: Dict[int, List[int]] = {}
+        for position, (_, max_new_tokens) in enumerate(requests):
+            by_length.setdefault(max_new_tokens, []).append(position)
+        for max_new_tokens, positions in by_length.items():
+            outputs = self.backend.generate([requests[p][0] for p in positions], max_new_tokens)
+            for position, output in zip(positions, outputs):
+                results[position] = output
+                self.generated_tokens += output[1]
+        return results
+
+    def info(self) -> Dict:
+        return {
+            "backend": self.backend.name,
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "generated_tokens": self.generated_tokens,
+            "embed": self.embed_batcher.stats(),
+            "generate": self.generate_batcher.stats(),
+            **self.backend.info,
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=os.environ.get("SAHAY_MODEL_SERVER", DEFAULT_SOCKET),
+                        help=f"Unix socket path (default: $SAHAY_MODEL_SERVER or {DEFAULT_SOCKET})")
+    parser.add_argument("--stub", action="store_true", help="serve stub models instead of loading the real ones")
+    parser.add_argument("--stub-token-delay-ms", type=float, default=0.0,
+                        help="simulated time per generated token with --stub")
+    parser.add_argument("--max-batch", type=int, default=16, help="largest batch per forward pass (default: 16)")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="how long a batch waits for more requests (default: 5)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.stub:
+        backend = StubBackend(token_delay=args.stub_token_delay_ms / 1000)
+    else:
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        backend = TransformersBackend()
+
+    server = ModelServer(args.socket, backend, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000)
+    logging.info(f"Serving {backend.name} models on {args.socket}")
+    # Stop cleanly under a process manager too, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
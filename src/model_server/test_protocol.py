@@ -0,0 +1,142 @@
+import socket
+import struct
+import threading
+
+import numpy as np
+import pytest
+
+from model_server import protocol
+from model_server.client import ModelClient, ModelServerError, RemoteGenerator
+from model_server.server import Batcher, ModelServer, StubBackend
+
+
+def test_frames_round_trip_over_a_socket():
+    left, right = socket.socketpair()
+    with left, right:
+        protocol.send_frame(left, protocol.OP_GENERATE, b"payload")
+        protocol.send_frame(left, protocol.OP_INFO)
+        assert protocol.recv_frame(right) == (protocol.OP_GENERATE, b"payload")
+        assert protocol.recv_frame(right) == (protocol.OP_INFO, b"")
+
+
+def test_oversized_frame_is_rejected():
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(protocol.HEADER.pack(protocol.OP_EMBED, protocol.MAX_PAYLOAD + 1))
+        with pytest.raises(protocol.ProtocolError):
+            protocol.recv_frame(right)
+
+
+def test_truncated_frame_raises_connection_error():
+    left, right = socket.socketpair()
+    with right:
+        left.sendall(protocol.HEADER.pack(protocol.OP_EMBED, 10) + b"short")
+        left.close()
+        with pytest.raises(ConnectionError):
+            protocol.recv_frame(right)
+
+
+def test_strings_round_trip():
+    texts = ["", "plain", "ünïcödé ✓", "x" * 1000]
+    assert protocol.unpack_strings(protocol.pack_strings(texts)) == (texts, len(protocol.pack_strings(texts)))
+
+
+def test_truncated_strings_are_a_protocol_error():
+    with pytest.raises(protocol.ProtocolError):
+        protocol.unpack_strings(protocol.pack_strings(["hello"])[:-8])
+
+
+def test_vectors_round_trip_as_float32():
+    vectors = np.random.default_rng(0).standard_normal((3, 5))
+    unpacked = protocol.unpack_vectors(protocol.pack_vectors(vectors))
+    assert unpacked.dtype == np.float32 and unpacked.shape == (3, 5)
+    np.testing.assert_allclose(unpacked, vectors.astype(np.float32))
+
+
+def test_vectors_with_a_wrong_size_are_rejected():
+    with pytest.raises(protocol.ProtocolError):
+        protocol.unpack_vectors(struct.pack("!II", 2, 4) + b"\0" * 12)
+
+
+def test_generate_messages_round_trip():
+    assert protocol.unpack_generate(protocol.pack_generate("Hi there", 48)) == ("Hi there", 48)
+    assert protocol.unpack_generated(protocol.pack_generated(" an answer ✓", 3)) == (" an answer ✓", 3)
+    assert protocol.unpack_json(protocol.pack_json({"a": [1, None]})) == {"a": [1, None]}
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "models.sock")
+    server = ModelServer(path, StubBackend(dim=8))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_server_round_trip(server):
+    client = ModelClient(server.socket_path, pool_size=2, timeout=5.0)
+    try:
+        vectors = client.embed(["python developer", "data analyst"])
+        assert vectors.shape == (2, 8)
+        np.testing.assert_allclose(vectors, StubBackend(dim=8).embed(["python developer", "data analyst"]))
+        text, tokens = client.generate("Question: what next?", max_new_tokens=4)
+        assert text == " Focus on the skills" and tokens == 4
+        info = client.info()
+        assert info["backend"] == "stub" and info["tokenizer"] is None
+        assert info["generated_tokens"] == 4
+    finally:
+        client.close()
+
+
+def test_server_reports_unknown_ops_as_errors(server):
+    client = ModelClient(server.socket_path, timeout=5.0)
+    try:
+        with pytest.raises(ModelServerError, match="unknown op"):
+            client.call(99)
+        # The connection is still usable after an error response
+        assert client.info()["backend"] == "stub"
+    finally:
+        client.close()
+
+
+def test_generation_timeout_is_enforced(tmp_path):
+    server = ModelServer(str(tmp_path / "slow.sock"), StubBackend(dim=8, token_delay=0.2))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = ModelClient(server.socket_path, timeout=5.0)
+    try:
+        with pytest.raises(ModelServerError):
+            client.generate("slow", max_new_tokens=5, timeout=0.1)
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_remote_generator_counts_words_without_a_tokenizer(server):
+    generator = RemoteGenerator(ModelClient(server.socket_path, timeout=5.0), model_name=None)
+    output = generator("Prompt", max_new_tokens=3, timeout=2.0)
+    assert output == [{"generated_text": "Prompt Focus on the"}]
+    ids = generator.tokenizer.encode("Focus on the skills")
+    assert generator.tokenizer.decode(ids) == "Focus on the skills"
+    assert generator.tokenizer.encode("the Focus") == [ids[2], ids[0]]
+
+
+def test_batcher_fails_every_request_when_results_do_not_line_up():
+    batcher = Batcher("short", lambda items: items[:-1], max_batch=4, max_wait=0.05)
+    results = []
+
+    def submit(item):
+        try:
+            results.append(batcher.submit(item))
+        except RuntimeError as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=submit, args=(item,)) for item in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,65 @@
+import os
+from typing import Any, List
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+# Fix relative imports
+try:
+    from ..utils.lexical_index import hybrid_rank
+    from ..utils.metrics import get_counter
+    from ..utils.vector_index import normalise
+except ImportError:
+    # Fallback for when running directly
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.lexical_index import hybrid_rank
+    from utils.metrics import get_counter
+    from utils.vector_index import normalise
+
+RETRIEVALS = get_counter(
+    "sahay_retrievals_total", "Retriever queries by path: lexical (BM25 only), filled (BM25 hits topped up by dense) or hybrid.", ("path",)
+)
+
+
+class HybridRetriever(BaseRetriever):
+    """BM25 fused with vector similarity over the same chunks.
+
+    Chunk i of the lexical index and the chunk store is vector i of the vector
+    index (utils.vector_index). When BM25 alone is decisive and matches k
+    chunks the query is never embedded.
+    """
+
+    index: Any
+    embeddings: Any
+    lexical_index: Any
+    chunk_store: Any
+    k: int = 3
+    alpha: float = 0.5
+    min_lexical_score: float = 1.0
+    lexical_margin: float = 1.5
+
+    def _dense_scores(self, query: str) -> np.ndarray:
+        return self.index.similarities(normalise(self.embeddings.embed_query(query)))
+
+    def retrieve_ids(self, query: str) -> List[int]:
+        """Ids of the best chunks for the query, best first, without their text"""
+        chunk_ids, path = hybrid_rank(
+            self.lexical_index.scores(query),
+            lambda: self._dense_scores(query),
+            self.k,
+            alpha=self.alpha,
+            min_lexical_score=self.min_lexical_score,
+            lexical_margin=self.lexical_margin,
+        )
+        RETRIEVALS.inc(path)
+        return chunk_ids
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        # Documents feed the prompt, so this is where chunk text is materialised
+        return [
+            Document(page_content=self.chunk_store.chunk_text(chunk_id), metadata=self.chunk_store.reference(chunk_id))
+            for chunk_id in self.retrieve_ids(query)
+        ]
@@ -0,0 +1,111 @@
+"""
+Query embedding cache shared by every resume's retriever.
+
+Chat questions repeat a lot, and the built-in question templates are known
+up front, so query vectors are memoised rather than recomputed per request.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from langchain.embeddings.base import Embeddings
+except ImportError:
+    # Only the base class is used; the cache itself doesn't need langchain
+    Embeddings = object
+
+try:
+    from ..utils.metrics import get_counter
+except ImportError:
+    # Fallback for when running directly
+    from utils.metrics import get_counter
+
+
+QUERY_CACHE_REQUESTS = get_counter(
+    "sahay_query_embedding_cache_total", "Query embedding lookups by result.", ("result",)
+)
+
+
+class CachedEmbeddings(Embeddings):
+    """Memoises embed_query in a bounded LRU keyed by normalised question text.
+
+    Vectors added with precompute() (the built-in question templates) are kept
+    outside the LRU and never evicted. Document embedding is passed through.
+    """
+
+    def __init__(self, base, max_entries=1024):
+        self.base = base
+        self.max_entries = max_entries
+        self._lru = OrderedDict()
+        self._pinned = {}
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        return self.base.model
+
+    @property
+    def model_name(self):
+        return self.base.model_name
+
+    @staticmethod
+    def normalise(text):
+        # all-MiniLM-L6-v2's tokenizer is uncased, so case and spacing don't change the vector
+        return " ".join(text.split()).lower()
+
+    def embed_documents(self, texts):
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text):
+        key = self.normalise(text)
+        with self._lock:
+            vector = self._pinned.get(key)
+            if vector is None:
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+        if vector is not None:
+            QUERY_CACHE_REQUESTS.inc("hit")
+            return vector.tolist()
+
+        QUERY_CACHE_REQUESTS.inc("miss")
+        vector = np.asarray(self.base.embed_query(text), dtype=np.float32)
+        with self._lock:
+            self._lru[key] = vector
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+        return vector.tolist()
+
+    def is_cached(self, text):
+        """Whether embed_query(text) would be answered from the cache"""
+        key = self.normalise(text)
+        with self._lock:
+            return key in self._pinned or key in self._lru
+
+    def precompute(self, texts):
+        """Embed texts in one batch and pin them in the cache"""
+        keys = dict.fromkeys(self.normalise(text) for text in texts)
+        with self._lock:
+            keys = [key for key in keys if key not in self._pinned]
+        if keys:
+            # Embedded outside the lock, so queries aren't held up by the batch
+            vectors = np.asarray(self.base.embed_documents(keys), dtype=np.float32)
+            with self._lock:
+                self._pinned.update(zip(keys, vectors))
+        return len(keys)
+
+    def cache_stats(self):
+        with self._lock:
+            entries, pinned = len(self._lru), len(self._pinned)
+        counts = dict(QUERY_CACHE_REQUESTS.samples())
+        hits, misses = counts.get(("hit",), 0), counts.get(("miss",), 0)
+        return {
+            "entries": entries,
+            "pinned": pinned,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(100 * hits / (hits + misses), 1) if hits + misses else 0.0,
+        }
@@ -1,40 +1,100 @@
-from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
-from langchain_community.llms import HuggingFacePipeline
-from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
+from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM, StoppingCriteria, StoppingCriteriaList
 import torch
 import os
+import time
 import logging
+from collections import deque
+from functools import lru_cache
 
 # Fix relative import
 try:
     from .retriever import build_retriever
+    from ..utils.generation_budget import (
+        BUDGET_OUTCOMES, DeadlineTracker, default_budget_seconds, ends_sentence, get_rate_estimator,
+        trim_to_sentence
+    )
+    from ..utils.metrics import get_counter, stage_timer
+    from ..utils.memory import text_bytes
+    from ..utils.model_paths import resolve_model_path
+    from ..utils.prompt_packing import PromptPacker, SentenceTokens
 except ImportError:
     # Fallback for when running directly
     import sys
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from rag.retriever import build_retriever
+    from utils.generation_budget import (
+        BUDGET_OUTCOMES, DeadlineTracker, default_budget_seconds, ends_sentence, get_rate_estimator,
+        trim_to_sentence
+    )
+    from utils.metrics import get_counter, stage_timer
+    from utils.memory import text_bytes
+    from utils.model_paths import resolve_model_path
+    from utils.prompt_packing import PromptPacker, SentenceTokens
+
+
+# Built-in analysis question; its query embeddings are precomputed for known roles
+SKILLS_GAP_QUESTION = "What skills do I need to develop to become a {role}?"
+
+# Prompt and answer budgets in generator tokens; DialoGPT's window is 1024
+PROMPT_TOKENS = int(os.environ.get("SAHAY_PROMPT_TOKENS", "384"))
+ANSWER_TOKENS = int(os.environ.get("SAHAY_ANSWER_TOKENS", "96"))
+# Chat turns kept per pipeline; older ones would not fit the prompt's history share anyway
+HISTORY_TURNS = int(os.environ.get("SAHAY_HISTORY_TURNS", "8"))
+GENERATION_KWARGS = {"do_sample": True, "temperature": 0.7}
+
+PROMPT_SENTENCES = get_counter(
+    "sahay_prompt_sentences_total", "Retrieved sentences by whether they fit the prompt budget.", ("result",)
+)
+
+
+@lru_cache(maxsize=None)
+def _load_tokenizer(model_name: str):
+    return AutoTokenizer.from_pretrained(resolve_model_path(model_name))
+
+
+def generator_tokenizer(generator):
+    """The generator's tokenizer; loaded locally when the model runs on the model server"""
+    tokenizer = getattr(generator, "tokenizer", None)
+    if tokenizer is None:
+        tokenizer = _load_tokenizer(getattr(generator, "model_name", "microsoft/DialoGPT-small"))
+    return tokenizer
+
+
+class DeadlineStopping(DeadlineTracker, StoppingCriteria):
+    """DeadlineTracker as a transformers stopping criterion, called once per generated token"""
+
+    def __init__(self, tokenizer, prompt_length: int, deadline: float, max_new_tokens: int, cancel=None):
+        super().__init__(tokenizer, deadline, max_new_tokens, cancel=cancel)
+        self.prompt_length = prompt_length
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self.step(input_ids.shape[-1] - self.prompt_length, input_ids[0, -1:])
+
 
 class CareerRAGPipeline:
-    def __init__(self, pdf_path: str, cached_model=None, use_optimized=True):
-        self.retriever = build_retriever(pdf_path)
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history", return_messages=True
+    def __init__(self, pdf_path: str, cached_model=None, use_optimized=True, resume_data=None, previous=None):
+        # previous: the pipeline for an earlier version of this resume, whose unchanged chunks aren't re-embedded
+        self.retriever = build_retriever(
+            pdf_path, resume_data=resume_data, previous=getattr(previous, "retriever", None)
         )
+        # Finished turns as (question, answer, token ids), most recent last
+        self.history = deque(maxlen=HISTORY_TURNS)
         
         # Initialize LLM for career guidance - CPU optimized
         if cached_model:
-            self.llm = HuggingFacePipeline(pipeline=cached_model)
+            self.generator = cached_model
             logging.info("Using cached optimized model for fast responses!")
         else:
-            self.llm = self._setup_llm(use_optimized)
-
-        # Build conversation chain
-        self.chain = ConversationalRetrievalChain.from_llm(
-            llm=self.llm,
-            retriever=self.retriever,
-            memory=self.memory,
-            return_source_documents=True,
+            self.generator = self._setup_llm(use_optimized)
+
+        # Every chunk sentence is tokenized now, so prompts are assembled from token ids
+        self.tokenizer = generator_tokenizer(self.generator)
+        self.packer = PromptPacker(
+            self.tokenizer,
+            SentenceTokens(self.retriever.chunk_store, self.tokenizer),
+            prompt_tokens=PROMPT_TOKENS,
+            answer_tokens=ANSWER_TOKENS,
+            max_positions=getattr(self.tokenizer, "model_max_length", None),
         )
 
     def _setup_llm(self, use_optimized=True):
@@ -61,10 +121,10 @@ class CareerRAGPipeline:
             
             qa_pipeline = pipeline(
                 "text-generation",
-                model=model_name,
+                model=resolve_model_path(model_name),
                 device=-1,  # Force CPU
                 torch_dtype=torch.float32,  # Use float32 for CPU compatibility
-                max_length=120,  # Reasonable response length
+                max_new_tokens=ANSWER_TOKENS,
                 do_sample=True,
                 temperature=0.7,
                 pad_token_id=50256,
@@ -74,7 +134,7 @@ class CareerRAGPipeline:
             )
             
             logging.info(f"ONNX-optimized {model_name} loaded successfully!")
-            return HuggingFacePipeline(pipeline=qa_pipeline)
+            return qa_pipeline
             
         except ImportError:
             logging.info("ONNX runtime not available, using regular optimization")
@@ -91,10 +151,10 @@ class CareerRAGPipeline:
             
             qa_pipeline = pipeline(
                 "text-generation",
-                model=model_name,
+                model=resolve_model_path(model_name),
                 device=-1,  # Force CPU
                 torch_dtype=torch.float32,  # Use float32 for CPU
-                max_length=120,
+                max_new_tokens=ANSWER_TOKENS,
                 do_sample=True,
                 temperature=0.7,
                 pad_token_id=50256,
@@ -104,7 +164,7 @@ class CareerRAGPipeline:
             )
             
             logging.info(f"CPU-optimized {model_name} loaded successfully!")
-            return HuggingFacePipeline(pipeline=qa_pipeline)
+            return qa_pipeline
             
         except Exception as e:
             logging.error(f"Regular model setup failed: {e}")
@@ -118,32 +178,140 @@ class CareerRAGPipeline:
             
             qa_pipeline = pipeline(
                 "text-generation",
-                model=model_name,
+                model=resolve_model_path(model_name),
                 device=-1,
-                max_length=100,
+                max_new_tokens=ANSWER_TOKENS,
                 do_sample=True,
                 temperature=0.7,
             )
             
             logging.info(f"Basic {model_name} loaded as fallback")
-            return HuggingFacePipeline(pipeline=qa_pipeline)
+            return qa_pipeline
             
         except Exception as e:
             logging.error(f"All model setups failed: {e}")
             raise e
 
-    def get_career_advice(self, question: str) -> dict:
-        """Get personalized career advice based on resume and question"""
+    def _generate(self, prompt_ids, deadline: float, discard=None):
+        """Answer token ids for a prompt given as token ids, sized to finish by deadline.
+
+        Also returns whether the answer was cut short, whether that was for the budget,
+        and whether discard stopped it: a local model stops at the next token once discard is set.
+        """
+        estimator = get_rate_estimator()
+        max_new_tokens = estimator.max_new_tokens(deadline - time.perf_counter(), self.packer.answer_tokens)
+        model = getattr(self.generator, "model", None)
+        if model is not None and hasattr(model, "generate"):
+            input_ids = torch.tensor([prompt_ids])
+            stopping = DeadlineStopping(self.tokenizer, len(prompt_ids), deadline, max_new_tokens, cancel=discard)
+            with torch.inference_mode():
+                output = model.generate(
+                    input_ids,
+                    attention_mask=torch.ones_like(input_ids),
+                    max_new_tokens=max_new_tokens,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    stopping_criteria=StoppingCriteriaList([stopping]),
+                    **GENERATION_KWARGS,
+                )
+            stopping.record()
+            answer_ids = output[0, len(prompt_ids):].tolist()
+            answer_ids = [token for token in answer_ids if token != self.tokenizer.eos_token_id]
+            cut_short = stopping.reason is not None or len(answer_ids) >= max_new_tokens
+            for_budget = stopping.reason == "deadline" or (cut_short and max_new_tokens < self.packer.answer_tokens)
+            return answer_ids, cut_short, for_budget, stopping.reason == "cancelled"
+        # Generators that take text (the model server, benchmark stubs) are timed as a whole
+        prompt = self.tokenizer.decode(prompt_ids)
+        start = time.perf_counter()
+        # A remote call is abandoned once the budget is spent; the hedge answers instead
+        text = self.generator(
+            prompt, max_new_tokens=max_new_tokens, timeout=max(deadline - start, 0.01)
+        )[0]["generated_text"]
+        if text.startswith(prompt):
+            text = text[len(prompt):]
+        answer_ids = self.tokenizer.encode(text.strip())
+        estimator.observe_total(time.perf_counter() - start, len(answer_ids))
+        cut_short = len(answer_ids) >= max_new_tokens
+        return answer_ids, cut_short, cut_short and max_new_tokens < self.packer.answer_tokens, False
+
+    def get_career_advice(self, question: str, budget_seconds: float = None, speculative: bool = False,
+                          discard=None) -> dict:
+        """Get personalized career advice based on resume and question, within a latency budget.
+
+        Speculative answers (computed before anyone asked) stay out of the chat
+        history and the budget outcome counts. discard is an optional
+        threading.Event set once nobody needs the answer: a local model stops
+        generating at the next token, and the answer stays out of the chat history.
+        The result's "cancelled" is True if discard cut the answer short.
+        """
+        budget_seconds = budget_seconds or default_budget_seconds()
+        start = time.perf_counter()
         try:
-            result = self.chain.invoke({"question": question})
+            with stage_timer("retrieval"):
+                chunk_ids = self.retriever.retrieve_ids(question)
+            with stage_timer("prompt_packing"):
+                prompt_ids, packed, dropped = self.packer.pack(
+                    question, chunk_ids, [turn_ids for _, _, turn_ids in self.history]
+                )
+            PROMPT_SENTENCES.inc("packed", amount=packed)
+            PROMPT_SENTENCES.inc("dropped", amount=dropped)
+            with stage_timer("generation"):
+                answer_ids, cut_short, for_budget, cancelled = self._generate(
+                    prompt_ids, start + budget_seconds, discard
+                )
+            generated_tokens = len(answer_ids)
+            answer = self.tokenizer.decode(answer_ids, skip_special_tokens=True).strip()
+            if cut_short and not ends_sentence(answer):
+                # Don't end on half a sentence
+                answer = trim_to_sentence(answer)
+                answer_ids = self.tokenizer.encode(answer)
+            elapsed = time.perf_counter() - start
+            outcome = "missed" if elapsed > budget_seconds else "trimmed" if for_budget else "met"
+            if not speculative:
+                BUDGET_OUTCOMES.inc(outcome)
+                if discard is None or not discard.is_set():
+                    self.history.append((question, answer, self.packer.encode_turn(question, answer_ids)))
             return {
-                "answer": result["answer"],
-                "sources": [doc.page_content for doc in result["source_documents"]],
+                "answer": answer,
+                "generated_tokens": generated_tokens,
+                "cancelled": cancelled,
+                # Where each source is in the resume; source_text() gives its text
+                "sources": [self.retriever.chunk_store.reference(chunk_id) for chunk_id in chunk_ids],
+                "budget": {"budget_ms": round(budget_seconds * 1000), "elapsed_ms": round(elapsed * 1000),
+                           "outcome": outcome},
             }
         except Exception as e:
             return {"error": str(e)}
 
-    def analyze_skills_gap(self, target_role: str) -> dict:
+    def clear_history(self):
+        self.history.clear()
+
+    def source_text(self, source: dict) -> str:
+        """Text of a source returned by get_career_advice"""
+        return self.retriever.chunk_store.chunk_text(source["chunk_id"])
+
+    def memory_usage(self) -> dict:
+        """Approximate bytes held by this pipeline's indexes, chunk store and chat history"""
+        index = getattr(self.retriever, "index", None)
+        index_bytes = index.memory_bytes() if index is not None else 0
+        lexical_index = getattr(self.retriever, "lexical_index", None)
+        if lexical_index is not None:
+            index_bytes += lexical_index.memory_bytes()
+        chunk_store = getattr(self.retriever, "chunk_store", None)
+        chunk_store_bytes = chunk_store.memory_bytes() if chunk_store is not None else 0
+        chunk_store_bytes += self.packer.sentences.memory_bytes()
+        conversation_bytes = text_bytes(
+            text for question, answer, _ in self.history for text in (question, answer)
+        )
+        return {
+            "index_bytes": index_bytes,
+            "chunk_store_bytes": chunk_store_bytes,
+            "conversation_bytes": conversation_bytes,
+            "total_bytes": index_bytes + chunk_store_bytes + conversation_bytes,
+        }
+
+    def analyze_skills_gap(self, target_role: str, budget_seconds: float = None, speculative: bool = False,
+                           discard=None) -> dict:
         """Analyze skills gap for a specific target role"""
-        question = f"What skills do I need to develop to become a {target_role}?"
-        return self.get_career_advice(question)
+        question = SKILLS_GAP_QUESTION.format(role=target_role)
+        return self.get_career_advice(question, budget_seconds=budget_seconds, speculative=speculative,
+                                      discard=discard)
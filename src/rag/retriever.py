@@ -1,58 +1,65 @@
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.chains import RetrievalQA
-from langchain_community.llms import HuggingFacePipeline
-from transformers import pipeline
 import os
 
 # Fix relative imports
 try:
-    from .vector_store import create_vector_store
+    from .vector_store import create_vector_index, get_embeddings
+    from .hybrid_retriever import HybridRetriever
     from ..utils.pdf_parser import extract_text_from_pdf
-    from ..utils.resume_parser import parse_resume
+    from ..utils.chunking import ChunkStore, chunk_resume
+    from ..utils.lexical_index import BM25Index
+    from ..utils.metrics import stage_timer
 except ImportError:
     # Fallback for when running directly
     import sys
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from rag.vector_store import create_vector_store
+    from rag.vector_store import create_vector_index, get_embeddings
+    from rag.hybrid_retriever import HybridRetriever
     from utils.pdf_parser import extract_text_from_pdf
-    from utils.resume_parser import parse_resume
+    from utils.chunking import ChunkStore, chunk_resume
+    from utils.lexical_index import BM25Index
+    from utils.metrics import stage_timer
 
-def build_retriever(pdf_path: str):
-    """Build a retriever from a PDF file"""
+def reusable_vectors(retriever):
+    """chunk_hash -> vector for every chunk indexed by an existing retriever"""
+    if retriever is None:
+        return {}
+    vectors = retriever.index.all_vectors()
+    return dict(zip(retriever.chunk_store.hashes(), vectors))
+
+def build_retriever(pdf_path: str, resume_data=None, previous=None):
+    """Build a retriever from a PDF file (or its already parsed data).
+
+    previous is the retriever for an earlier version of the same resume;
+    its vectors are reused for chunks whose text has not changed.
+    """
     try:
-        # Extract text from PDF
-        raw_text = extract_text_from_pdf(pdf_path)
-        
-        # Parse resume for structured data
-        resume_data = parse_resume(raw_text)
-        
-        # Create text chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-        )
-        
-        # Combine all text data
-        all_text = raw_text + "\n\n" + "\n".join(resume_data.get("skills", []))
-        if resume_data.get("projects"):
-            all_text += "\n\n" + "\n".join(resume_data["projects"])
-        if resume_data.get("education"):
-            all_text += "\n\n" + "\n".join(resume_data["education"])
-        if resume_data.get("experience"):
-            all_text += "\n\n" + "\n".join(resume_data["experience"])
+        section_spans = None
+        if resume_data and resume_data.get("raw_text"):
+            raw_text = resume_data["raw_text"]
+            section_spans = resume_data.get("section_spans")
+        else:
+            # Extract text from PDF
+            raw_text = extract_text_from_pdf(pdf_path)
         
-        chunks = text_splitter.split_text(all_text)
+        # Chunk by resume section. The parsed sections are all taken from
+        # raw_text, so it holds everything; embedding them again duplicated it.
+        with stage_timer("chunking"):
+            chunks = chunk_resume(raw_text, section_spans)
+        texts = [chunk.text for chunk in chunks]
         
-        # Create vector store
-        vector_store = create_vector_store(chunks)
+        # Create the vector index and a keyword index over the same chunks
+        index = create_vector_index(texts, reuse=reusable_vectors(previous))
+        with stage_timer("lexical_index"):
+            lexical_index = BM25Index(texts)
         
-        # Build retriever
-        retriever = vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": 3}
+        # Build retriever: keyword matches fused with vector similarity. Only
+        # offsets into raw_text are kept; chunk text is sliced out on demand.
+        retriever = HybridRetriever(
+            index=index,
+            embeddings=get_embeddings(),
+            lexical_index=lexical_index,
+            chunk_store=ChunkStore(raw_text, chunks),
+            k=3,
         )
         
         return retriever
@@ -61,29 +68,3 @@ def build_retriever(pdf_path: str):
         print(f"Error building retriever: {e}")
         # Return a simple fallback retriever
         return None
-
-def build_qa_chain(retriever):
-    """Build a question-answering chain"""
-    try:
-        # Use a lightweight model for QA
-        qa_pipeline = pipeline(
-            "text-generation",
-            model="distilgpt2",  # Smaller, faster model
-            device=-1,
-        )
-        
-        llm = HuggingFacePipeline(pipeline=qa_pipeline)
-        
-        # Build QA chain
-        qa_chain = RetrievalQA.from_chain_type(
-            llm=llm,
-            chain_type="stuff",
-            retriever=retriever,
-            return_source_documents=True,
-        )
-        
-        return qa_chain
-        
-    except Exception as e:
-        print(f"Error building QA chain: {e}")
-        return None
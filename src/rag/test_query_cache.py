@@ -0,0 +1,85 @@
+import threading
+
+from rag.query_cache import QUERY_CACHE_REQUESTS, CachedEmbeddings
+
+
+class CountingEmbeddings:
+    """Fake base embedder: a text's vector is [its length, its call number]"""
+
+    model = None
+    model_name = "fake"
+
+    def __init__(self):
+        self.queries = []
+        self.documents = []
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), float(len(self.queries))]
+
+    def embed_documents(self, texts):
+        self.documents.append(list(texts))
+        return [[float(len(text)), 0.0] for text in texts]
+
+
+def lookups():
+    counts = dict(QUERY_CACHE_REQUESTS.samples())
+    return counts.get(("hit",), 0), counts.get(("miss",), 0)
+
+
+def test_repeated_questions_are_embedded_once_whatever_their_case_and_spacing():
+    base = CountingEmbeddings()
+    cache = CachedEmbeddings(base)
+    hits, misses = lookups()
+    first = cache.embed_query("What skills   do I need?")
+    assert cache.embed_query("  what SKILLS do i need? ") == first
+    assert base.queries == ["What skills   do I need?"]
+    assert lookups() == (hits + 1, misses + 1)
+
+
+def test_least_recently_used_question_is_evicted():
+    base = CountingEmbeddings()
+    cache = CachedEmbeddings(base, max_entries=2)
+    for question in ("a?", "b?", "a?", "c?"):
+        cache.embed_query(question)
+    assert base.queries == ["a?", "b?", "c?"]
+    cache.embed_query("a?")
+    cache.embed_query("b?")
+    assert base.queries == ["a?", "b?", "c?", "b?"]
+    assert cache.cache_stats()["entries"] == 2
+
+
+def test_precomputed_templates_are_pinned_and_batched():
+    base = CountingEmbeddings()
+    cache = CachedEmbeddings(base, max_entries=1)
+    assert cache.precompute(["Skills for a Data Analyst?", "skills for a data analyst?", "Skills for an SRE?"]) == 2
+    assert base.documents == [["skills for a data analyst?", "skills for an sre?"]]
+    # Already pinned
+    assert cache.precompute(["Skills for an SRE?"]) == 0
+    for question in ("one?", "two?", "Skills for a Data Analyst?"):
+        cache.embed_query(question)
+    assert base.queries == ["one?", "two?"]
+    assert cache.cache_stats()["pinned"] == 2
+
+
+def test_precompute_while_queries_run():
+    cache = CachedEmbeddings(CountingEmbeddings(), max_entries=8)
+    templates = ["Template %d?" % n for n in range(200)]
+    worker = threading.Thread(target=cache.precompute, args=(templates,))
+    worker.start()
+    for n in range(200):
+        cache.embed_query("Question %d?" % (n % 10))
+    worker.join()
+    assert cache.cache_stats()["pinned"] == 200
+    assert cache.embed_query("template 7?") == [11.0, 0.0]
+
+
+def test_is_cached_does_not_embed_or_count():
+    base = CountingEmbeddings()
+    cache = CachedEmbeddings(base)
+    cache.precompute(["Skills for an SRE?"])
+    cache.embed_query("What next?")
+    before = lookups()
+    assert cache.is_cached("skills for an  SRE?") and cache.is_cached("WHAT NEXT?")
+    assert not cache.is_cached("Something else?")
+    assert base.queries == ["What next?"] and lookups() == before
@@ -1,20 +1,112 @@
+import logging
+import os
+import threading
+
+import numpy as np
 from sentence_transformers import SentenceTransformer
-from langchain_community.vectorstores import FAISS
 from langchain.embeddings.base import Embeddings
 
+# Fix relative imports
+try:
+    from ..model_server.client import ModelServerError, get_model_client
+    from .query_cache import CachedEmbeddings
+    from ..utils.chunking import chunk_hash
+    from ..utils.metrics import get_counter, stage_timer
+    from ..utils.model_paths import resolve_model_path
+    from ..utils.vector_index import build_vector_index
+except ImportError:
+    # Fallback for when running directly
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from model_server.client import ModelServerError, get_model_client
+    from rag.query_cache import CachedEmbeddings
+    from utils.chunking import chunk_hash
+    from utils.metrics import get_counter, stage_timer
+    from utils.model_paths import resolve_model_path
+    from utils.vector_index import build_vector_index
+
 
 class HuggingFaceEmbeddings(Embeddings):
     def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.model = SentenceTransformer(resolve_model_path(model_name))
 
     def embed_documents(self, texts):
-        return self.model.encode(texts, convert_to_numpy=True).tolist()
+        with stage_timer("embedding"):
+            return self.model.encode(texts, convert_to_numpy=True).tolist()
 
     def embed_query(self, text):
         return self.model.encode([text], convert_to_numpy=True)[0].tolist()
 
 
-def create_vector_store(text_chunks):
-    embeddings = HuggingFaceEmbeddings()
-    vector_store = FAISS.from_texts(text_chunks, embedding=embeddings)
-    return vector_store
+class RemoteEmbeddings(Embeddings):
+    """Embeddings computed by the shared model server"""
+
+    # Nothing held in this process
+    model = None
+
+    def __init__(self, client, model_name="all-MiniLM-L6-v2"):
+        self.client = client
+        self.model_name = model_name
+
+    def embed_documents(self, texts):
+        with stage_timer("embedding"):
+            return self.client.embed(texts).tolist()
+
+    def embed_query(self, text):
+        return self.client.embed([text])[0].tolist()
+
+
+def _load_embeddings():
+    client = get_model_client()
+    if client is not None:
+        try:
+            info = client.info()
+            return RemoteEmbeddings(client, info.get("embedding_model", "all-MiniLM-L6-v2"))
+        except ModelServerError as e:
+            logging.warning(f"Model server unavailable, loading embeddings in this process: {e}")
+    return HuggingFaceEmbeddings()
+
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+
+def get_embeddings():
+    """Shared embedding model, loaded once per process"""
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                _embeddings = CachedEmbeddings(
+                    _load_embeddings(), max_entries=int(os.environ.get("SAHAY_QUERY_CACHE_SIZE", "1024"))
+                )
+    return _embeddings
+
+
+def loaded_embeddings():
+    """The shared embedding model if it has been loaded, without loading it"""
+    return _embeddings
+
+
+CHUNK_VECTORS = get_counter(
+    "sahay_chunk_vectors_total", "Chunk vectors indexed, by source: embedded or reused from a previous version.", ("source",)
+)
+
+
+def create_vector_index(text_chunks, reuse=None):
+    """Embed the chunks and index them; vector i is chunk i.
+
+    reuse maps chunk_hash -> vector for the previous version of the resume;
+    chunks found there are not embedded again. A resume's few chunks go in a
+    plain numpy matrix; FAISS is used only above SAHAY_NUMPY_INDEX_MAX_CHUNKS.
+    """
+    reuse = reuse or {}
+    hashes = [chunk_hash(text) for text in text_chunks]
+    changed = [text for text, key in zip(text_chunks, hashes) if key not in reuse]
+    embedded = iter(get_embeddings().embed_documents(changed) if changed else ())
+    vectors = [reuse[key] if key in reuse else next(embedded) for key in hashes]
+    CHUNK_VECTORS.inc("embedded", amount=len(changed))
+    CHUNK_VECTORS.inc("reused", amount=len(hashes) - len(changed))
+    with stage_timer("index_build"):
+        return build_vector_index(np.asarray(vectors, dtype=np.float32))
@@ -0,0 +1,241 @@
+"""
+Section-aware chunking of resume text.
+
+Chunks never cross a boundary of the sections parse_resume found, and each
+one carries its section name and its (start, end) character offsets in
+raw_text. Sections are split at line and bullet boundaries. Lines repeated
+within a section and near-identical chunks (duplicated pages) are dropped
+before anything is embedded.
+
+Once indexed, chunks are kept as a ChunkStore: the resume text once, plus
+offset arrays. Chunk text is sliced out only for the prompt or the response.
+chunk_hash keys a chunk by its content, so a re-uploaded resume only embeds
+the chunks that changed.
+"""
+
+import hashlib
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .resume_parser import parse_resume
+except ImportError:
+    # Fallback for when running directly
+    from resume_parser import parse_resume
+
+# Canonical section names (the keys parse_resume uses) and words that mark them
+SECTION_KEYWORDS = {
+    "education": ("education", "academic", "qualification"),
+    "experience": ("experience", "employment", "work history"),
+    "projects": ("project", "portfolio"),
+    "skills": ("skill", "technologies"),
+    "certifications": ("certification", "certificate", "courses"),
+    "achievements": ("achievement", "award", "honor"),
+    "extracurricular": ("extracurricular", "activities", "volunteer"),
+    "publications": ("publication",),
+    "summary": ("summary", "objective", "profile"),
+}
+
+# Preferred split points inside a section: line breaks, then bullets
+UNIT_BOUNDARY_PATTERN = re.compile(r"\n+|(?=[•▪◦‣·])")
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class Chunk(NamedTuple):
+    text: str
+    section: str
+    start: int
+    end: int
+
+
+def section_name(header: str) -> Optional[str]:
+    """Canonical section for a header line, or None if it isn't a known section"""
+    lowered = header.lower()
+    for section, keywords in SECTION_KEYWORDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            return section
+    return None
+
+
+def _header_start(raw_text: str, start: int, end: int, section: str) -> int:
+    """Where the header of section begins in raw_text[start:end], or end if it has none there"""
+    lowered = raw_text[start:end].lower()
+    found = max(lowered.rfind(keyword) for keyword in SECTION_KEYWORDS.get(section, ()))
+    if found < 0:
+        return end
+    found += start
+    # Take a qualifier on the same line too ("WORK EXPERIENCE", "Technical Skills")
+    line_start = raw_text.rfind("\n", start, found) + 1 or start
+    if len(raw_text[max(line_start, start):found].split()) <= 1:
+        return max(line_start, start)
+    return raw_text.rfind(" ", start, found) + 1 or found
+
+
+def find_sections(raw_text: str, section_spans: Sequence[Sequence]) -> List[Tuple[str, int, int]]:
+    """(section, start, end) spans covering raw_text, from the parser's section spans.
+
+    section_spans are parse_resume()'s [section, start, end] entries for the
+    text each section was extracted from. A section's header is moved into it.
+    Other text between them (sections the parser doesn't extract, such as
+    certifications) is named by the header it starts with, "contact" before
+    the first section, and otherwise stays with the section before it.
+    """
+    parsed = []
+    position = 0
+    for section, start, end in sorted(section_spans, key=lambda span: span[1]):
+        start = max(start, position)
+        if start < end:
+            parsed.append((section, start, end))
+            position = end
+
+    spans: List[Tuple[str, int, int]] = []
+    position = 0
+    for section, start, end in parsed + [(None, len(raw_text), len(raw_text))]:
+        header = _header_start(raw_text, position, start, section) if section else start
+        if raw_text[position:header].strip():
+            named = section_name(" ".join(raw_text[position:header].split()[:3]))
+            if named is None and not spans:
+                named = "contact"
+            if named is None:
+                spans[-1] = (spans[-1][0], spans[-1][1], header)
+            else:
+                spans.append((named, position, header))
+        elif spans:
+            spans[-1] = (spans[-1][0], spans[-1][1], header)
+        if section is not None:
+            spans.append((section, header, end))
+        position = end
+    return spans
+
+
+def _units(raw_text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """Line and bullet pieces of raw_text[start:end] as offsets"""
+    units = []
+    position = start
+    for match in UNIT_BOUNDARY_PATTERN.finditer(raw_text, start, end):
+        if match.start() > position:
+            units.append((position, match.start()))
+        position = max(position, match.end())
+    if position < end:
+        units.append((position, end))
+    return units
+
+
+def _split_long(raw_text: str, start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    """Cut a single over-long piece at whitespace"""
+    pieces = []
+    while end - start > max_chars:
+        cut = raw_text.rfind(" ", start + 1, start + max_chars)
+        if cut <= start:
+            cut = start + max_chars
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def _trim(raw_text: str, start: int, end: int) -> Tuple[int, int]:
+    while start < end and raw_text[start].isspace():
+        start += 1
+    while end > start and raw_text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def chunk_hash(text: str) -> str:
+    """Content key for a chunk; chunks with the same hash have the same embedding"""
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def _fingerprint(text: str) -> frozenset:
+    return frozenset(WORD_PATTERN.findall(text.lower()))
+
+
+def _is_near_duplicate(words: frozenset, kept: List[frozenset], threshold: float) -> bool:
+    for other in kept:
+        union = len(words | other)
+        if union and len(words & other) / union >= threshold:
+            return True
+    return False
+
+
+def chunk_resume(raw_text: str, section_spans: Optional[Sequence[Sequence]] = None, max_chars: int = 500,
+                 min_chars: int = 8, duplicate_threshold: float = 0.9) -> List[Chunk]:
+    """Split resume text into section-bounded chunks, dropping near-duplicates.
+
+    section_spans come from parse_resume(raw_text), which is run here if they aren't given.
+    """
+    if section_spans is None:
+        section_spans = parse_resume(raw_text).get("section_spans", [])
+    chunks: List[Chunk] = []
+    kept: List[frozenset] = []
+    for section, section_start, section_end in find_sections(raw_text, section_spans):
+        # Greedily pack whole lines/bullets up to max_chars
+        groups: List[Tuple[int, int]] = []
+        extend = False
+        # A line repeated within a section is dropped; the same line in another section may mean something else
+        seen_units = set()
+        for unit_start, unit_end in _units(raw_text, section_start, section_end):
+            unit_key = " ".join(WORD_PATTERN.findall(raw_text[unit_start:unit_end].lower()))
+            if unit_key and unit_key in seen_units:
+                # Chunks are contiguous, so a dropped line also ends the current one
+                extend = False
+                continue
+            seen_units.add(unit_key)
+            for piece_start, piece_end in _split_long(raw_text, unit_start, unit_end, max_chars):
+                if extend and piece_end - groups[-1][0] <= max_chars:
+                    groups[-1] = (groups[-1][0], piece_end)
+                else:
+                    groups.append((piece_start, piece_end))
+                extend = True
+
+        for group_start, group_end in groups:
+            start, end = _trim(raw_text, group_start, group_end)
+            if end - start < min_chars:
+                continue
+            text = raw_text[start:end]
+            words = _fingerprint(text)
+            if not words or _is_near_duplicate(words, kept, duplicate_threshold):
+                continue
+            kept.append(words)
+            chunks.append(Chunk(text, section, start, end))
+    return chunks
+
+
+class ChunkStore:
+    """One resume's text and its chunks' offsets; chunk ids are positions in the vector index"""
+
+    def __init__(self, text: str, chunks: Sequence[Chunk]):
+        self.text = text
+        self.starts = np.array([chunk.start for chunk in chunks], dtype=np.int32)
+        self.ends = np.array([chunk.end for chunk in chunks], dtype=np.int32)
+        self.section_names = tuple(dict.fromkeys(chunk.section for chunk in chunks))
+        self.section_ids = np.array([self.section_names.index(chunk.section) for chunk in chunks], dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def chunk_text(self, chunk_id: int) -> str:
+        return self.text[self.starts[chunk_id]:self.ends[chunk_id]]
+
+    def section(self, chunk_id: int) -> str:
+        return self.section_names[self.section_ids[chunk_id]]
+
+    def hashes(self) -> List[str]:
+        return [chunk_hash(self.chunk_text(chunk_id)) for chunk_id in range(len(self))]
+
+    def reference(self, chunk_id: int) -> Dict:
+        """Where a chunk is, without its text"""
+        return {
+            "chunk_id": int(chunk_id),
+            "section": self.section(chunk_id),
+            "start": int(self.starts[chunk_id]),
+            "end": int(self.ends[chunk_id]),
+        }
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.text) + self.starts.nbytes + self.ends.nbytes + self.section_ids.nbytes
@@ -0,0 +1,167 @@
+"""
+Deadline-aware answer length.
+
+Generation speed is measured online: each answer reports its time to first
+token and its per-token decode time, and both are kept as exponentially
+weighted moving averages. Given what is left of a request's latency budget,
+max_new_tokens() returns how many tokens can still be generated in time.
+Answers stop at a sentence boundary rather than mid-sentence when the budget
+runs short, and every answer is counted as met, trimmed or missed.
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    from .metrics import get_counter
+except ImportError:
+    # Fallback for when running directly
+    from metrics import get_counter
+
+BUDGET_ENV = "SAHAY_ANSWER_BUDGET_MS"
+DEFAULT_BUDGET_MS = 4000
+
+# Near the deadline, a new sentence isn't started unless this many tokens still fit
+SENTENCE_TOKENS = 16
+
+# Text that ends a sentence, allowing closing quotes or brackets
+SENTENCE_END_PATTERN = re.compile(r"[.!?][\"')\]]*\s*$")
+
+BUDGET_OUTCOMES = get_counter(
+    "sahay_generation_budget_total",
+    "Answers by latency budget outcome: met, trimmed (stopped early to meet it) or missed.",
+    ("outcome",),
+)
+
+
+def default_budget_seconds() -> float:
+    return int(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MS)) / 1000
+
+
+def ends_sentence(text: str) -> bool:
+    return bool(SENTENCE_END_PATTERN.search(text))
+
+
+def trim_to_sentence(text: str, min_fraction: float = 0.5) -> str:
+    """Cut text after its last complete sentence, unless that drops more than half of it"""
+    text = text.rstrip()
+    if ends_sentence(text):
+        return text
+    cut = max(text.rfind(mark) for mark in ".!?") + 1
+    return text[:cut] if cut >= min_fraction * len(text) else text
+
+
+class TokenRateEstimator:
+    """EWMA of time to first token and seconds per decoded token"""
+
+    def __init__(self, seconds_per_token: float = 0.05, first_token_seconds: float = 0.2, alpha: float = 0.2):
+        self.seconds_per_token = seconds_per_token
+        self.first_token_seconds = first_token_seconds
+        self.alpha = alpha
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def _update(self, current: float, sample: float) -> float:
+        # The first measurement replaces the guess outright
+        return sample if not self.samples else current + self.alpha * (sample - current)
+
+    def observe(self, first_token_seconds: float, decode_tokens: int, decode_seconds: float):
+        """One answer's time to first token and the time for the tokens after it"""
+        with self._lock:
+            self.first_token_seconds = self._update(self.first_token_seconds, first_token_seconds)
+            if decode_tokens > 0:
+                self.seconds_per_token = self._update(self.seconds_per_token, decode_seconds / decode_tokens)
+            self.samples += 1
+
+    def observe_total(self, seconds: float, tokens: int):
+        """An answer whose time is only known in total (model server); it is spread over its tokens"""
+        self.observe(0.0, tokens, seconds)
+
+    def max_new_tokens(self, seconds_left: float, limit: int, floor: int = 8, headroom: float = 0.9) -> int:
+        """Most tokens that fit in headroom * seconds_left, between floor and limit"""
+        usable = headroom * seconds_left - self.first_token_seconds
+        affordable = 1 + int(usable / max(self.seconds_per_token, 1e-6))
+        return max(floor, min(limit, affordable))
+
+    def snapshot(self) -> Dict:
+        return {
+            "ms_per_token": round(self.seconds_per_token * 1000, 2),
+            "first_token_ms": round(self.first_token_seconds * 1000, 1),
+            "samples": self.samples,
+        }
+
+
+_estimator = TokenRateEstimator()
+
+
+def get_rate_estimator() -> TokenRateEstimator:
+    """The process-wide estimator; every pipeline shares the same generator"""
+    return _estimator
+
+
+class DeadlineTracker:
+    """Decides after each generated token whether to stop: at the deadline, or at a
+    sentence end once another sentence won't fit. Also times the first token and the decode rate.
+
+    cancel is an optional threading.Event; once it is set, generation stops at the next token.
+    """
+
+    def __init__(self, tokenizer, deadline: float, max_new_tokens: int,
+                 estimator: Optional[TokenRateEstimator] = None, cancel: Optional[threading.Event] = None):
+        self.tokenizer = tokenizer
+        self.deadline = deadline
+        self.max_new_tokens = max_new_tokens
+        self.estimator = estimator or get_rate_estimator()
+        self.cancel = cancel
+        self.started = time.perf_counter()
+        self.first_token_at = None
+        self.last_token_at = None
+        self.tokens = 0
+        self.reason = None
+
+    def step(self, tokens: int, last_ids) -> bool:
+        """True to stop, given the number of tokens generated so far and the last one's ids"""
+        now = time.perf_counter()
+        self.first_token_at = self.first_token_at or now
+        self.last_token_at = now
+        self.tokens = tokens
+        if self.cancel is not None and self.cancel.is_set():
+            self.reason = "cancelled"
+            return True
+        if now >= self.deadline:
+            self.reason = "deadline"
+            return True
+        out_of_time = self.deadline - now < SENTENCE_TOKENS * self.estimator.seconds_per_token
+        out_of_tokens = self.max_new_tokens - tokens < SENTENCE_TOKENS
+        # Decoding is only needed near the end
+        if (out_of_time or out_of_tokens) and ends_sentence(self.tokenizer.decode(last_ids)):
+            self.reason = "deadline" if out_of_time else "length"
+            return True
+        return False
+
+    def record(self):
+        """Feed this answer's timings to the speed estimate"""
+        if self.first_token_at is not None:
+            self.estimator.observe(
+                self.first_token_at - self.started, self.tokens - 1, self.last_token_at - self.first_token_at
+            )
+
+
+def budget_report() -> Dict:
+    """Budget outcome counts, hit rate and the current speed estimate"""
+    counts = {labels[0]: int(value) for labels, value in BUDGET_OUTCOMES.samples()}
+    total = sum(counts.values())
+    within = counts.get("met", 0) + counts.get("trimmed", 0)
+    report = {
+        "budget_ms": int(default_budget_seconds() * 1000),
+        "answers": total,
+        "met": counts.get("met", 0),
+        "trimmed": counts.get("trimmed", 0),
+        "missed": counts.get("missed", 0),
+        "hit_rate": round(100 * within / total, 1) if total else 0.0,
+    }
+    report.update(_estimator.snapshot())
+    return report
@@ -0,0 +1,116 @@
+"""
+BM25 inverted index over a resume's chunks, and the fusion of its scores with
+dense similarity.
+
+Postings store each term's final BM25 contribution per chunk (idf and length
+normalisation folded in at build time), so scoring a query is a handful of
+numpy adds. Exact tokens matter here: tool names such as "c++", "node.js" or
+"pyspark" are where embedding search tends to miss.
+"""
+
+import math
+import re
+import sys
+from collections import Counter
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Question words, and words every question about a resume uses, carry no
+# signal; "candidate" would otherwise match the name line of every resume
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been being but by can could
+did do does for from get had has have how i if in into is it its me more most
+my need of on or our should so some than that the their them then there these
+they this to up was we what when where which who why will with would you your
+s candidate candidates cv describe list mention mentioned resume show tell
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 with precomputed per-posting weights"""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        self.size = len(texts)
+        collected: Dict[str, Tuple[List[int], List[int]]] = {}
+        lengths = np.zeros(self.size, dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                ids, tfs = collected.setdefault(term, ([], []))
+                ids.append(doc_id)
+                tfs.append(tf)
+
+        average_length = float(lengths.mean()) if self.size and lengths.any() else 1.0
+        length_norm = k1 * (1 - b + b * lengths / average_length)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, (ids, tfs) in collected.items():
+            ids = np.asarray(ids, dtype=np.int32)
+            tfs = np.asarray(tfs, dtype=np.float32)
+            idf = math.log(1 + (self.size - len(ids) + 0.5) / (len(ids) + 0.5))
+            weights = idf * tfs * (k1 + 1) / (tfs + length_norm[ids])
+            self._postings[term] = (ids, weights.astype(np.float32))
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every chunk for the query"""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is not None:
+                ids, weights = posting
+                scores[ids] += weights
+        return scores
+
+    def memory_bytes(self) -> int:
+        return sum(sys.getsizeof(term) + ids.nbytes + weights.nbytes
+                   for term, (ids, weights) in self._postings.items())
+
+
+def is_decisive(lexical: np.ndarray, min_score: float, margin: float) -> bool:
+    """True when the best BM25 hit is strong and clearly ahead of the runner-up"""
+    if lexical.size == 0:
+        return False
+    if lexical.size == 1:
+        return float(lexical[0]) >= min_score
+    second, top = np.partition(lexical, lexical.size - 2)[-2:]
+    return float(top) >= min_score and float(top) >= margin * float(second)
+
+
+def _min_max(scores: np.ndarray) -> np.ndarray:
+    low, high = float(scores.min()), float(scores.max())
+    if high - low < 1e-9:
+        return np.zeros_like(scores)
+    return (scores - low) / (high - low)
+
+
+def top_k(scores: np.ndarray, k: int) -> List[int]:
+    """Positions of the k highest scores, best first"""
+    return [int(i) for i in np.argsort(-scores, kind="stable")[:k]]
+
+
+def hybrid_rank(lexical: np.ndarray, dense_scores: Callable[[], np.ndarray], k: int, alpha: float = 0.5,
+                min_lexical_score: float = 1.0, lexical_margin: float = 1.5) -> Tuple[List[int], str]:
+    """Chunk positions best first, and the path taken: "lexical", "filled" or "hybrid".
+
+    dense_scores is only called when BM25 isn't decisive, so the fast path
+    skips the query embedding. When BM25 is decisive but matches fewer than k
+    chunks, its hits lead and the dense ranking fills the rest ("filled").
+    Higher dense scores must mean more similar.
+    """
+    if is_decisive(lexical, min_lexical_score, lexical_margin):
+        hits = [i for i in top_k(lexical, k) if lexical[i] > 0]
+        if len(hits) >= min(k, lexical.size):
+            return hits, "lexical"
+        taken = set(hits)
+        return hits + [i for i in top_k(dense_scores(), k + len(hits)) if i not in taken][:k - len(hits)], "filled"
+    fused = alpha * _min_max(dense_scores())
+    if lexical.size and lexical.max() > 0:
+        fused += (1 - alpha) * lexical / lexical.max()
+    return top_k(fused, k), "hybrid"
@@ -0,0 +1,33 @@
+import sys
+from typing import Iterable
+
+
+def module_bytes(module) -> int:
+    """Bytes held by a torch module's parameters and buffers"""
+    if module is None:
+        return 0
+    total = 0
+    for tensor in list(module.parameters()) + list(module.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def faiss_index_bytes(index) -> int:
+    """Approximate size of a FAISS index's stored vectors"""
+    if index is None:
+        return 0
+    code_size = getattr(index, "code_size", index.d * 4)
+    return int(index.ntotal * code_size)
+
+
+def text_bytes(texts: Iterable[str]) -> int:
+    """Approximate in-memory size of a collection of strings"""
+    return sum(sys.getsizeof(text) for text in texts)
+
+
+def format_bytes(num_bytes: float) -> str:
+    """Human-readable size, e.g. 12.3 MB"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
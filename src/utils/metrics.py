@@ -0,0 +1,310 @@
+import bisect
+import math
+import resource
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Pipeline stages in the order they run, used to order reports
+STAGES = (
+    "pdf_extraction",
+    "parsing",
+    "chunking",
+    "embedding",
+    "index_build",
+    "lexical_index",
+    "retrieval",
+    "prompt_packing",
+    "generation",
+)
+
+# Number of recent samples each histogram keeps for percentiles
+DEFAULT_WINDOW = 1024
+
+# Cumulative bucket upper bounds (seconds) exported to Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "sahay"
+
+
+class LatencyHistogram:
+    """Rolling window of recent latencies plus cumulative count, sum and buckets"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self._bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        # Bucket lookup happens outside the lock; the critical section is a few increments
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._samples.append(seconds)
+            self._bucket_counts[index] += 1
+            self.count += 1
+            self.total += seconds
+
+    def cumulative_buckets(self):
+        """(upper bound, cumulative count) pairs ending with +Inf"""
+        with self._lock:
+            counts = list(self._bucket_counts)
+            total = self.total
+        running = 0
+        result = []
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            running += count
+            result.append((bound, running))
+        return result, total
+
+    def percentiles(self, quantiles: Iterable[float] = (50, 95, 99)) -> Dict[float, float]:
+        """Nearest-rank percentiles over the current window, in seconds"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {q: 0.0 for q in quantiles}
+        return {
+            q: samples[min(len(samples) - 1, max(0, math.ceil(q / 100 * len(samples)) - 1))]
+            for q in quantiles
+        }
+
+    def summary(self) -> Dict:
+        """Count, mean and p50/p95/p99 in milliseconds"""
+        p = self.percentiles()
+        with self._lock:
+            count, total = self.count, self.total
+        return {
+            "count": count,
+            "mean_ms": round(total / count * 1000, 2) if count else 0.0,
+            "p50_ms": round(p[50] * 1000, 2),
+            "p95_ms": round(p[95] * 1000, 2),
+            "p99_ms": round(p[99] * 1000, 2),
+        }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_registry_lock = threading.Lock()
+
+
+def get_histogram(name: str) -> LatencyHistogram:
+    """Process-wide histogram for a stage, created on first use"""
+    histogram = _histograms.get(name)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.setdefault(name, LatencyHistogram())
+    return histogram
+
+
+def record_duration(stage: str, seconds: float):
+    get_histogram(stage).observe(seconds)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time the enclosed block and record it under the given stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_duration(stage, time.perf_counter() - start)
+
+
+def timed(stage: str):
+    """Decorator form of stage_timer"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def stage_summary(stage: str):
+    """Summary for one stage, or None if it has not been recorded yet"""
+    histogram = _histograms.get(stage)
+    return histogram.summary() if histogram else None
+
+
+def latency_snapshot() -> Dict[str, Dict]:
+    """Summaries for every recorded stage, pipeline stages first"""
+    names = [stage for stage in STAGES if stage in _histograms]
+    names += sorted(name for name in list(_histograms) if name not in STAGES)
+    return {name: _histograms[name].summary() for name in names}
+
+
+class Counter:
+    """Monotonic counter with optional label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return list(self._values.items())
+
+
+class Gauge:
+    """Value that goes up and down, or is computed at scrape time by a callback"""
+
+    def __init__(self, name: str, help_text: str, callback: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help_text = help_text
+        self.callback = callback
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        if self.callback is not None:
+            return self.callback()
+        return self._value
+
+
+_counters: Dict[str, Counter] = {}
+_gauges: Dict[str, Gauge] = {}
+
+
+def get_counter(name: str, help_text: str = "", label_names: Tuple[str, ...] = ()) -> Counter:
+    """Process-wide counter, created on first use"""
+    counter = _counters.get(name)
+    if counter is None:
+        with _registry_lock:
+            counter = _counters.setdefault(name, Counter(name, help_text, label_names))
+    return counter
+
+
+def get_gauge(name: str, help_text: str = "", callback: Optional[Callable[[], float]] = None) -> Gauge:
+    """Process-wide gauge, created on first use"""
+    gauge = _gauges.get(name)
+    if gauge is None:
+        with _registry_lock:
+            gauge = _gauges.setdefault(name, Gauge(name, help_text, callback))
+    return gauge
+
+
+def shared_memory(pid="self") -> Dict[str, int]:
+    """Unique (USS) and proportional (PSS) set size from /proc/<pid>/smaps_rollup, in bytes.
+
+    USS is what a pre-forked worker really costs: pages shared copy-on-write
+    with the master or other workers don't count. Empty where unsupported.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    except OSError:
+        return {}
+    return {
+        "uss_bytes": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "pss_bytes": fields.get("Pss", 0),
+        "shared_bytes": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+def process_memory() -> Dict[str, int]:
+    """Current and peak resident set size of this process, plus USS/PSS where available, in bytes"""
+    rss = peak = 0
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    peak = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if not peak:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            peak *= 1024
+    memory = {"rss_bytes": rss or peak, "peak_rss_bytes": peak}
+    memory.update(shared_memory())
+    return memory
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+
+    name = f"{METRIC_PREFIX}_stage_duration_seconds"
+    lines.append(f"# HELP {name} Time spent in each pipeline stage and request type.")
+    lines.append(f"# TYPE {name} histogram")
+    for stage in list(_histograms):
+        buckets, total = _histograms[stage].cumulative_buckets()
+        for bound, count in buckets:
+            labels = _format_labels([("stage", stage), ("le", _format_value(bound))])
+            lines.append(f"{name}_bucket{labels} {count}")
+        labels = _format_labels([("stage", stage)])
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {buckets[-1][1]}")
+
+    for counter in list(_counters.values()):
+        lines.append(f"# HELP {counter.name} {counter.help_text}")
+        lines.append(f"# TYPE {counter.name} counter")
+        for label_values, value in counter.samples():
+            labels = _format_labels(list(zip(counter.label_names, label_values)))
+            lines.append(f"{counter.name}{labels} {_format_value(value)}")
+
+    for gauge in list(_gauges.values()):
+        lines.append(f"# HELP {gauge.name} {gauge.help_text}")
+        lines.append(f"# TYPE {gauge.name} gauge")
+        lines.append(f"{gauge.name} {_format_value(gauge.value)}")
+
+    memory = process_memory()
+    for key, help_text in (("rss_bytes", "Resident set size of this worker process."),
+                           ("peak_rss_bytes", "Peak resident set size of this worker process."),
+                           ("uss_bytes", "Memory unique to this worker process (not shared copy-on-write)."),
+                           ("pss_bytes", "Proportional set size of this worker process.")):
+        if key not in memory:
+            continue
+        name = f"{METRIC_PREFIX}_process_{key}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {memory[key]}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,27 @@
+import logging
+import os
+from typing import Optional
+
+# Directory of local model snapshots, e.g. one written by `manage.py prewarm --save-to`
+MODEL_DIR_ENV = "SAHAY_MODEL_DIR"
+
+
+def model_dir() -> Optional[str]:
+    return os.environ.get(MODEL_DIR_ENV) or None
+
+
+def snapshot_name(model_name: str) -> str:
+    """Directory name for a hub model id, e.g. microsoft--DialoGPT-small"""
+    return model_name.replace("/", "--")
+
+
+def resolve_model_path(model_name: str) -> str:
+    """Local snapshot path for a model if one exists, otherwise the hub model id"""
+    directory = model_dir()
+    if directory:
+        for candidate in (snapshot_name(model_name), model_name, model_name.split("/")[-1]):
+            path = os.path.join(directory, candidate)
+            if os.path.isdir(path):
+                return path
+        logging.info(f"No local snapshot of {model_name} in {directory}; using the model hub")
+    return model_name
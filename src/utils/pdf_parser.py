@@ -3,7 +3,14 @@ import re
 from typing import List, Dict, Tuple
 import logging
 
+try:
+    from .metrics import timed
+except ImportError:
+    # Fallback for when running directly
+    from metrics import timed
 
+
+@timed("pdf_extraction")
 def extract_text_from_pdf(file_path: str) -> str:
     """
     Extract text from PDF using PyMuPDF with enhanced capabilities.
@@ -0,0 +1,130 @@
+"""
+Token-budgeted prompt assembly for the answer model.
+
+When a resume is indexed, every chunk is split into sentences (lines and
+bullets count as sentences) and each sentence is tokenized once with the
+generator's tokenizer. A prompt is then assembled from token ids alone: the
+sentences of the retrieved chunks that best match the question are packed
+into a fixed budget that leaves room for the answer, so nothing the model is
+given gets truncated and nothing is re-tokenized per request.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .lexical_index import tokenize
+except ImportError:
+    # Fallback for when running directly
+    from lexical_index import tokenize
+
+# Sentence ends, line breaks and bullets
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?;])\s+|\n+|(?=[•▪◦‣·])")
+
+CONTEXT_HEADER = "Resume excerpts:"
+SENTENCE_PREFIX = "\n- "
+QUESTION_TEMPLATE = "\nQuestion: {question}\nAnswer:"
+TURN_TEMPLATE = "\nQuestion: {question}\nAnswer: "
+
+
+def sentence_spans(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the non-blank sentences in text[start:end]"""
+    spans = []
+    position = start
+    for match in SENTENCE_BOUNDARY_PATTERN.finditer(text, start, end):
+        spans.append((position, match.start()))
+        position = max(position, match.end())
+    spans.append((position, end))
+    return [(s, e) for s, e in spans if text[s:e].strip()]
+
+
+class SentenceTokens:
+    """Token ids and terms for every sentence of a ChunkStore, computed once at index time"""
+
+    def __init__(self, chunk_store, tokenizer):
+        chunk_ids, tokens, offsets, self.terms = [], [], [0], []
+        for chunk_id in range(len(chunk_store)):
+            text = chunk_store.text
+            for start, end in sentence_spans(text, int(chunk_store.starts[chunk_id]), int(chunk_store.ends[chunk_id])):
+                sentence = " ".join(text[start:end].split())
+                ids = tokenizer.encode(SENTENCE_PREFIX + sentence)
+                chunk_ids.append(chunk_id)
+                tokens.extend(ids)
+                offsets.append(len(tokens))
+                self.terms.append(frozenset(tokenize(sentence)))
+        self.chunk_ids = np.array(chunk_ids, dtype=np.int32)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.tokens = np.array(tokens, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def sentence_ids(self, chunk_id: int) -> np.ndarray:
+        return np.flatnonzero(self.chunk_ids == chunk_id)
+
+    def token_count(self, sentence_id: int) -> int:
+        return int(self.offsets[sentence_id + 1] - self.offsets[sentence_id])
+
+    def token_ids(self, sentence_id: int) -> np.ndarray:
+        return self.tokens[self.offsets[sentence_id]:self.offsets[sentence_id + 1]]
+
+    def memory_bytes(self) -> int:
+        return self.chunk_ids.nbytes + self.offsets.nbytes + self.tokens.nbytes
+
+
+class PromptPacker:
+    """Builds prompt token ids within prompt_tokens, keeping answer_tokens of the model's window free"""
+
+    def __init__(self, tokenizer, sentence_tokens: SentenceTokens, prompt_tokens: int = 384,
+                 answer_tokens: int = 96, max_positions: Optional[int] = None, history_share: float = 0.25):
+        self.tokenizer = tokenizer
+        self.sentences = sentence_tokens
+        self.answer_tokens = answer_tokens
+        self.prompt_tokens = prompt_tokens
+        if max_positions:
+            self.prompt_tokens = min(prompt_tokens, max_positions - answer_tokens)
+        self.history_share = history_share
+        self.header = list(tokenizer.encode(CONTEXT_HEADER))
+
+    def encode_turn(self, question: str, answer_ids: Sequence[int]) -> List[int]:
+        """Token ids of a finished question/answer turn, kept with the history"""
+        return list(self.tokenizer.encode(TURN_TEMPLATE.format(question=question))) + list(answer_ids)
+
+    def pack(self, question: str, chunk_ids: Sequence[int],
+             history: Sequence[Sequence[int]] = ()) -> Tuple[List[int], int, int]:
+        """(prompt ids, sentences packed, sentences dropped) for chunk_ids ranked best first"""
+        question_ids = list(self.tokenizer.encode(QUESTION_TEMPLATE.format(question=question)))
+        # The question always fits; an over-long one keeps its end, where "Answer:" is
+        question_ids = question_ids[-(self.prompt_tokens - len(self.header)):]
+        budget = self.prompt_tokens - len(self.header) - len(question_ids)
+
+        # Most recent turns first, within their share of the budget
+        history_ids: List[int] = []
+        history_budget = int(budget * self.history_share)
+        for turn in reversed(history):
+            if len(history_ids) + len(turn) > history_budget:
+                break
+            history_ids = list(turn) + history_ids
+        budget -= len(history_ids)
+
+        # Sentences scored by question terms they contain, ties broken by chunk rank
+        query_terms = set(tokenize(question))
+        candidates = []
+        for rank, chunk_id in enumerate(chunk_ids):
+            for sentence_id in self.sentences.sentence_ids(chunk_id):
+                overlap = len(query_terms & self.sentences.terms[sentence_id])
+                candidates.append((overlap + 1.0 / (rank + 2), rank, int(sentence_id)))
+        chosen = []
+        for _, rank, sentence_id in sorted(candidates, key=lambda c: -c[0]):
+            cost = self.sentences.token_count(sentence_id)
+            if cost <= budget:
+                chosen.append((rank, sentence_id))
+                budget -= cost
+
+        # Chosen sentences in retrieval order, and in resume order within a chunk
+        ids = list(self.header)
+        for _, sentence_id in sorted(chosen):
+            ids.extend(self.sentences.token_ids(sentence_id).tolist())
+        return ids + history_ids + question_ids, len(chosen), len(candidates) - len(chosen)
@@ -1,7 +1,13 @@
 import re
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set, Tuple
 import logging
 
+try:
+    from .metrics import timed
+except ImportError:
+    # Fallback for when running directly
+    from metrics import timed
+
 
 def clean_line(line: str) -> str:
     """
@@ -81,6 +87,32 @@ def extract_section_simple(lines: List[str], section_name: str) -> List[str]:
     return section
 
 
+def locate_lines(raw_text: str, lines: List[str]) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) offsets in raw_text of the run of non-empty lines that a
+    section's lines were taken from, or None.
+
+    The section extractors return raw lines either stripped or passed through
+    clean_line, so each raw line is compared both ways. Matching whole
+    consecutive lines keeps a line that also appears earlier (or twice in the
+    section) from pulling the span to the wrong place.
+    """
+    if not lines:
+        return None
+    raw_lines = []
+    for match in re.finditer(r'[^\n]+', raw_text):
+        line = match.group().strip()
+        if line:
+            start = match.start() + len(match.group()) - len(match.group().lstrip())
+            raw_lines.append((line, start, start + len(line)))
+
+    for first in range(len(raw_lines) - len(lines) + 1):
+        run = raw_lines[first:first + len(lines)]
+        if all(raw == line or clean_line(raw) == line for (raw, _, _), line in zip(run, lines)):
+            return run[0][1], run[-1][2]
+    return None
+
+
 def is_section_header(line: str) -> bool:
     """
     Determine if a line is likely a section header.
@@ -184,6 +216,18 @@ def clean_skill(skill: str) -> str:
     return skill
 
 
+def normalize_skill(skill: str) -> str:
+    """
+    Normalize a skill to the canonical lower-case form used for lookups and indexing.
+    """
+    skill = clean_skill(skill).lower()
+
+    # Drop trailing punctuation left over from lists ("Python.", "SQL;")
+    skill = re.sub(r'^[^\w\+\#\.]+|[^\w\+\#]+$', '', skill)
+
+    return re.sub(r'\s+', ' ', skill).strip()
+
+
 def extract_contact_info(text: str) -> Dict[str, str]:
     """
     Extract contact information from resume text.
@@ -250,9 +294,11 @@ def parse_resume_single_line(raw_text: str) -> Dict[str, any]:
     }
     
     # Extract sections using regex
+    section_spans = []
     for section_name, pattern in patterns.items():
         match = re.search(pattern, raw_text, re.IGNORECASE | re.DOTALL)
         if match:
+            section_spans.append([section_name, match.start(1), match.end(1)])
             section_content = match.group(1).strip()
             
             if section_name == 'skills':
@@ -275,6 +321,9 @@ def parse_resume_single_line(raw_text: str) -> Dict[str, any]:
         'contact_info_found': bool(contact_info)
     }
     
+    # Where each section's text is in raw_text, for section-aware chunking
+    parsed_data['section_spans'] = section_spans
+    
     return parsed_data
 
 
@@ -438,6 +487,14 @@ def parse_resume_enhanced(raw_text: str) -> Dict[str, any]:
         'contact_info_found': bool(contact_info)
     }
     
+    # Where each section's lines are in raw_text, for section-aware chunking
+    parsed_data['section_spans'] = []
+    for name, section_lines in (('education', education), ('experience', experience),
+                                ('projects', projects), ('skills', skills_section)):
+        span = locate_lines(raw_text, section_lines)
+        if span:
+            parsed_data['section_spans'].append([name, span[0], span[1]])
+    
     logging.info(f"Parsed resume with {len(skills)} skills, "
                 f"{len(projects)} projects, "
                 f"{len(education)} education entries")
@@ -445,6 +502,7 @@ def parse_resume_enhanced(raw_text: str) -> Dict[str, any]:
     return parsed_data
 
 
+@timed("parsing")
 def parse_resume(raw_text: str) -> Dict[str, any]:
     """
     Main resume parsing function (backward compatibility).
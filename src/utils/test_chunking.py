@@ -0,0 +1,85 @@
+from utils.chunking import ChunkStore, chunk_hash, chunk_resume, find_sections
+from utils.resume_parser import parse_resume
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 0100
+
+EDUCATION
+B.Tech Computer Science, XYZ University, 2020
+GPA 8.9
+
+WORK EXPERIENCE
+Software Engineer, Acme Corp 2020-2023
+- Built REST APIs in Python
+- Led migration to Kubernetes
+- Built REST APIs in Python
+
+PROJECTS
+Chatbot - Python, Flask
+- Built REST APIs in Python
+
+TECHNICAL SKILLS
+Python, SQL, Docker
+
+CERTIFICATIONS
+AWS Certified Developer
+"""
+
+SINGLE_LINE = ("JANE DOE jane@example.com | +1 555 0100 EDUCATION XYZ University B.Tech Computer Science 2020 "
+               "SKILLS • Languages: Python, SQL • Tools: Docker, Git "
+               "PROJECTS Chatbot • Built REST APIs in Python with Flask "
+               "CERTIFICATIONS • AWS Certified Developer")
+
+
+def sections_of(text):
+    return [section for section, _, _ in find_sections(text, parse_resume(text)["section_spans"])]
+
+
+def test_sections_follow_the_parser_and_tile_the_text():
+    spans = find_sections(RESUME, parse_resume(RESUME)["section_spans"])
+    assert [section for section, _, _ in spans] == [
+        "contact", "education", "experience", "projects", "skills", "certifications"]
+    assert spans[0][1] == 0 and spans[-1][2] == len(RESUME)
+    assert all(end == next_start for (_, _, end), (_, next_start, _) in zip(spans, spans[1:]))
+    assert RESUME[spans[2][1]:].startswith("WORK EXPERIENCE")
+
+
+def test_single_line_resume_sections():
+    assert sections_of(SINGLE_LINE) == ["contact", "education", "skills", "projects", "certifications"]
+
+
+def test_chunks_stay_inside_their_section():
+    text = RESUME
+    spans = find_sections(text, parse_resume(text)["section_spans"])
+    for chunk in chunk_resume(text, max_chars=60):
+        assert any(section == chunk.section and start <= chunk.start and chunk.end <= end
+                   for section, start, end in spans)
+        assert text[chunk.start:chunk.end] == chunk.text
+
+
+def test_repeated_lines_are_dropped_within_a_section_only():
+    chunks = chunk_resume(RESUME)
+    by_section = {}
+    for chunk in chunks:
+        by_section.setdefault(chunk.section, []).append(chunk.text)
+    experience = "\n".join(by_section["experience"])
+    assert experience.count("Built REST APIs in Python") == 1
+    assert "Built REST APIs in Python" in "\n".join(by_section["projects"])
+
+
+def test_near_duplicate_chunks_are_dropped():
+    line = "Chatbot - Python, Flask, built REST APIs and a React frontend"
+    chunks = chunk_resume(line + "\n" + line + " too", section_spans=[], max_chars=70)
+    assert [chunk.text for chunk in chunks] == [line]
+
+
+def test_chunk_store_slices_chunks_from_the_text():
+    chunks = chunk_resume(RESUME, max_chars=60)
+    store = ChunkStore(RESUME, chunks)
+    assert len(store) == len(chunks)
+    for chunk_id, chunk in enumerate(chunks):
+        assert store.chunk_text(chunk_id) == chunk.text
+        assert store.section(chunk_id) == chunk.section
+        assert store.reference(chunk_id) == {
+            "chunk_id": chunk_id, "section": chunk.section, "start": chunk.start, "end": chunk.end}
+    assert store.hashes() == [chunk_hash(chunk.text) for chunk in chunks]
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.stubs import StubTokenizer
+from utils.generation_budget import SENTENCE_TOKENS, DeadlineTracker, TokenRateEstimator, trim_to_sentence
+
+
+def test_first_observation_replaces_the_guess_then_averages():
+    estimator = TokenRateEstimator(seconds_per_token=0.05, first_token_seconds=0.2, alpha=0.5)
+    estimator.observe(0.1, 10, 0.2)
+    assert estimator.first_token_seconds == pytest.approx(0.1)
+    assert estimator.seconds_per_token == pytest.approx(0.02)
+    estimator.observe(0.3, 10, 0.4)
+    assert estimator.first_token_seconds == pytest.approx(0.2)
+    assert estimator.seconds_per_token == pytest.approx(0.03)
+
+
+def test_observe_total_spreads_time_over_tokens():
+    estimator = TokenRateEstimator()
+    estimator.observe_total(1.0, 20)
+    assert estimator.first_token_seconds == 0.0
+    assert estimator.seconds_per_token == pytest.approx(0.05)
+
+
+def test_max_new_tokens_fits_the_time_left():
+    estimator = TokenRateEstimator(seconds_per_token=0.01, first_token_seconds=0.1)
+    # 0.9 * 1s - 0.1s leaves 0.8s: the first token plus 80 more
+    assert estimator.max_new_tokens(1.0, limit=200) == 81
+    assert estimator.max_new_tokens(1.0, limit=50) == 50
+    assert estimator.max_new_tokens(0.0, limit=50) == 8
+    assert estimator.max_new_tokens(0.0, limit=50, floor=1) == 1
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Learn SQL and Python first. Then build", "Learn SQL and Python first."),
+    ("Learn SQL.", "Learn SQL."),
+    ("Learn SQL! ", "Learn SQL!"),
+    ("Go. Then learn SQL and build a portfolio of projects", "Go. Then learn SQL and build a portfolio of projects"),
+    ("No sentence end at all", "No sentence end at all"),
+])
+def test_trim_to_sentence(text, expected):
+    assert trim_to_sentence(text) == expected
+
+
+def make_tracker(seconds_left, max_new_tokens=100, seconds_per_token=0.001):
+    tokenizer = StubTokenizer()
+    ids = {word: tokenizer.encode(word) for word in ("and", "done.")}
+    estimator = TokenRateEstimator(seconds_per_token=seconds_per_token)
+    tracker = DeadlineTracker(tokenizer, time.perf_counter() + seconds_left, max_new_tokens, estimator)
+    return tracker, ids
+
+
+def test_tracker_runs_on_with_time_and_tokens_to_spare():
+    tracker, ids = make_tracker(seconds_left=60)
+    assert not tracker.step(1, ids["done."])
+    assert tracker.reason is None
+
+
+def test_tracker_stops_at_the_deadline_even_mid_sentence():
+    tracker, ids = make_tracker(seconds_left=-1)
+    assert tracker.step(5, ids["and"])
+    assert tracker.reason == "deadline"
+
+
+def test_tracker_stops_at_a_sentence_end_when_time_runs_short():
+    # Another sentence would take 16 * 10s
+    tracker, ids = make_tracker(seconds_left=60, seconds_per_token=10)
+    assert not tracker.step(3, ids["and"])
+    assert tracker.step(4, ids["done."])
+    assert tracker.reason == "deadline"
+
+
+def test_tracker_stops_at_a_sentence_end_near_the_token_limit():
+    tracker, ids = make_tracker(seconds_left=60, max_new_tokens=100)
+    assert not tracker.step(100 - SENTENCE_TOKENS, ids["done."])
+    assert tracker.step(100 - SENTENCE_TOKENS + 1, ids["done."])
+    assert tracker.reason == "length"
+
+
+def test_tracker_records_its_timings():
+    tracker, ids = make_tracker(seconds_left=60)
+    for tokens in range(1, 6):
+        tracker.step(tokens, ids["and"])
+    tracker.record()
+    assert tracker.estimator.samples == 1
+    assert tracker.estimator.seconds_per_token < 0.001
+
+
+def test_tracker_stops_once_cancelled():
+    tracker, ids = make_tracker(seconds_left=60)
+    tracker.cancel = threading.Event()
+    assert not tracker.step(1, ids["and"])
+    tracker.cancel.set()
+    assert tracker.step(2, ids["and"])
+    assert tracker.reason == "cancelled"
@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.lexical_index import BM25Index, hybrid_rank, is_decisive, tokenize, top_k
+
+CHUNKS = [
+    "Skills: Python, C++, Node.js and SQL",
+    "Education: B.Tech in Computer Science",
+    "Projects: built a Node.js chat service",
+    "Experience: data analyst intern working with SQL and Excel",
+]
+
+
+def never_called():
+    raise AssertionError("the query should not have been embedded")
+
+
+def test_tokenize_keeps_tool_names_and_drops_stopwords():
+    assert tokenize("Has the candidate used C++, Node.js or PySpark?") == ["used", "c++", "node.js", "pyspark"]
+
+
+def test_bm25_matches_the_textbook_formula():
+    index = BM25Index(CHUNKS, k1=1.2, b=0.75)
+    lengths = [len(tokenize(text)) for text in CHUNKS]
+    average = sum(lengths) / len(lengths)
+    idf = math.log(1 + (4 - 2 + 0.5) / (2 + 0.5))  # "sql" is in two chunks
+    expected = [
+        idf * 2.2 / (1 + 1.2 * (0.25 + 0.75 * lengths[doc] / average)) if "SQL" in text else 0.0
+        for doc, text in enumerate(CHUNKS)
+    ]
+    np.testing.assert_allclose(index.scores("sql"), expected, rtol=1e-5)
+
+
+def test_bm25_scores_each_query_term_once():
+    index = BM25Index(CHUNKS)
+    np.testing.assert_allclose(index.scores("node.js node.js"), index.scores("node.js"))
+    assert not index.scores("kubernetes").any()
+
+
+def test_bm25_on_an_empty_corpus():
+    index = BM25Index([])
+    assert index.scores("python").shape == (0,)
+    assert index.memory_bytes() == 0
+
+
+def test_is_decisive_needs_a_strong_clear_leader():
+    assert is_decisive(np.array([3.0, 1.0, 0.0]), min_score=1.0, margin=1.5)
+    assert not is_decisive(np.array([3.0, 2.5]), min_score=1.0, margin=1.5)
+    assert not is_decisive(np.array([0.5, 0.0]), min_score=1.0, margin=1.5)
+    assert is_decisive(np.array([1.0]), min_score=1.0, margin=1.5)
+    assert not is_decisive(np.array([]), min_score=1.0, margin=1.5)
+
+
+def test_top_k_breaks_ties_by_position():
+    assert top_k(np.array([1.0, 3.0, 3.0, 2.0]), 3) == [1, 2, 3]
+
+
+def test_decisive_bm25_skips_the_embedding():
+    lexical = np.array([4.0, 0.0, 1.0, 2.0])
+    assert hybrid_rank(lexical, never_called, 3) == ([0, 3, 2], "lexical")
+
+
+def test_decisive_bm25_with_too_few_hits_is_filled_from_dense():
+    lexical = np.array([0.0, 3.0, 0.0, 0.0])
+    dense = np.array([0.9, 0.8, 0.1, 0.5])
+    ranked, path = hybrid_rank(lexical, lambda: dense, 3)
+    assert path == "filled"
+    assert ranked == [1, 0, 3]
+
+
+def test_fill_is_capped_by_the_corpus_size():
+    ranked, path = hybrid_rank(np.array([2.0, 0.0]), lambda: np.array([0.1, 0.9]), 5)
+    assert (ranked, path) == ([0, 1], "filled")
+    assert hybrid_rank(np.array([2.0]), never_called, 3) == ([0], "lexical")
+
+
+def test_undecided_bm25_is_fused_with_dense():
+    lexical = np.array([2.0, 1.8, 0.0])
+    dense = np.array([0.0, 1.0, 0.5])
+    ranked, path = hybrid_rank(lexical, lambda: dense, 2, alpha=0.5)
+    assert path == "hybrid"
+    # Fused: 0.5 * min-max(dense) + 0.5 * lexical / max(lexical)
+    assert ranked == [1, 0]
+
+
+def test_no_lexical_match_ranks_by_dense_alone():
+    ranked, path = hybrid_rank(np.zeros(3), lambda: np.array([0.2, 0.7, 0.4]), 2)
+    assert (ranked, path) == ([1, 2], "hybrid")
+
+
+@pytest.mark.parametrize("query, expected", [("node.js", {0, 2}), ("excel", {3})])
+def test_bm25_finds_exact_tool_names(query, expected):
+    scores = BM25Index(CHUNKS).scores(query)
+    assert set(np.flatnonzero(scores)) == expected
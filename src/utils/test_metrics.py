@@ -0,0 +1,49 @@
+from utils.metrics import DEFAULT_BUCKETS, get_counter, get_gauge, record_duration, render_prometheus
+
+# The registry is process-wide, so every test uses metric names of its own
+
+HISTOGRAM = "sahay_stage_duration_seconds"
+
+
+def exposition_lines(prefix):
+    return [line for line in render_prometheus().splitlines() if prefix in line]
+
+
+def test_counter_has_help_type_and_escaped_labels():
+    counter = get_counter("sahay_test_render_total", "Requests by route.", ("route", "reason"))
+    counter.inc("rag", 'said "hi"\\\nbye')
+    counter.inc("intent", "template", amount=2.5)
+    assert exposition_lines("sahay_test_render_total") == [
+        "# HELP sahay_test_render_total Requests by route.",
+        "# TYPE sahay_test_render_total counter",
+        'sahay_test_render_total{route="rag",reason="said \\"hi\\"\\\\\\nbye"} 1',
+        'sahay_test_render_total{route="intent",reason="template"} 2.5',
+    ]
+
+
+def test_gauge_without_labels():
+    get_gauge("sahay_test_render_depth", "Queued requests.", callback=lambda: 3)
+    assert exposition_lines("sahay_test_render_depth") == [
+        "# HELP sahay_test_render_depth Queued requests.",
+        "# TYPE sahay_test_render_depth gauge",
+        "sahay_test_render_depth 3",
+    ]
+
+
+def test_histogram_buckets_are_cumulative_and_end_with_inf():
+    for seconds in (0.25, 0.5, 0.5, 2.0, 100.0):
+        record_duration("test_render", seconds)
+    lines = render_prometheus().splitlines()
+    assert "# HELP %s Time spent in each pipeline stage and request type." % HISTOGRAM in lines
+    assert "# TYPE %s histogram" % HISTOGRAM in lines
+
+    expected = {0.25: 1, 0.5: 3, 1.0: 3, 2.5: 4, 60.0: 4}
+    buckets = [line for line in lines if line.startswith(HISTOGRAM + '_bucket{stage="test_render",')]
+    assert len(buckets) == len(DEFAULT_BUCKETS) + 1
+    for bound, count in expected.items():
+        le = str(int(bound)) if bound.is_integer() else repr(bound)
+        assert '%s_bucket{stage="test_render",le="%s"} %d' % (HISTOGRAM, le, count) in buckets
+    assert buckets[0] == '%s_bucket{stage="test_render",le="0.005"} 0' % HISTOGRAM
+    assert buckets[-1] == '%s_bucket{stage="test_render",le="+Inf"} 5' % HISTOGRAM
+    assert '%s_sum{stage="test_render"} 103.25' % HISTOGRAM in lines
+    assert '%s_count{stage="test_render"} 5' % HISTOGRAM in lines
@@ -0,0 +1,71 @@
+import pytest
+
+from benchmarks.stubs import StubTokenizer
+from utils.chunking import Chunk, ChunkStore
+from utils.prompt_packing import PromptPacker, SentenceTokens, sentence_spans
+
+TEXT = ("Skills: Python and SQL. Docker for deployment.\n"
+        "Built a Django app serving 500 users; wrote its REST API.\n"
+        "Led a team of four on a Kubernetes migration project for the platform group")
+
+
+def make_packer(prompt_tokens=64, **kwargs):
+    lines = TEXT.split("\n")
+    chunks, position = [], 0
+    for line in lines:
+        chunks.append(Chunk(line, "experience", position, position + len(line)))
+        position += len(line) + 1
+    tokenizer = StubTokenizer()
+    sentences = SentenceTokens(ChunkStore(TEXT, chunks), tokenizer)
+    return PromptPacker(tokenizer, sentences, prompt_tokens=prompt_tokens, **kwargs)
+
+
+def test_sentence_spans_split_at_sentence_ends_and_lines():
+    first_line = TEXT.index("\n")
+    assert [TEXT[s:e] for s, e in sentence_spans(TEXT, 0, first_line)] == ["Skills: Python and SQL.",
+                                                                         "Docker for deployment."]
+    assert len(make_packer().sentences) == 5
+
+
+@pytest.mark.parametrize("prompt_tokens", [12, 16, 24, 32, 64, 200])
+def test_prompt_never_exceeds_its_budget(prompt_tokens):
+    packer = make_packer(prompt_tokens)
+    history = [packer.encode_turn("What did I build?", packer.tokenizer.encode("A Django app."))] * 3
+    ids, packed, dropped = packer.pack("Which skills do I have?", [0, 1, 2], history)
+    assert len(ids) <= prompt_tokens
+    assert packed + dropped == len(packer.sentences)
+
+
+def test_max_positions_leaves_room_for_the_answer():
+    packer = make_packer(prompt_tokens=384, answer_tokens=96, max_positions=128)
+    assert packer.prompt_tokens == 32
+
+
+def test_long_question_keeps_its_end():
+    packer = make_packer(prompt_tokens=12)
+    ids, packed, _ = packer.pack("tell me " * 20 + "about Docker", [0])
+    assert len(ids) == 12 and packed == 0
+    assert packer.tokenizer.decode(ids).endswith("about Docker Answer:")
+
+
+def test_tight_budget_prefers_sentences_matching_the_question():
+    # Header (2), one short sentence (4) and the question (3)
+    packer = make_packer(prompt_tokens=10)
+    ids, packed, _ = packer.pack("Docker?", [0, 1, 2])
+    assert packed == 1
+    assert "Docker for deployment." in packer.tokenizer.decode(ids)
+
+
+def test_sentences_keep_resume_order():
+    packer = make_packer(prompt_tokens=200)
+    text = packer.tokenizer.decode(packer.pack("SQL", [0])[0])
+    assert text.index("Python and SQL.") < text.index("Docker for deployment.")
+
+
+def test_history_keeps_the_most_recent_turns_within_its_share():
+    packer = make_packer(prompt_tokens=64, history_share=0.5)
+    turns = [packer.encode_turn("Question %d?" % n, packer.tokenizer.encode("Answer %d." % n)) for n in range(5)]
+    ids, _, _ = packer.pack("Why?", [0], turns)
+    text = packer.tokenizer.decode(ids)
+    assert "Question 4?" in text and "Question 0?" not in text
+    assert text.index("Question 3?") < text.index("Question 4?")
@@ -0,0 +1,45 @@
+from utils.resume_parser import clean_line, locate_lines, parse_resume
+
+RESUME = """Jane Doe
+jane@example.com
+
+Summary
+• Built REST APIs in Python, Flask & SQL.
+
+Work history
+• Built REST APIs in Python, Flask & SQL.
+  • Led the   migration to Kubernetes!
+• Built REST APIs in Python, Flask & SQL.
+
+SKILLS
+Python, SQL
+"""
+
+
+def test_cleaned_bullet_lines_are_found_in_the_raw_text():
+    lines = [clean_line("• Led the   migration to Kubernetes!")]
+    assert lines == ["Led the migration to Kubernetes"]
+    start, end = locate_lines(RESUME, lines)
+    assert RESUME[start:end] == "• Led the   migration to Kubernetes!"
+
+
+def test_duplicated_lines_match_the_run_they_came_from():
+    bullet = "• Built REST APIs in Python, Flask & SQL."
+    lines = [clean_line(bullet), clean_line("• Led the   migration to Kubernetes!"), clean_line(bullet)]
+    start, end = locate_lines(RESUME, lines)
+    assert start == RESUME.index("Work history") + len("Work history\n")
+    assert RESUME[start:end] == bullet + "\n  • Led the   migration to Kubernetes!\n" + bullet
+
+
+def test_lines_not_in_the_text_are_not_located():
+    assert locate_lines(RESUME, []) is None
+    assert locate_lines(RESUME, ["Led the migration to Kubernetes", "Python SQL"]) is None
+
+
+def test_parsed_section_spans_cover_their_sections():
+    parsed = parse_resume(RESUME)
+    spans = {name: RESUME[start:end] for name, start, end in parsed["section_spans"]}
+    assert parsed["experience"][0] == "Built REST APIs in Python Flask & SQL."
+    assert spans["experience"].startswith("• Built REST APIs")
+    assert spans["experience"].endswith("Kubernetes!\n• Built REST APIs in Python, Flask & SQL.")
+    assert spans["skills"] == "Python, SQL"
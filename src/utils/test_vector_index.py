@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from utils.vector_index import MAX_NUMPY_CHUNKS_ENV, NumpyIndex, build_vector_index, normalise
+
+
+def unit_vectors(count, dim=16, seed=0):
+    return normalise(np.random.default_rng(seed).standard_normal((count, dim)))
+
+
+def test_numpy_search_matches_a_full_sort():
+    vectors = unit_vectors(50)
+    query = unit_vectors(1, seed=1)[0]
+    ids, scores = NumpyIndex(vectors).search(query, 5)
+    expected = np.argsort(-(vectors @ query), kind="stable")[:5]
+    np.testing.assert_array_equal(ids, expected)
+    np.testing.assert_allclose(scores, (vectors @ query)[expected], rtol=1e-6)
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_k_larger_than_the_corpus_is_clamped():
+    index = NumpyIndex(unit_vectors(3))
+    ids, scores = index.search(unit_vectors(1, seed=1)[0], 10)
+    assert sorted(ids) == [0, 1, 2] and len(scores) == 3
+    assert len(index.search(unit_vectors(1, seed=1)[0], 0)[0]) == 0
+
+
+def test_build_switches_to_faiss_above_the_threshold(monkeypatch):
+    pytest.importorskip("faiss")
+    vectors = unit_vectors(10)
+    assert build_vector_index(vectors, max_numpy=10).kind == "numpy"
+    assert build_vector_index(vectors, max_numpy=9).kind == "faiss"
+    monkeypatch.setenv(MAX_NUMPY_CHUNKS_ENV, "9")
+    assert build_vector_index(vectors).kind == "faiss"
+
+
+def test_build_stays_on_numpy_up_to_the_threshold(monkeypatch):
+    monkeypatch.setenv(MAX_NUMPY_CHUNKS_ENV, "10")
+    index = build_vector_index(unit_vectors(10) * 3.0)
+    assert index.kind == "numpy" and index.ntotal == 10
+    # Stored normalised, so similarities are cosines
+    np.testing.assert_allclose(np.linalg.norm(index.all_vectors(), axis=1), 1.0, rtol=1e-6)
+
+
+def test_build_rejects_an_empty_corpus():
+    with pytest.raises(ValueError):
+        build_vector_index(np.empty((0, 16)))
+
+
+@pytest.mark.parametrize("k", [1, 5, 40, 100])
+def test_numpy_and_faiss_agree(k):
+    pytest.importorskip("faiss")
+    from utils.vector_index import FaissIndex
+
+    vectors = unit_vectors(40)
+    numpy_index, faiss_index = NumpyIndex(vectors), FaissIndex(vectors)
+    for seed in range(1, 6):
+        query = unit_vectors(1, seed=seed)[0]
+        numpy_ids, numpy_scores = numpy_index.search(query, k)
+        faiss_ids, faiss_scores = faiss_index.search(query, k)
+        assert len(numpy_ids) == min(k, 40)
+        np.testing.assert_array_equal(numpy_ids, faiss_ids)
+        np.testing.assert_allclose(numpy_scores, faiss_scores, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(numpy_index.similarities(query), faiss_index.similarities(query),
+                                   rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(faiss_index.all_vectors(), vectors, rtol=1e-6)
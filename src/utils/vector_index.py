@@ -0,0 +1,109 @@
+"""
+Exact vector search backends for per-resume chunk embeddings.
+
+A resume has a handful of chunks, and a matrix-vector product over them is
+faster than building and querying a FAISS index. build_vector_index keeps
+corpora up to max_numpy_chunks as one normalised float32 matrix and switches
+to a FAISS inner-product index above that. Both backends return cosine
+similarities (higher is more similar) through the same interface, and FAISS
+is only imported when a corpus is large enough to need it.
+"""
+
+import os
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from .memory import faiss_index_bytes
+except ImportError:
+    # Fallback for when running directly
+    from memory import faiss_index_bytes
+
+MAX_NUMPY_CHUNKS_ENV = "SAHAY_NUMPY_INDEX_MAX_CHUNKS"
+DEFAULT_MAX_NUMPY_CHUNKS = 512
+
+
+def normalise(vectors: np.ndarray) -> np.ndarray:
+    """Unit-length float32 rows (or vector)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class NumpyIndex:
+    """Brute-force cosine search over one normalised matrix"""
+
+    kind = "numpy"
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.vectors)
+
+    def similarities(self, query: np.ndarray) -> np.ndarray:
+        return self.vectors @ query
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, similarities) of the k nearest vectors, best first"""
+        scores = self.similarities(query)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top, scores[top]
+
+    def all_vectors(self) -> np.ndarray:
+        """The indexed (normalised) vectors, row i for chunk i"""
+        return self.vectors
+
+    def memory_bytes(self) -> int:
+        return self.vectors.nbytes
+
+
+class FaissIndex:
+    """FAISS flat inner-product index over normalised vectors, for larger corpora"""
+
+    kind = "faiss"
+
+    def __init__(self, vectors: np.ndarray):
+        import faiss
+
+        self.index = faiss.IndexFlatIP(vectors.shape[1])
+        self.index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal
+
+    def similarities(self, query: np.ndarray) -> np.ndarray:
+        scores, ids = self.index.search(query.reshape(1, -1), self.index.ntotal)
+        result = np.empty(self.index.ntotal, dtype=np.float32)
+        result[ids[0]] = scores[0]
+        return result
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        scores, ids = self.index.search(query.reshape(1, -1), min(k, self.index.ntotal))
+        return ids[0], scores[0]
+
+    def all_vectors(self) -> np.ndarray:
+        return self.index.reconstruct_n(0, self.index.ntotal)
+
+    def memory_bytes(self) -> int:
+        return faiss_index_bytes(self.index)
+
+
+def max_numpy_chunks() -> int:
+    return int(os.environ.get(MAX_NUMPY_CHUNKS_ENV, DEFAULT_MAX_NUMPY_CHUNKS))
+
+
+def build_vector_index(vectors, max_numpy: int = None):
+    """NumpyIndex up to max_numpy vectors (default: $SAHAY_NUMPY_INDEX_MAX_CHUNKS or 512), FaissIndex above"""
+    vectors = normalise(vectors)
+    if vectors.ndim != 2 or not len(vectors):
+        raise ValueError("no vectors to index")
+    limit = max_numpy_chunks() if max_numpy is None else max_numpy
+    return NumpyIndex(vectors) if len(vectors) <= limit else FaissIndex(vectors)